@@ -1,17 +1,7 @@
 import streamlit as st
-import sqlite3
-import pandas as pd
-import hashlib
 from datetime import datetime
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.pdfgen import canvas
-from reportlab.pdfbase import pdfutils
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.pdfbase import pdfmetrics
-from reportlab.lib.units import inch
-import io
-import tempfile
-import os
+
+from core import applications, audit, catalog, deadline, metrics, passwords, pdf_templates, rate_limit, session_record, sessions, storage, write_behind
 
 # 페이지 설정
 st.set_page_config(
@@ -20,221 +10,20 @@ st.set_page_config(
     layout="wide"
 )
 
-# 데이터베이스 초기화
+# 저장소 준비 (프로세스당 한 번만 실제로 실행됨, 주소는 환경변수 STUDENT_DB_URL)
+# 변경 이력 스냅숏, 마감 처리, 만료 세션 정리는 저장소마다 백그라운드 스레드 하나가 맡는다.
 def init_database():
-    conn = sqlite3.connect('student_major.db')
-    cursor = conn.cursor()
-    
-    # 학생 테이블
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS students (
-            student_id TEXT PRIMARY KEY,
-            name TEXT NOT NULL,
-            password TEXT NOT NULL,
-            semester1_gpa REAL,
-            completed_courses TEXT,
-            major_preference_1 TEXT,
-            major_preference_2 TEXT,
-            major_preference_3 TEXT,
-            major_preference_4 TEXT,
-            major_preference_5 TEXT,
-            is_submitted BOOLEAN DEFAULT 0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
-
-# 비밀번호 해시화
-def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
-
-# 학생 등록
-def register_student(student_id, name, password):
-    conn = sqlite3.connect('student_major.db')
-    cursor = conn.cursor()
-    
-    try:
-        hashed_password = hash_password(password)
-        cursor.execute('''
-            INSERT INTO students (student_id, name, password)
-            VALUES (?, ?, ?)
-        ''', (student_id, name, hashed_password))
-        conn.commit()
-        return True, "회원가입이 완료되었습니다."
-    except sqlite3.IntegrityError:
-        return False, "이미 존재하는 학번입니다."
-    finally:
-        conn.close()
-
-# 학생 로그인
-def login_student(student_id, password):
-    conn = sqlite3.connect('student_major.db')
-    cursor = conn.cursor()
-    
-    hashed_password = hash_password(password)
-    cursor.execute('''
-        SELECT name FROM students WHERE student_id = ? AND password = ?
-    ''', (student_id, hashed_password))
-    
-    result = cursor.fetchone()
-    conn.close()
-    
-    return result is not None, result[0] if result else None
-
-# 학생 정보 저장
-def save_student_data(student_id, gpa, courses, preferences):
-    conn = sqlite3.connect('student_major.db')
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        UPDATE students SET 
-            semester1_gpa = ?,
-            completed_courses = ?,
-            major_preference_1 = ?,
-            major_preference_2 = ?,
-            major_preference_3 = ?,
-            major_preference_4 = ?,
-            major_preference_5 = ?,
-            updated_at = CURRENT_TIMESTAMP
-        WHERE student_id = ?
-    ''', (gpa, ','.join(courses), preferences[0], preferences[1], 
-          preferences[2], preferences[3], preferences[4], student_id))
-    
-    conn.commit()
-    conn.close()
-
-# 학생 정보 불러오기
-def load_student_data(student_id):
-    conn = sqlite3.connect('student_major.db')
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT semester1_gpa, completed_courses, major_preference_1,
-               major_preference_2, major_preference_3, major_preference_4,
-               major_preference_5, is_submitted
-        FROM students WHERE student_id = ?
-    ''', (student_id,))
-    
-    result = cursor.fetchone()
-    conn.close()
-    
-    if result:
-        gpa, courses_str, pref1, pref2, pref3, pref4, pref5, is_submitted = result
-        courses = courses_str.split(',') if courses_str else []
-        preferences = [pref1, pref2, pref3, pref4, pref5]
-        return gpa, courses, preferences, is_submitted
-    return None, [], [None]*5, False
-
-# 최종 제출
-def submit_application(student_id):
-    conn = sqlite3.connect('student_major.db')
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        UPDATE students SET is_submitted = 1, updated_at = CURRENT_TIMESTAMP
-        WHERE student_id = ?
-    ''', (student_id,))
-    
-    conn.commit()
-    conn.close()
-
-# 관리자 데이터 조회 (한글 컬럼명)
-def get_all_students():
-    conn = sqlite3.connect('student_major.db')
-    df = pd.read_sql_query('''
-        SELECT student_id, name, semester1_gpa, completed_courses,
-               major_preference_1, major_preference_2, major_preference_3,
-               major_preference_4, major_preference_5, is_submitted,
-               created_at, updated_at
-        FROM students ORDER BY student_id
-    ''', conn)
-    conn.close()
-    
-    # 컬럼명을 한글로 변경
-    df.columns = [
-        '학번', '이름', '1학기학점', '이수교과목',
-        '1지망', '2지망', '3지망', '4지망', '5지망',
-        '제출여부', '등록일시', '수정일시'
-    ]
-    
-    # 제출여부를 한글로 변경
-    df['제출여부'] = df['제출여부'].map({0: '미제출', 1: '제출완료'})
-    
-    return df
-
-# PDF 생성 (한글 지원)
-def create_pdf(student_id, name, gpa, courses, preferences):
-    buffer = io.BytesIO()
-    p = canvas.Canvas(buffer, pagesize=A4)
-    width, height = A4
-    
-    # 한글 폰트 등록 시도 (시스템에 따라 다를 수 있음)
-    try:
-        font_path = os.path.join(os.path.dirname(__file__), "NotoSansKR-Regular.ttf")
-        if os.path.exists(font_path):
-            pdfmetrics.registerFont(TTFont("NotoSans", font_path))
-            korean_font = "NotoSans"
-        else:
-            korean_font = "Helvetica"  # fallback    
-    except:
-        korean_font = 'Helvetica'
-    
-    # 제목
-    try:
-        p.setFont(korean_font, 20)
-    except:
-        p.setFont("Helvetica-Bold", 20)
-    p.drawString(50, height - 50, "전공 선택 신청서")
-    
-    # 학생 정보
-    try:
-        p.setFont(korean_font, 12)
-    except:
-        p.setFont("Helvetica", 12)
-    
-    y_pos = height - 100
-    
-    p.drawString(50, y_pos, f"학번: {student_id}")
-    y_pos -= 30
-    p.drawString(50, y_pos, f"이름: {name}")
-    y_pos -= 30
-    p.drawString(50, y_pos, f"1학기 학점: {gpa}/4.3")
-    y_pos -= 30
-    
-    # 이수 과목
-    p.drawString(50, y_pos, "1학기 이수 교과목:")
-    y_pos -= 20
-    for course in courses:
-        p.drawString(70, y_pos, f"• {course}")
-        y_pos -= 20
-    
-    y_pos -= 20
-    
-    # 전공 희망 순위
-    p.drawString(50, y_pos, "전공 희망 순위:")
-    y_pos -= 20
-    
-    preference_names = ["1지망", "2지망", "3지망", "4지망", "5지망"]
-    
-    for i, pref in enumerate(preferences):
-        if pref:
-            p.drawString(70, y_pos, f"{preference_names[i]}: {pref}")
-            y_pos -= 20
-    
-    # 제출 시간
-    y_pos -= 30
-    p.drawString(50, y_pos, f"제출 시간: {datetime.now().strftime('%Y년 %m월 %d일 %H시 %M분')}")
-    
-    p.save()
-    buffer.seek(0)
-    return buffer
+    store = storage.get_store(storage.store_url())
+    audit.get_snapshotter(store.url, store)
+    deadline.get_deadline_job(store.url, store)
+    sessions.get_session_manager(store.url, store)
+    return store
 
 # 메인 애플리케이션
+@metrics.timed('app.main')
 def main():
-    init_database()
+    store = init_database()
+    metrics.start_file_dump()
     
     st.title("🎓첨단공학부 전공선택 시스템")
     
@@ -248,6 +37,25 @@ def main():
     if 'admin_mode' not in st.session_state:
         st.session_state.admin_mode = False
     
+    # 로그인 세션 확인 (세션 상태 또는 주소의 토큰, 다시 접속하면 이어서 로그인 / 만료 시 로그아웃)
+    auth = sessions.get_session_manager(store.url, store)
+    session = sessions.current(auth)
+    if session is None and (st.session_state.logged_in or st.session_state.admin_mode):
+        st.session_state.logged_in = False
+        st.session_state.admin_mode = False
+        st.session_state.student_id = None
+        st.session_state.student_name = None
+        session_record.invalidate()
+        st.warning("로그인 시간이 만료되었습니다. 다시 로그인해주세요.")
+    elif session and not (st.session_state.logged_in or st.session_state.admin_mode):
+        if session.role == 'admin':
+            st.session_state.admin_mode = True
+        else:
+            st.session_state.logged_in = True
+            st.session_state.student_id = session.student_id
+            st.session_state.student_name = session.name
+            session_record.invalidate()
+    
     # 사이드바 메뉴
     with st.sidebar:
         st.header("메뉴")
@@ -257,24 +65,28 @@ def main():
         elif st.session_state.admin_mode:
             menu = "관리자 모드"
             if st.button("로그아웃"):
+                sessions.logout(auth)
                 st.session_state.admin_mode = False
                 st.rerun()
         else:
             menu = "전공 선택"
             st.write(f"안녕하세요, {st.session_state.student_name}님!")
             if st.button("로그아웃"):
+                sessions.logout(auth)
                 st.session_state.logged_in = False
                 st.session_state.student_id = None
                 st.session_state.student_name = None
+                session_record.invalidate()
                 st.rerun()
     
-    # 전공 목록
-    majors = ["인공지능", "컴퓨터과학", "데이터사이언스", "신소재물리", "지능형전자시스템"]
+    # 전공 / 이수 가능 과목 목록 (관리자가 수정하는 목록의 캐시된 스냅숏)
+    listing = catalog.snapshot(store)
+    majors = listing.majors
+    available_courses = listing.courses
     
-    # 이수 가능 과목 목록
-    available_courses = [
-        "대학기초수학", "이산수학", "기초물리1", "공학개론", "파이썬프로그래밍"
-    ]
+    # 신청 마감 설정 (마감 스레드가 주기적으로 읽어 둔 값)
+    round_ = deadline.get_deadline_job(store.url, store).state()
+    closed = not deadline.is_open(round_)
     
     if menu == "회원가입":
         st.header("회원가입")
@@ -291,11 +103,17 @@ def main():
                 elif password != password_confirm:
                     st.error("비밀번호가 일치하지 않습니다.")
                 else:
-                    success, message = register_student(student_id, name, password)
-                    if success:
-                        st.success(message)
+                    try:
+                        registered = applications.register(store, student_id, name, password)
+                    except passwords.PasswordBusyError:
+                        st.error("요청이 많습니다. 잠시 후 다시 시도해주세요.")
+                    except deadline.RoundClosedError:
+                        st.error("신청이 마감되어 회원가입할 수 없습니다.")
                     else:
-                        st.error(message)
+                        if registered:
+                            st.success("회원가입이 완료되었습니다.")
+                        else:
+                            st.error("이미 존재하는 학번입니다.")
     
     elif menu == "로그인":
         st.header("로그인")
@@ -308,79 +126,62 @@ def main():
                 if not student_id or not password:
                     st.error("학번과 비밀번호를 입력해주세요.")
                 else:
-                    success, name = login_student(student_id, password)
-                    if success:
-                        st.session_state.logged_in = True
-                        st.session_state.student_id = student_id
-                        st.session_state.student_name = name
-                        st.success("로그인 성공!")
-                        st.rerun()
+                    try:
+                        name = applications.login(store, student_id, password)
+                    except passwords.PasswordBusyError:
+                        st.error("로그인 요청이 많습니다. 잠시 후 다시 시도해주세요.")
+                    except rate_limit.RateLimitedError as e:
+                        st.error(f"로그인 시도가 너무 많습니다. {e.retry_after}초 후 다시 시도해주세요.")
                     else:
-                        st.error("학번 또는 비밀번호가 올바르지 않습니다.")
+                        if name:
+                            st.session_state.logged_in = True
+                            st.session_state.student_id = student_id
+                            st.session_state.student_name = name
+                            sessions.login(auth, student_id, name)
+                            session_record.invalidate()
+                            st.success("로그인 성공!")
+                            st.rerun()
+                        else:
+                            st.error("학번 또는 비밀번호가 올바르지 않습니다.")
     
     elif menu == "관리자 모드":
         if not st.session_state.admin_mode:
             st.header("관리자 로그인")
             admin_password = st.text_input("관리자 비밀번호", type="password")
             if st.button("관리자 로그인"):
-                if admin_password == "admin123":  # 간단한 관리자 비밀번호
-                    st.session_state.admin_mode = True
-                    st.rerun()
+                try:
+                    attempt = rate_limit.check_login(rate_limit.ADMIN_ID)
+                except rate_limit.RateLimitedError as e:
+                    st.error(f"로그인 시도가 너무 많습니다. {e.retry_after}초 후 다시 시도해주세요.")
                 else:
-                    st.error("관리자 비밀번호가 올바르지 않습니다.")
+                    if admin_password == "admin123":  # 간단한 관리자 비밀번호
+                        rate_limit.login_succeeded(attempt)
+                        st.session_state.admin_mode = True
+                        sessions.login(auth, 'admin', '관리자', 'admin')
+                        st.rerun()
+                    else:
+                        st.error("관리자 비밀번호가 올바르지 않습니다.")
         else:
-            st.header("📊 관리자 대시보드")
-            
-            df = get_all_students()
-            
-            if not df.empty:
-                st.subheader("학생 데이터")
-                st.dataframe(df, use_container_width=True)
-                
-                # 엑셀 다운로드 (한글 시트명 및 파일명)
-                output = io.BytesIO()
-                with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                    df.to_excel(writer, sheet_name='전공선택현황', index=False)
-                
-                st.download_button(
-                    label="📥 엑셀 파일 다운로드",
-                    data=output.getvalue(),
-                    file_name=f"전공선택현황_{datetime.now().strftime('%Y년%m월%d일_%H시%M분')}.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                )
-                
-                # 통계 정보
-                st.subheader("📈 통계")
-                col1, col2, col3 = st.columns(3)
-                
-                with col1:
-                    st.metric("총 학생 수", len(df))
-                
-                with col2:
-                    submitted = df[df['제출여부'] == '제출완료'].shape[0]
-                    st.metric("제출 완료", submitted)
-                
-                with col3:
-                    pending = df[df['제출여부'] == '미제출'].shape[0]
-                    st.metric("미제출", pending)
-                
-                # 전공별 지원 현황
-                st.subheader("전공별 지원 현황 (1지망 기준)")
-                major_counts = df['1지망'].value_counts()
-                if not major_counts.empty:
-                    st.bar_chart(major_counts)
-            else:
-                st.info("등록된 학생이 없습니다.")
+            # 관리자 화면은 pandas / numpy 를 쓰므로 처음 열 때 불러온다 (학생 화면 시작 비용 절감)
+            from core import admin_dashboard
+            admin_dashboard.render(store, pdf_templates.CANVAS_TEMPLATE)
     
     elif menu == "전공 선택" and st.session_state.logged_in:
         st.header(f"전공 선택 - {st.session_state.student_name}님. 최종제출 후 수정불가합니다.")
         
-        # 기존 데이터 불러오기
-        saved_gpa, saved_courses, saved_preferences, is_submitted = load_student_data(st.session_state.student_id)
+        # 임시저장 상태 (완료되면 아래에서 DB 내용을 다시 읽음)
+        write_behind.render_status(st.session_state.student_id)
+        
+        # 기존 데이터 불러오기 (세션 캐시, 저장 / 제출 시와 마감 처리 직후에만 다시 읽음)
+        deadline.sync_session(round_)
+        record = session_record.load(st.session_state.student_id, lambda student_id: applications.load(store, student_id))
+        saved_gpa, saved_courses, saved_preferences = record.gpa, record.courses, record.preferences
+        is_submitted, submitted_at, version = record.is_submitted, record.updated_at, record.version
         
         if is_submitted:
             st.success("✅ 최종 제출이 완료되었습니다.")
             st.info("제출된 내용을 확인하고 PDF를 다운로드할 수 있습니다.")
+        deadline.render_notice(round_, is_submitted)
         
         # 1학기 성적 정보
         st.subheader("1학기 성적 정보")
@@ -397,9 +198,10 @@ def main():
             )
         
         with col2:
+            # 목록에서 빠진 교과목도 이미 저장된 값은 그대로 보여줌
             completed_courses = st.multiselect(
                 "1학기 이수 교과목",
-                available_courses,
+                available_courses + tuple(course for course in saved_courses if course not in available_courses),
                 default=saved_courses
             )
         
@@ -407,7 +209,7 @@ def main():
         st.subheader("전공 희망 순위")
         
         preferences = [None] * 5
-        available_majors = majors.copy()
+        available_majors = list(majors)
         
         for i in range(5):
             # 기존 선택 값이 있으면 복원
@@ -441,18 +243,32 @@ def main():
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            if not is_submitted and st.button("💾 저장"):
-                save_student_data(st.session_state.student_id, gpa, completed_courses, preferences)
-                st.success("데이터가 저장되었습니다!")
+            if not is_submitted and not closed and st.button("💾 저장"):
+                # 임시저장은 큐에 넣고 바로 돌아감 (커밋 여부는 상단 상태 표시로 확인)
+                write_behind.save_draft(
+                    applications.draft_queue(store),
+                    st.session_state.student_id,
+                    (gpa, completed_courses, preferences),
+                    version,
+                    record._replace(gpa=gpa, courses=completed_courses, preferences=preferences),
+                )
                 st.rerun()
         
         with col2:
-            if not is_submitted and st.button("📤 최종 제출"):
+            if not is_submitted and not closed and st.button("📤 최종 제출"):
                 if gpa > 0 and completed_courses and preferences[0]:
-                    save_student_data(st.session_state.student_id, gpa, completed_courses, preferences)
-                    submit_application(st.session_state.student_id)
-                    st.success("최종 제출이 완료되었습니다!")
-                    st.rerun()
+                    try:
+                        # 최종 제출은 동기로 기록 (대기 중인 임시저장은 먼저 정리)
+                        version = write_behind.settle(applications.draft_queue(store), st.session_state.student_id, version)
+                        applications.submit(store, st.session_state.student_id, gpa, completed_courses, preferences, version)
+                        st.success("최종 제출이 완료되었습니다!")
+                        st.rerun()
+                    except session_record.StaleRecordError:
+                        st.error("다른 창에서 신청서가 먼저 변경되었습니다. 최신 내용을 확인한 뒤 다시 제출해주세요.")
+                    except deadline.RoundClosedError:
+                        st.error("신청이 마감되어 제출할 수 없습니다.")
+                    except applications.SubmitRejectedError:
+                        st.error("제출할 수 있는 신청서가 없습니다. 이미 최종 제출했는지 확인해주세요.")
                 else:
                     st.error("모든 필수 항목을 입력해주세요. (학점, 이수과목, 최소 1지망)")
         
@@ -463,13 +279,15 @@ def main():
                 current_courses = saved_courses if is_submitted else completed_courses
                 current_preferences = saved_preferences if is_submitted else preferences
                 
-                pdf_buffer = create_pdf(
+                pdf_buffer = applications.create_pdf(pdf_templates.CANVAS_TEMPLATE, applications.pdf_args(
+                    pdf_templates.CANVAS_TEMPLATE,
                     st.session_state.student_id,
                     st.session_state.student_name,
                     current_gpa,
                     current_courses,
-                    current_preferences
-                )
+                    current_preferences,
+                    submitted_at if is_submitted else None
+                ))
                 
                 st.download_button(
                     label="📄 PDF 다운로드",
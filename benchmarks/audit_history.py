@@ -0,0 +1,110 @@
+# 변경 이력 시점 조회 성능
+#
+#   python benchmarks/audit_history.py --students 5000 --saves 8
+#   python benchmarks/audit_history.py --store standin:///history.db
+#
+# 임시 디렉터리의 저장소에 가상 학생을 만들고, 학생마다 여러 번 저장한 뒤 일부를 최종 제출한다.
+# 이벤트가 SNAPSHOT_EVERY_EVENTS 개 쌓일 때마다 스냅숏을 만들며, 이후
+#   - 학생 한 명의 특정 시점 상태 (record_at)
+#   - 특정 시점의 전체 현황 (cohort_at, 스냅숏 + 이후 이벤트)
+#   - 같은 시점을 스냅숏 없이 처음부터 재생한 결과
+# 의 시간을 재고 두 결과가 같은지 확인한다.
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import applications, audit, storage  # noqa: E402
+
+
+def best_of(repeat, fn):
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+# 처음부터 재생: 기준 시각까지의 모든 이벤트를 읽어 학생별 마지막 이벤트만 남김
+def replay(store, at):
+    latest = {}
+    with store.connect() as conn:
+        rows = store._execute(conn, f'''
+            SELECT event_id, {audit.columns()} FROM record_events WHERE recorded_at <= %s ORDER BY event_id
+        ''', (at,)).fetchall()
+    for row in rows:
+        event = audit.event_row(row)
+        latest[event['student_id']] = event
+    return [latest[student_id] for student_id in sorted(latest)]
+
+
+def populate(store, students, saves, seed):
+    rng = random.Random(seed)
+    ids = [f'{i:08d}' for i in range(students)]
+    with store.transaction() as conn:
+        store.create_accounts(conn, [{'student_id': sid, 'name': f'학생{sid}', 'password_hash': 'x'} for sid in ids])
+
+    moments = []
+    snapshots = 0
+    for round_ in range(saves):
+        with store.transaction() as conn:
+            for sid in ids:
+                version = store.write_record(
+                    conn, sid, round(rng.uniform(2.0, 4.3), 2),
+                    rng.sample(applications.COURSES, rng.randint(1, 3)), rng.sample(applications.MAJORS, 5),
+                )
+                if round_ == saves - 1 and rng.random() < 0.7:
+                    store.submit(conn, sid, version)
+        moments.append(audit.now())
+        while store.audit_status()['events_since_snapshot'] >= audit.SNAPSHOT_EVERY_EVENTS:
+            store.take_snapshot()
+            snapshots += 1
+        time.sleep(0.002)
+    return ids, moments, snapshots
+
+
+def main():
+    parser = argparse.ArgumentParser(description='변경 이력 시점 조회 성능')
+    parser.add_argument('--students', type=int, default=5000)
+    parser.add_argument('--saves', type=int, default=8, help='학생당 저장 횟수')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=3)
+    parser.add_argument('--store', default='sqlite:///history.db', help='SQL 저장소 주소 (임시 디렉터리 기준, sqlite / standin)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        store = storage.open_store(args.store)
+        store.init()
+
+        started = time.perf_counter()
+        ids, moments, snapshots = populate(store, args.students, args.saves, args.seed)
+        status = store.audit_status()
+        print(f"학생 {len(ids)}명, 이벤트 {status['last_event_id']}건, 스냅숏 {snapshots}개 "
+              f"({time.perf_counter() - started:.1f}s)")
+
+        rng = random.Random(args.seed)
+        sample = rng.sample(ids, min(200, len(ids)))
+        at = moments[len(moments) // 2]
+        seconds, _ = best_of(args.repeat, lambda: [store.record_at(sid, at) for sid in sample])
+        print(f'학생 한 명 시점 조회 (record_at): {seconds / len(sample) * 1000:.3f} ms')
+
+        print(f'{"기준 시점":<12}{"스냅숏+이후 ms":>16}{"재생 ms":>12}{"학생":>8}{"제출":>8}')
+        for number, moment in enumerate(moments, start=1):
+            fast, cohort = best_of(args.repeat, lambda: store.cohort_at(moment))
+            slow, expected = best_of(args.repeat, lambda: replay(store, moment))
+            assert [e['event_id'] for e in cohort] == [e['event_id'] for e in expected], moment
+            print(f'{number}회차 저장 후{fast * 1000:>14.1f}{slow * 1000:>12.1f}'
+                  f'{len(cohort):>8}{sum(e["is_submitted"] for e in cohort):>8}')
+        os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+if __name__ == '__main__':
+    main()
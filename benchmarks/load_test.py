@@ -0,0 +1,312 @@
+# 로그인 / 저장 / 제출 부하 테스트
+#
+#   python benchmarks/load_test.py --students 500 --concurrency 1,8,32
+#   python benchmarks/load_test.py --mode apptest --students 20 --concurrency 4
+#   python benchmarks/load_test.py --write-behind --students 500 --concurrency 32
+#   python benchmarks/load_test.py --compare benchmarks/results/이전결과.json
+#   python benchmarks/load_test.py --store standin:///loadtest.db   (서버 DB 어댑터를 sqlite3 대역으로)
+#
+# functions 모드는 두 앱이 함께 쓰는 core.applications 함수를 스레드 풀에서 직접 호출하고, apptest
+# 모드는 streamlit.testing 으로 실제 화면 흐름(로그인 → 저장 → 제출)을 실행한다.
+# AppTest 런타임은 프로세스 전역이라 apptest 모드는 가상 학생마다 별도 프로세스를 쓴다.
+# 가상 학생들을 동시에 실행해 작업별 p50/p95/p99 지연시간,
+# 처리량, "database is locked" 오류 비율을 출력하고 결과를 JSON 으로 저장한다.
+import argparse
+import functools
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import multiprocessing
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core import applications, storage, write_behind  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+MAJORS = applications.MAJORS
+COURSES = applications.COURSES
+
+
+# 작업별 지연시간 / 오류 기록
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.locked = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def measure(self, op, fn, *args):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        except Exception as e:
+            self.fail(op, e)
+        finally:
+            self.record(op, time.perf_counter() - started)
+
+    def record(self, op, seconds):
+        with self._lock:
+            self.latencies[op].append(seconds)
+
+    def fail(self, op, error):
+        with self._lock:
+            self.errors[op] += 1
+            if isinstance(error, sqlite3.OperationalError) and 'locked' in str(error):
+                self.locked[op] += 1
+
+    def merge(self, other):
+        with self._lock:
+            for op, samples in other.latencies.items():
+                self.latencies[op].extend(samples)
+            for op, count in other.errors.items():
+                self.errors[op] += count
+            for op, count in other.locked.items():
+                self.locked[op] += count
+
+    def __getstate__(self):
+        return {'latencies': dict(self.latencies), 'errors': dict(self.errors), 'locked': dict(self.locked)}
+
+    def __setstate__(self, state):
+        self.__init__()
+        self.latencies.update(state['latencies'])
+        self.errors.update(state['errors'])
+        self.locked.update(state['locked'])
+
+    def report(self, wall_seconds):
+        ops = {}
+        for op, samples in self.latencies.items():
+            samples = sorted(samples)
+            ops[op] = {
+                'count': len(samples),
+                'errors': self.errors[op],
+                'locked': self.locked[op],
+                'locked_rate': self.locked[op] / len(samples),
+                'p50_ms': percentile(samples, 50) * 1000,
+                'p95_ms': percentile(samples, 95) * 1000,
+                'p99_ms': percentile(samples, 99) * 1000,
+            }
+        total = sum(op['count'] for op in ops.values())
+        return {'wall_seconds': wall_seconds, 'throughput': total / wall_seconds, 'ops': ops}
+
+
+def percentile(samples, p):
+    if not samples:
+        return 0.0
+    index = min(len(samples) - 1, max(0, round(p / 100 * len(samples)) - 1))
+    return samples[index]
+
+
+def synthetic_application(rng):
+    return (
+        round(rng.uniform(2.0, 4.3), 1),
+        rng.sample(COURSES, rng.randint(1, len(COURSES))),
+        rng.sample(MAJORS, 5),
+    )
+
+
+# 임시저장을 write-behind 큐로 보내고 커밋 확인까지의 시간을 기록
+def queue_drafts(recorder, queue, student_id, drafts):
+    ticket = None
+    for args in drafts:
+        queued_at = time.perf_counter()
+        ticket = recorder.measure('draft_enqueue', queue.submit, student_id, args, None, ticket)
+    if ticket is not None:
+        ticket.wait()
+        recorder.record('draft_ack', time.perf_counter() - queued_at)
+        if ticket.error is not None:
+            recorder.fail('draft_ack', ticket.error)
+    queue.settle(student_id)
+
+
+# 데이터 함수 시나리오 (로그인 → 임시저장 → 최종 제출)
+# 가상 학생마다 다른 접속자로 로그인 (모두 한 접속자로 세면 로그인 시도 제한에 걸림)
+def scenario(store, recorder, student_id, saves, rng, queue=None):
+    recorder.measure('login', applications.login, store, student_id, 'pw', f'load-test:{student_id}')
+    drafts = [synthetic_application(rng) for _ in range(saves)]
+    if queue is not None:
+        queue_drafts(recorder, queue, student_id, drafts)
+    else:
+        for gpa, courses, preferences in drafts:
+            recorder.measure('save', applications.save, store, student_id, gpa, courses, preferences)
+    gpa, courses, preferences = synthetic_application(rng)
+    recorder.measure('submit', applications.submit, store, student_id, gpa, courses, preferences)
+
+
+def setup(store, student_ids):
+    for student_id in student_ids:
+        applications.register(store, student_id, f'학생{student_id}', 'pw')
+
+
+# streamlit.testing 으로 화면 흐름 실행 (워커 프로세스에서 학생 한 명씩)
+def apptest_scenario(app_name, student_id, saves, seed):
+    # AppTest 가 sys.modules['__main__'] 를 앱 스크립트로 바꾸므로 워커 재사용을 위해 복원
+    main_module = sys.modules['__main__']
+    try:
+        return _apptest_scenario(app_name, student_id, saves, seed)
+    finally:
+        sys.modules['__main__'] = main_module
+
+
+def _apptest_scenario(app_name, student_id, saves, seed):
+    from streamlit.testing.v1 import AppTest
+
+    recorder = Recorder()
+    rng = random.Random(seed)
+
+    at = AppTest.from_file(os.path.join(ROOT, f'{app_name}.py'), default_timeout=60)
+    recorder.measure('page_load', at.run)
+
+    def click(label):
+        next(b for b in at.button if b.label == label).click().run()
+
+    if app_name == 'app':
+        at.selectbox[0].set_value('로그인')
+        at.text_input[0].input(student_id)
+        at.text_input[1].input('pw')
+        recorder.measure('login', click, '로그인')
+        for _ in range(saves):
+            gpa, courses, _ = synthetic_application(rng)
+            at.number_input[0].set_value(gpa)
+            at.multiselect[0].set_value(courses)
+            at.selectbox[0].set_value(MAJORS[0])
+            recorder.measure('save', click, '💾 저장')
+        recorder.measure('submit', click, '📤 최종 제출')
+    else:
+        at.text_input(key='login_id').input(student_id)
+        at.text_input(key='login_pw').input('pw')
+        recorder.measure('login', click, '로그인')
+        for _ in range(saves):
+            gpa, _, _ = synthetic_application(rng)
+            at.number_input[0].set_value(gpa)
+            at.selectbox[0].set_value(MAJORS[0])
+            recorder.measure('save', click, '💾 임시저장')
+        recorder.measure('submit', click, '📋 최종제출')
+
+    if at.exception:
+        recorder.errors['apptest_exception'] += 1
+    return recorder
+
+
+def run_level(app_name, mode, students, concurrency, saves, seed, use_write_behind=False):
+    store = storage.get_store(storage.store_url())
+    prefix = f'{concurrency:03d}'
+    student_ids = [f'{prefix}{i:06d}' for i in range(students)]
+    setup(store, student_ids)
+
+    recorder = Recorder()
+    started = time.perf_counter()
+    if mode == 'apptest':
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=concurrency, mp_context=context) as pool:
+            futures = [pool.submit(apptest_scenario, app_name, sid, saves, seed + i)
+                       for i, sid in enumerate(student_ids)]
+            for future in futures:
+                recorder.merge(future.result())
+    else:
+        queue = None
+        if use_write_behind:
+            queue = write_behind.WriteBehindQueue(store, functools.partial(applications.write_draft, store))
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = [pool.submit(scenario, store, recorder, sid, saves, random.Random(seed + i), queue)
+                       for i, sid in enumerate(student_ids)]
+            for future in futures:
+                future.result()
+        if queue is not None:
+            queue.close()
+    return recorder.report(time.perf_counter() - started)
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def print_level(app_name, concurrency, report, baseline=None):
+    print(f'\n== {app_name} / 동시 사용자 {concurrency} ==  '
+          f'처리량 {report["throughput"]:.1f} ops/s ({report["wall_seconds"]:.2f}s)')
+    print(f'{"작업":<26}{"횟수":>7}{"오류":>6}{"locked%":>9}{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}')
+    for op, stats in report['ops'].items():
+        line = (f'{op:<26}{stats["count"]:>7}{stats["errors"]:>6}{stats["locked_rate"] * 100:>8.2f}%'
+                f'{stats["p50_ms"]:>10.2f}{stats["p95_ms"]:>10.2f}{stats["p99_ms"]:>10.2f}')
+        before = (baseline or {}).get('ops', {}).get(op)
+        if before and before['p95_ms']:
+            line += f'   p95 {((stats["p95_ms"] / before["p95_ms"]) - 1) * 100:+.0f}%'
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='로그인 / 저장 / 제출 부하 테스트')
+    parser.add_argument('--app', choices=['app', 'major_app', 'both'], default='both', help='apptest 모드에서 실행할 화면')
+    parser.add_argument('--mode', choices=['functions', 'apptest'], default='functions')
+    parser.add_argument('--students', type=int, default=200)
+    parser.add_argument('--concurrency', default='1,8,32', help='쉼표로 구분한 동시 사용자 수 목록')
+    parser.add_argument('--saves', type=int, default=3, help='학생당 임시저장 횟수')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--write-behind', action='store_true', help='임시저장을 write-behind 큐로 보냄 (functions 모드)')
+    parser.add_argument('--store', default='sqlite:///loadtest.db',
+                        help='저장소 주소 (임시 디렉터리 기준, 예: memory://, standin:///loadtest.db)')
+    parser.add_argument('--output', help='결과 JSON 경로 (기본: benchmarks/results/<시각>_<리비전>.json)')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON')
+    args = parser.parse_args()
+
+    # functions 모드는 두 앱이 같은 데이터 함수를 쓰므로 한 번만 실행
+    if args.mode == 'functions':
+        apps = ['core']
+    else:
+        apps = ['app', 'major_app'] if args.app == 'both' else [args.app]
+    levels = [int(level) for level in args.concurrency.split(',')]
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = {(r['app'], r['concurrency']): r for r in json.load(f)['runs']}
+
+    results = {
+        'revision': git_revision(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'mode': args.mode,
+        'students': args.students,
+        'saves': args.saves,
+        'write_behind': args.write_behind,
+        'store': args.store,
+        'runs': [],
+    }
+
+    output = os.path.abspath(args.output) if args.output else None
+    with tempfile.TemporaryDirectory() as workdir:
+        # 저장소 주소는 상대 경로이므로 임시 디렉터리에서 실행 (apptest 워커도 같은 주소 사용)
+        os.chdir(workdir)
+        os.environ[storage.URL_ENV] = args.store
+        for app_name in apps:
+            for concurrency in levels:
+                report = run_level(app_name, args.mode, args.students, concurrency, args.saves, args.seed, args.write_behind)
+                report.update({'app': app_name, 'concurrency': concurrency})
+                results['runs'].append(report)
+                print_level(app_name, concurrency, report, (baseline or {}).get((app_name, concurrency)))
+        os.chdir(ROOT)
+
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output = os.path.join(RESULTS_DIR, f'{stamp}_{args.mode}_{results["revision"]}.json')
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f'\n결과 저장: {output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+# 정규화 전/후 조회 성능 비교
+#
+#   python benchmarks/normalized_schema.py --students 20000
+#
+# 학생 데이터베이스(core.storage 스키마)를 정규화 직전 버전으로 만들고 가상의 학생 데이터를 채운 뒤
+# "이산수학 이수자", "인공지능을 몇 지망이든 지원한 학생" 조회 시간을 잰다.
+# 이어서 실제 마이그레이션을 적용하고, 데이터가 그대로 옮겨졌는지 확인한 다음
+# 정규화 테이블 기준으로 같은 조회를 다시 잰다.
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from core import applications, schema, storage  # noqa: E402
+
+COURSE = '이산수학'
+MAJOR = '인공지능'
+
+
+def best_of(repeat, fn):
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def synthetic_rows(count, majors, courses, seed=7):
+    rng = random.Random(seed)
+    for i in range(count):
+        taken = rng.sample(courses, rng.randint(0, len(courses)))
+        ranked = rng.sample(majors, rng.randint(1, len(majors)))
+        ranked += [None] * (5 - len(ranked))
+        yield (f'2024{i:06d}', f'학생{i}', round(rng.uniform(1.5, 4.3), 2),
+               ','.join(taken), *ranked, rng.random() < 0.6)
+
+
+# students 테이블 하나 (정규화 전 v3)
+def build_app_db(path, count):
+    schema.migrate(path, storage.SCHEMA_MIGRATIONS[:3])
+    conn = sqlite3.connect(path)
+    conn.executemany('''
+        INSERT INTO students (student_id, name, password, semester1_gpa, completed_courses,
+                              major_preference_1, major_preference_2, major_preference_3,
+                              major_preference_4, major_preference_5, is_submitted)
+        VALUES (?, ?, 'x', ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', synthetic_rows(count, applications.MAJORS, applications.COURSES))
+    conn.commit()
+    return conn
+
+
+def legacy_pairs(conn, table, course_column, preference_columns):
+    courses = set()
+    preferences = set()
+    for student_id, courses_str, *ranked in conn.execute(
+            f"SELECT student_id, {course_column}, {', '.join(preference_columns)} FROM {table}"):
+        courses.update((student_id, c) for c in (courses_str or '').split(',') if c)
+        preferences.update((student_id, r, m) for r, m in enumerate(ranked, start=1) if m)
+    return courses, preferences
+
+
+def run(name, conn, path, migrations, table, course_column, preference_columns, repeat):
+    print(f'\n== {name} ==')
+    any_rank = ' OR '.join(f'{column} = ?' for column in preference_columns)
+    expected = legacy_pairs(conn, table, course_column, preference_columns)
+
+    legacy = {
+        '이수자 조회 (LIKE 스캔)': lambda: conn.execute(
+            f"SELECT student_id FROM {table} WHERE (',' || {course_column} || ',') LIKE ?",
+            (f'%,{COURSE},%',)).fetchall(),
+        '이수자 조회 (pandas 분해)': lambda: pd.read_sql_query(
+            f'SELECT student_id, {course_column} FROM {table}', conn
+        ).loc[lambda df: df[course_column].fillna('').str.split(',').apply(lambda c: COURSE in c), 'student_id'].tolist(),
+        '전체 지망 조회 (5개 컬럼 OR)': lambda: conn.execute(
+            f'SELECT student_id FROM {table} WHERE {any_rank}', [MAJOR] * len(preference_columns)).fetchall(),
+    }
+    timings = {label: best_of(repeat, fn) for label, fn in legacy.items()}
+    conn.close()
+
+    started = time.perf_counter()
+    schema.migrate(path, migrations)
+    print(f'마이그레이션: {time.perf_counter() - started:.3f}s')
+
+    conn = sqlite3.connect(path)
+    migrated = (
+        set(conn.execute('SELECT student_id, course FROM student_courses')),
+        set(conn.execute('SELECT student_id, rank, major FROM student_preferences')),
+    )
+    assert migrated == expected, '마이그레이션 전후 데이터가 다릅니다'
+
+    normalized = {
+        '이수자 조회 (인덱스)': lambda: conn.execute(
+            'SELECT student_id FROM student_courses WHERE course = ?', (COURSE,)).fetchall(),
+        '전체 지망 조회 (인덱스)': lambda: conn.execute(
+            'SELECT DISTINCT student_id FROM student_preferences WHERE major = ?', (MAJOR,)).fetchall(),
+    }
+    timings.update({label: best_of(repeat, fn) for label, fn in normalized.items()})
+    conn.close()
+
+    for label, (seconds, rows) in timings.items():
+        print(f'{label:<28} {seconds * 1000:9.2f} ms  ({len(rows)}명)')
+
+    for before, after in [('이수자 조회 (LIKE 스캔)', '이수자 조회 (인덱스)'),
+                          ('전체 지망 조회 (5개 컬럼 OR)', '전체 지망 조회 (인덱스)')]:
+        print(f'{after}: {timings[before][0] / timings[after][0]:.1f}배 빠름')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='정규화 전/후 조회 성능 비교')
+    parser.add_argument('--students', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        app_path = os.path.join(workdir, 'student_major.db')
+        run('students (student_major.db)', build_app_db(app_path, args.students), app_path,
+            storage.SCHEMA_MIGRATIONS, 'students', 'completed_courses',
+            [f'major_preference_{rank}' for rank in range(1, 6)], args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+# 신청 현황 보고서 갱신 / 조회 성능
+#
+#   python benchmarks/report_refresh.py --students 20000 --batch 200
+#   python benchmarks/report_refresh.py --store standin:///reports.db
+#
+# 임시 디렉터리의 저장소에 가상 학생을 만들고 처음 집계를 만든 뒤, 매 회차마다 일부 학생이 저장 / 제출하고
+#   - 증분 갱신 (refresh_reports, 새 이벤트만 반영)
+#   - 보고서 조회 (load_reports + 피벗)
+#   - 같은 표를 전체 학생 상태로 처음부터 다시 집계한 시간
+# 을 재고 두 결과가 같은지 확인한다.
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import applications, reporting, storage  # noqa: E402
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def random_application(rng):
+    preferences = rng.sample(applications.MAJORS, rng.randint(1, 5))
+    return (round(rng.uniform(2.0, 4.3), 2), rng.sample(applications.COURSES, rng.randint(1, 3)),
+            preferences + [None] * (5 - len(preferences)))
+
+
+# 전체 다시 집계: 학생별 마지막 상태를 모두 읽어 한 번에 그룹 합계
+def full_rebuild(store):
+    return reporting.deltas([], store.cohort_at('9999-12-31 23:59:59.999'))
+
+
+def comparable(reports):
+    return {
+        name: sorted((*row[:-1], round(row[-1], 6)) if name == 'gpa' else tuple(row) for row in reports[name])
+        for name in reporting.TABLES
+    }
+
+
+def load_pivots(store):
+    reports = store.load_reports()
+    for rank in reporting.RANKS[:-1]:
+        reporting.gpa_pivot(reports, rank, applications.MAJORS)
+        reporting.course_pivot(reports, rank, applications.MAJORS, applications.COURSES)
+        reporting.transition_pivot(reports, rank, applications.MAJORS)
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description='신청 현황 보고서 갱신 / 조회 성능')
+    parser.add_argument('--students', type=int, default=20000)
+    parser.add_argument('--batch', type=int, default=200, help='회차마다 저장하는 학생 수')
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=5)
+    parser.add_argument('--store', default='sqlite:///reports.db', help='저장소 주소 (임시 디렉터리 기준)')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        store = storage.open_store(args.store)
+        store.init()
+
+        ids = [f'{i:08d}' for i in range(args.students)]
+        with store.transaction() as conn:
+            store.create_accounts(conn, [
+                dict(zip(('gpa', 'courses', 'preferences'), random_application(rng)),
+                     student_id=sid, name=f'학생{sid}', password_hash='x', is_submitted=rng.random() < 0.5)
+                for sid in ids
+            ])
+        seconds, refreshed = timed(store.refresh_reports)
+        print(f"학생 {len(ids)}명, 처음 집계 {seconds * 1000:.1f} ms (이벤트 {refreshed['events']}건)")
+
+        print(f'{"회차":<6}{"증분 갱신 ms":>14}{"조회 ms":>10}{"전체 재집계 ms":>16}{"반영 학생":>10}')
+        for number in range(1, args.rounds + 1):
+            with store.transaction() as conn:
+                for sid in rng.sample(ids, args.batch):
+                    record = store.load_record(sid)
+                    if record.is_submitted:
+                        continue
+                    version = store.write_record(conn, sid, *random_application(rng))
+                    if rng.random() < 0.3:
+                        store.submit(conn, sid, version)
+            incremental, refreshed = timed(store.refresh_reports)
+            load, reports = timed(lambda: load_pivots(store))
+            rebuild, expected = timed(lambda: full_rebuild(store))
+            assert comparable(reports) == comparable(expected), number
+            print(f'{number:<6}{incremental * 1000:>14.1f}{load * 1000:>10.1f}{rebuild * 1000:>16.1f}'
+                  f'{refreshed["students"] if refreshed else 0:>10}')
+        os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+if __name__ == '__main__':
+    main()
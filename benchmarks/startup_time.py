@@ -0,0 +1,196 @@
+# 콜드 스타트 시간 측정 (의존성별 import 비용)
+#
+#   python benchmarks/startup_time.py
+#   python benchmarks/startup_time.py --repeat 7 --apptest
+#   python benchmarks/startup_time.py --compare benchmarks/results/이전결과.json
+#
+# 대상마다 새 파이썬 프로세스를 띄워 import 시간을 재고(python -X importtime),
+# 걸린 시간을 최상위 패키지(streamlit, pandas, reportlab ...)별로 나눠 보여준다.
+# 앱 모듈(app, major_app)은 import 후 어떤 무거운 패키지가 메모리에 올라왔는지도 기록한다.
+# --apptest 를 주면 streamlit.testing 으로 첫 화면(로그인) 한 번 실행까지의 시간도 잰다.
+# 결과는 JSON 으로 저장하며 --compare 로 이전 결과(예: 지연 import 적용 전)와 비교한다.
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+# 의존성 단독 import 비용
+DEPENDENCIES = [
+    'streamlit',
+    'pandas',
+    'numpy',
+    'reportlab.pdfgen.canvas',
+    'reportlab.platypus',
+    'reportlab.pdfbase.ttfonts',
+    'openpyxl',
+    'pyarrow',
+]
+
+# 앱 시작 시 import 하는 모듈
+APPS = ['app', 'major_app']
+
+# 화면 첫 실행에서 쓰이면 안 되는(관리자 / PDF / 파일 처리 전용) 패키지
+HEAVY = ['pandas', 'numpy', 'reportlab', 'openpyxl', 'pyarrow', 'psycopg']
+
+# 자식 프로세스: import 시간과 로딩된 무거운 패키지를 JSON 한 줄로 출력
+IMPORT_CHILD = '''
+import json, sys, time
+started = time.perf_counter()
+import {target}
+seconds = time.perf_counter() - started
+print(json.dumps({{'seconds': seconds, 'loaded': [name for name in {heavy!r} if name in sys.modules]}}))
+'''
+
+APPTEST_CHILD = '''
+import json, sys, time
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({path!r}, default_timeout=60).run()
+seconds = time.perf_counter() - started
+print(json.dumps({{'seconds': seconds, 'loaded': [name for name in {heavy!r} if name in sys.modules],
+                   'exceptions': len(at.exception)}}))
+'''
+
+
+# -X importtime 출력(stderr)을 최상위 패키지별 self 시간 합계(초)로 묶기
+def parse_importtime(stderr):
+    totals = defaultdict(float)
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        package = name.strip().split('.')[0]
+        totals[package] += int(self_us) / 1e6
+    return totals
+
+
+def run_child(code, importtime=False):
+    command = [sys.executable]
+    if importtime:
+        command += ['-X', 'importtime']
+    # 첫 화면 실행이 실제 데이터베이스를 만들지 않도록 메모리 저장소 사용
+    env = dict(os.environ, STUDENT_DB_URL='memory://')
+    completed = subprocess.run(command + ['-c', code], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result['packages'] = parse_importtime(completed.stderr) if importtime else {}
+    return result
+
+
+# 대상 하나를 repeat 번 새 프로세스에서 측정 (중앙값)
+def measure(code, repeat, breakdown_top):
+    runs = [run_child(code, importtime=True) for _ in range(repeat)]
+    packages = defaultdict(list)
+    for run in runs:
+        for package, seconds in run['packages'].items():
+            packages[package].append(seconds)
+    medians = {package: statistics.median(values + [0.0] * (repeat - len(values)))
+               for package, values in packages.items()}
+    top = sorted(medians.items(), key=lambda item: -item[1])[:breakdown_top]
+    result = {
+        'median_ms': statistics.median(run['seconds'] for run in runs) * 1000,
+        'min_ms': min(run['seconds'] for run in runs) * 1000,
+        'loaded': runs[-1]['loaded'],
+        'packages_ms': {package: seconds * 1000 for package, seconds in top},
+    }
+    if 'exceptions' in runs[-1]:
+        result['exceptions'] = runs[-1]['exceptions']
+    return result
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def print_section(title, results, baseline):
+    print(f'\n== {title} ==')
+    print(f'{"대상":<30}{"중앙값 ms":>11}{"최소 ms":>10}   이전 대비 / 로딩된 무거운 패키지')
+    for target, stats in results.items():
+        line = f'{target:<30}{stats["median_ms"]:>11.1f}{stats["min_ms"]:>10.1f}'
+        before = baseline.get(target)
+        if before and before['median_ms']:
+            line += f'   {((stats["median_ms"] / before["median_ms"]) - 1) * 100:+.0f}%'
+        if stats['loaded'] or target in APPS or 'exceptions' in stats:
+            line += f'   [{", ".join(stats["loaded"]) or "-"}]'
+        if stats.get('exceptions'):
+            line += f'   예외 {stats["exceptions"]}건'
+        print(line)
+        if target in APPS or 'exceptions' in stats:
+            before_packages = (before or {}).get('packages_ms', {})
+            for package, ms in stats['packages_ms'].items():
+                detail = f'    {package:<26}{ms:>11.1f}'
+                if package in before_packages:
+                    detail += f'   (이전 {before_packages[package]:.1f})'
+                print(detail)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='콜드 스타트 시간 측정 (의존성별 import 비용)')
+    parser.add_argument('--repeat', type=int, default=5, help='대상마다 새 프로세스로 측정하는 횟수')
+    parser.add_argument('--breakdown', type=int, default=8, help='앱 모듈 import 시간을 나눠 보여줄 패키지 수')
+    parser.add_argument('--apptest', action='store_true', help='첫 화면 실행(AppTest)까지의 시간도 측정')
+    parser.add_argument('--skip-dependencies', action='store_true', help='의존성 단독 측정 생략')
+    parser.add_argument('--output', help='결과 JSON 경로 (기본: benchmarks/results/<시각>_startup_<리비전>.json)')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON')
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            previous = json.load(f)
+        for section in ('dependencies', 'apps', 'first_page'):
+            baseline.update({f'{section}:{target}': stats for target, stats in previous.get(section, {}).items()})
+
+    results = {
+        'revision': git_revision(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'repeat': args.repeat,
+        'dependencies': {},
+        'apps': {},
+        'first_page': {},
+    }
+
+    if not args.skip_dependencies:
+        for target in DEPENDENCIES:
+            results['dependencies'][target] = measure(
+                IMPORT_CHILD.format(target=target, heavy=HEAVY), args.repeat, args.breakdown
+            )
+    for target in APPS:
+        results['apps'][target] = measure(IMPORT_CHILD.format(target=target, heavy=HEAVY), args.repeat, args.breakdown)
+    if args.apptest:
+        for target in APPS:
+            path = os.path.join(ROOT, f'{target}.py')
+            results['first_page'][target] = measure(
+                APPTEST_CHILD.format(path=path, heavy=HEAVY), args.repeat, args.breakdown
+            )
+
+    for section, title in (('dependencies', '의존성 단독 import'), ('apps', '앱 모듈 import'),
+                           ('first_page', '첫 화면 실행 (AppTest)')):
+        if results[section]:
+            print_section(title, results[section],
+                          {target: baseline.get(f'{section}:{target}') for target in results[section]})
+
+    output = os.path.abspath(args.output) if args.output else None
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output = os.path.join(RESULTS_DIR, f'{stamp}_startup_{results["revision"]}.json')
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f'\n결과 저장: {output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+# 전공선택 시스템 공용 모듈 (app.py / major_app.py 공통)
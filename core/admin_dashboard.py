@@ -0,0 +1,212 @@
+import os
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from core import admin_grid, allocation, applications, audit, catalog, deadline, fonts, metrics, pdf_cache, rate_limit, reporting, roster_import, sessions, simulator, table_export
+
+# 관리자 학생 표 구성 (한글 컬럼명, SQL 저장소의 students 테이블과 정규화 테이블)
+ADMIN_GRID = {
+    'from': 'students',
+    'key': 'student_id',
+    'columns': [
+        ('학번', 'student_id'),
+        ('이름', 'name'),
+        ('1학기학점', 'semester1_gpa'),
+        ('이수교과목', admin_grid.COURSES),
+        *[(f'{rank}지망', admin_grid.preference(rank)) for rank in range(1, 6)],
+        ('제출여부', f"CASE WHEN deadline_status = 'auto_submitted' THEN '{deadline.STATUSES['auto_submitted']}' "
+                 f"WHEN is_submitted THEN '제출완료' "
+                 f"WHEN deadline_status = 'incomplete' THEN '{deadline.STATUSES['incomplete']}' ELSE '미제출' END"),
+        ('등록일시', 'created_at'),
+        ('수정일시', 'updated_at'),
+    ],
+    'gpa': 'semester1_gpa',
+    'submitted': 'is_submitted',
+    'sortable': {
+        '학번': 'student_id',
+        '이름': 'name',
+        '1학기학점': 'semester1_gpa',
+        '수정일시': 'updated_at',
+    },
+}
+
+# 마감 처리 후 학생 표 (마감 시점 고정 테이블)
+FROZEN_GRID = dict(ADMIN_GRID, **dict(zip(('from', 'preferences', 'courses'), deadline.FROZEN_TABLES)))
+
+
+# 신청서 PDF 일괄 생성 ZIP 임시 파일 (세션마다 최근 것 하나)
+# 내려받지 않고 끝난 세션의 파일은 ZIP_MAX_AGE_SECONDS 가 지나면 대시보드를 그릴 때 지운다.
+ZIP_DIR = os.path.join(tempfile.gettempdir(), 'application_pdf_zips')
+ZIP_MAX_AGE_SECONDS = 60 * 60
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+# 이 세션의 이전 ZIP 삭제 (다시 생성할 때)
+def _discard_pdf_zip():
+    zip_path = st.session_state.pop('pdf_zip_path', None)
+    if zip_path:
+        _remove(zip_path)
+
+
+# 오래된 ZIP 삭제 (모든 세션)
+def _sweep_pdf_zips(max_age=ZIP_MAX_AGE_SECONDS):
+    cutoff = time.time() - max_age
+    try:
+        entries = list(os.scandir(ZIP_DIR))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        if entry.stat().st_mtime < cutoff:
+            _remove(entry.path)
+
+
+def _read_file(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+# 관리자 대시보드 (두 화면 공통)
+# template 은 신청서 PDF 일괄 생성에 쓰는 템플릿 이름이다.
+# 전공 / 교과목은 저장소의 목록 스냅숏을 쓴다 (core.catalog).
+# 학생 표 / 전공 배정 / 정원 시뮬레이션은 저장소의 SQL 조회(admin_queries)로 읽으며 메모리 저장소에서는 표시하지 않고,
+# 마감 처리 후에는 마감 시점에 고정된 테이블(core.deadline)을 읽는다.
+def render(store, template):
+    st.header("📊 관리자 대시보드")
+
+    counters = store.counters()
+    listing = catalog.snapshot(store)
+    majors, courses = list(listing.majors), list(listing.courses)
+    round_ = deadline.get_deadline_job(store.url, store).refresh()
+    frozen = round_.frozen_at is not None
+
+    # 신청 마감 설정 / 마감 처리 (학생이 없을 때도 표시)
+    with st.expander("⏰ 신청 마감", expanded=deadline.due(round_)):
+        deadline.render_admin(store, round_)
+
+    # 전공 / 교과목 / 안내 문구 목록 수정 (학생이 없을 때도 표시)
+    with st.expander("🗂️ 전공 / 교과목 / 안내 문구 관리"):
+        catalog.render_editor(store)
+
+    # 학생 명단 일괄 등록 (학생이 없을 때도 표시)
+    with st.expander("📥 학생 명단 일괄 등록"):
+        roster_import.render_upload(store, courses)
+
+    if not counters['total']:
+        st.info("등록된 학생이 없습니다.")
+        return
+
+    st.subheader("학생 데이터")
+    if store.admin_queries:
+        admin_grid.render_grid(store, FROZEN_GRID if frozen else ADMIN_GRID, majors, courses)
+    else:
+        st.caption("학생 표 / 전공 배정 / 정원 시뮬레이션은 메모리 저장소에서는 표시되지 않습니다.")
+
+    # 파일 다운로드 (한글 시트명 및 파일명, 버튼을 누를 때 생성)
+    export_format = st.radio("내보내기 형식", list(table_export.FORMATS), horizontal=True)
+    extension, mime = table_export.FORMATS[export_format]
+
+    st.download_button(
+        label=f"📥 {export_format} 파일 다운로드",
+        data=lambda: applications.export_records(store, export_format),
+        file_name=f"전공선택현황_{datetime.now().strftime('%Y년%m월%d일_%H시%M분')}.{extension}",
+        mime=mime
+    )
+
+    # 신청서 PDF 일괄 다운로드 (ZIP 은 임시 파일로 만들고 버튼을 누를 때 읽음)
+    st.subheader("📦 신청서 PDF 일괄 다운로드")
+    _sweep_pdf_zips()
+    if st.button("제출된 신청서 PDF 일괄 생성"):
+        progress_bar = st.progress(0.0, text="PDF 생성 중...")
+        _discard_pdf_zip()
+        os.makedirs(ZIP_DIR, exist_ok=True)
+        fd, zip_path = tempfile.mkstemp(suffix='.zip', dir=ZIP_DIR)
+        os.close(fd)
+        count = applications.export_submitted_pdfs(
+            store, template, zip_path,
+            lambda done, total: progress_bar.progress(
+                done / total if total else 1.0, text=f"PDF 생성 중... {done}/{total}"
+            )
+        )
+        st.session_state.pdf_zip_path = zip_path
+        st.success(f"{count}건의 신청서 PDF를 생성했습니다.")
+
+    zip_path = st.session_state.get('pdf_zip_path')
+    if zip_path and os.path.exists(zip_path):
+        st.download_button(
+            label="📥 신청서 PDF 일괄 다운로드 (ZIP)",
+            data=lambda: _read_file(zip_path),
+            file_name=f"전공선택신청서_{datetime.now().strftime('%Y년%m월%d일_%H시%M분')}.zip",
+            mime="application/zip",
+        )
+
+    # 변경 이력 (학생별 / 특정 시점 전체 현황)
+    with st.expander("🕘 신청서 변경 이력"):
+        audit.render_history(store)
+
+    # 통계 정보
+    st.subheader("📈 통계")
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.metric("총 학생 수", counters['total'])
+
+    with col2:
+        st.metric("제출 완료", counters['submitted'])
+
+    with col3:
+        st.metric("미제출", counters['pending'])
+
+    if frozen:
+        col1, col2 = st.columns(2)
+        col1.metric(deadline.STATUSES['auto_submitted'], round_.finalized)
+        col2.metric(deadline.STATUSES['incomplete'], round_.flagged)
+
+    # 전공별 지원 현황
+    rank = st.selectbox("지망 순위", [1, 2, 3, 4, 5], format_func=lambda r: f"{r}지망")
+    st.subheader(f"전공별 지원 현황 ({rank}지망 기준)")
+    major_counts = pd.Series(store.major_counts(rank), dtype='int64')
+    if not major_counts.empty:
+        st.bar_chart(major_counts)
+
+    # 신청 현황 보고서 (미리 집계한 피벗 테이블)
+    st.subheader("📑 신청 현황 보고서")
+    reporting.render_reports(store, majors, courses)
+
+    if store.admin_queries and frozen:
+        st.caption(f"전공 배정 / 정원 시뮬레이션은 마감 시점({audit.to_local(round_.frozen_at)})의 신청서를 사용합니다.")
+        st.subheader("🎯 전공 배정")
+        allocation.render_allocation(store, majors, courses, frozen=True, key='allocation_frozen')
+        st.subheader("🧪 정원 변경 시뮬레이션 (학점순 배정)")
+        simulator.render_simulator(store, majors, frozen=True, key='simulator_frozen')
+    elif store.admin_queries:
+        # 전공 배정
+        st.subheader("🎯 전공 배정")
+        allocation.render_allocation(store, majors, courses)
+
+        # 정원 시뮬레이션
+        st.subheader("🧪 정원 변경 시뮬레이션 (학점순 배정)")
+        simulator.render_simulator(store, majors)
+
+    # 시스템 상태
+    with st.expander("⚙️ 시스템 상태"):
+        st.write("저장소", store.url)
+        st.write("목록 캐시", catalog.get_catalog_cache(store.url, store).info())
+        st.write("신청 마감", round_._asdict())
+        st.write("로그인 세션", sessions.get_session_manager(store.url, store).info())
+        st.write("로그인 시도 제한", rate_limit.get_login_limiter().info())
+        st.write("한글 폰트", fonts.get_font_registry().info())
+        st.write("PDF 캐시", pdf_cache.get_pdf_cache().stats())
+
+    # 성능 지표 (함수별 지연시간)
+    with st.expander("📈 성능 지표"):
+        metrics.render_metrics()
@@ -0,0 +1,183 @@
+import math
+
+import streamlit as st
+
+from core import deadline, metrics
+
+PAGE_SIZE = 50
+ALL = '전체'
+
+# 배정 입력 테이블 (학생, 지망, 이수 교과목)
+TABLES = ('students', 'student_preferences', 'student_courses')
+
+# 표 구성의 열 중 SQL 식 대신 정규화 테이블에서 채우는 열 (이수 교과목 / n지망)
+COURSES = ('courses',)
+
+
+def preference(rank):
+    return ('preference', rank)
+
+
+# 아래 함수들은 SQL 저장소(SQLite / 서버) 공통 구현이다.
+# execute(conn, sql, params) 는 %s 자리표시자 SQL 을 실행하고 커서를 돌려준다.
+
+# 관리자 표 조회 조건 (WHERE 절과 인자)
+# grid 는 앱별 테이블 구성을 설명하는 dict 이다.
+#   from: FROM 절, key: 학번 SQL 식, columns: [(표시 이름, SQL 식 / COURSES / preference(n))],
+#   gpa / submitted: SQL 식, sortable: {표시 이름: SQL 식},
+#   preferences / courses: 지망 / 이수 교과목 테이블 (없으면 student_preferences / student_courses)
+# 전공 지망과 이수 교과목 조건은 정규화 테이블의 인덱스로 찾는다.
+def build_where(grid, filters):
+    clauses = []
+    params = []
+    preferences = grid.get('preferences', TABLES[1])
+    courses = grid.get('courses', TABLES[2])
+
+    status = filters.get('status', ALL)
+    if status != ALL:
+        clauses.append(f"{'' if status == '제출완료' else 'NOT '}COALESCE({grid['submitted']}, FALSE)")
+
+    major = filters.get('major', ALL)
+    if major != ALL:
+        rank = filters.get('rank')
+        if rank:
+            clauses.append(f"{grid['key']} IN (SELECT student_id FROM {preferences} WHERE major = %s AND rank = %s)")
+            params.extend([major, rank])
+        else:
+            clauses.append(f"{grid['key']} IN (SELECT student_id FROM {preferences} WHERE major = %s)")
+            params.append(major)
+
+    gpa_min, gpa_max = filters.get('gpa', (None, None))
+    if gpa_min is not None:
+        clauses.append(f"{grid['gpa']} >= %s")
+        params.append(gpa_min)
+    if gpa_max is not None:
+        clauses.append(f"{grid['gpa']} <= %s")
+        params.append(gpa_max)
+
+    course = filters.get('course', ALL)
+    if course != ALL:
+        clauses.append(f"{grid['key']} IN (SELECT student_id FROM {courses} WHERE course = %s)")
+        params.append(course)
+
+    where = ('WHERE ' + ' AND '.join(clauses)) if clauses else ''
+    return where, params
+
+
+# 조건에 맞는 학생 수
+@metrics.timed('admin_grid.count_rows')
+def count_rows(execute, conn, grid, filters):
+    where, params = build_where(grid, filters)
+    return execute(conn, f"SELECT COUNT(*) FROM {grid['from']} {where}", params).fetchone()[0]
+
+
+# 한 페이지의 학생들의 이수 교과목 (선택 순서대로 쉼표 구분) / 지망 {(학번, 순위): 전공}
+def _children(execute, conn, grid, student_ids):
+    if not student_ids:
+        return {}, {}
+    ids = ', '.join(['%s'] * len(student_ids))
+    courses = {}
+    for student_id, course in execute(
+        conn, f"SELECT student_id, course FROM {grid.get('courses', TABLES[2])} "
+              f"WHERE student_id IN ({ids}) ORDER BY student_id, position", student_ids
+    ).fetchall():
+        courses[student_id] = f'{courses[student_id]},{course}' if student_id in courses else course
+    preferences = {
+        (student_id, rank): major for student_id, rank, major in execute(
+            conn, f"SELECT student_id, rank, major FROM {grid.get('preferences', TABLES[1])} "
+                  f"WHERE student_id IN ({ids})", student_ids
+        ).fetchall()
+    }
+    return courses, preferences
+
+
+# 한 페이지 조회 (정렬 기준은 grid['sortable'] 에 있는 것만 허용)
+# 반환값: grid['columns'] 순서의 값 목록들
+@metrics.timed('admin_grid.fetch_page')
+def fetch_page(execute, conn, grid, filters, sort_by, descending=False, page=1, page_size=PAGE_SIZE):
+    where, params = build_where(grid, filters)
+    order = 'DESC' if descending else 'ASC'
+    select = ', '.join(expr for _, expr in grid['columns'] if isinstance(expr, str))
+    rows = execute(conn, f'''
+        SELECT {grid['key']}, {select} FROM {grid['from']} {where}
+        ORDER BY {grid['sortable'][sort_by]} {order}, {grid['key']} {order}
+        LIMIT %s OFFSET %s
+    ''', params + [page_size, (page - 1) * page_size]).fetchall()
+
+    courses, preferences = _children(execute, conn, grid, [row[0] for row in rows])
+    page_rows = []
+    for student_id, *values in rows:
+        values = iter(values)
+        page_rows.append([
+            next(values) if isinstance(expr, str)
+            else courses.get(student_id) if expr == COURSES
+            else preferences.get((student_id, expr[1]))
+            for _, expr in grid['columns']
+        ])
+    return page_rows
+
+
+# 전공 배정 / 정원 시뮬레이션 대상 (제출 완료자) 수 (frozen 이면 마감 시점 고정 테이블)
+def count_applicants(execute, conn, frozen=False):
+    students = (deadline.FROZEN_TABLES if frozen else TABLES)[0]
+    return execute(conn, f'SELECT COUNT(*) FROM {students} WHERE is_submitted').fetchone()[0]
+
+
+# 제출 완료자 (학번, 이름, 학점) 와 그 학생들의 지망 (학번, 순위, 전공) / 이수 교과목 (학번, 교과목) 행
+# 지망 / 이수 교과목도 대상 학생 것만 SQL 에서 골라 읽는다.
+def applicant_rows(execute, conn, frozen=False):
+    students, preferences, courses = deadline.FROZEN_TABLES if frozen else TABLES
+    applicants = f'WHERE student_id IN (SELECT student_id FROM {students} WHERE is_submitted)'
+    return (
+        execute(conn, f'SELECT student_id, name, semester1_gpa FROM {students} WHERE is_submitted '
+                      f'ORDER BY student_id').fetchall(),
+        execute(conn, f'SELECT student_id, rank, major FROM {preferences} {applicants}').fetchall(),
+        execute(conn, f'SELECT student_id, course FROM {courses} {applicants}').fetchall(),
+    )
+
+
+# 관리자 학생 표 (필터 / 정렬 / 페이지 이동)
+def render_grid(store, grid, majors, courses, key='admin_grid'):
+    import pandas as pd
+
+    with st.expander("🔎 필터 / 정렬"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            status = st.selectbox("제출 상태", [ALL, '제출완료', '미제출'], key=f'{key}_status')
+            gpa = st.slider("1학기 학점", 0.0, 4.3, (0.0, 4.3), step=0.1, key=f'{key}_gpa')
+        with col2:
+            major = st.selectbox("지망 전공", [ALL] + list(majors), key=f'{key}_major')
+            rank = st.selectbox(
+                "지망 순위", [None, 1, 2, 3, 4, 5],
+                format_func=lambda r: '전체 순위' if r is None else f'{r}지망',
+                key=f'{key}_rank'
+            )
+        with col3:
+            course = st.selectbox("이수 교과목", [ALL] + list(courses), key=f'{key}_course')
+            sort_by = st.selectbox("정렬 기준", list(grid['sortable']), key=f'{key}_sort')
+            descending = st.checkbox("내림차순", key=f'{key}_desc')
+
+    filters = {
+        'status': status,
+        'major': major,
+        'rank': rank,
+        # 전체 범위면 학점 미입력 학생도 포함
+        'gpa': (None, None) if gpa == (0.0, 4.3) else gpa,
+        'course': course,
+    }
+
+    total = store.count_grid_rows(grid, filters)
+    pages = max(1, math.ceil(total / PAGE_SIZE))
+    # 조건이 바뀌면 1페이지부터 다시 보여줌
+    page = st.number_input(
+        f"페이지 (전체 {pages}쪽)", min_value=1, max_value=pages, value=1,
+        key=f"{key}_page_{hash((status, major, rank, filters['gpa'], course, sort_by, descending))}"
+    )
+
+    rows = store.fetch_grid_page(grid, filters, sort_by, descending, page)
+    df = pd.DataFrame(rows, columns=[label for label, _ in grid['columns']])
+    st.dataframe(df, use_container_width=True, hide_index=True)
+
+    start = (page - 1) * PAGE_SIZE
+    st.caption(f"조건에 맞는 학생 {total}명 중 {start + 1 if total else 0}–{start + len(df)}번째")
+    return total
@@ -0,0 +1,200 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from core import metrics
+
+METHODS = {
+    'serial': '학점순 배정 (Serial Dictatorship)',
+    'deferred': '교과목 가산점 반영 (Deferred Acceptance)',
+}
+TIEBREAKS = {
+    'student_id': '학번 순',
+    'lottery': '추첨',
+}
+
+
+# 배정 대상 신청자 (제출 완료자) 와 지망 / 이수 교과목 (frozen 이면 마감 시점 고정 테이블)
+@metrics.timed('allocation.load_applicants')
+def load_applicants(store, frozen=False):
+    students, preferences, courses = store.load_applicants(frozen)
+    return (
+        pd.DataFrame.from_records(students, columns=['student_id', 'name', 'gpa'], coerce_float=True),
+        pd.DataFrame.from_records(preferences, columns=['student_id', 'rank', 'major']),
+        pd.DataFrame.from_records(courses, columns=['student_id', 'course']),
+    )
+
+
+# 지망 행렬 (학생 × 순위, 전공 번호 / 없으면 -1)
+# 빈 지망과 중복 지망은 건너뛰고 앞으로 당긴다.
+def preference_matrix(students, preferences, majors, ranks=5):
+    major_index = {major: i for i, major in enumerate(majors)}
+    row = pd.Series(np.arange(len(students)), index=students['student_id'])
+
+    ranked = preferences[preferences['major'].isin(major_index)]
+    ranked = ranked.sort_values(['student_id', 'rank']).drop_duplicates(['student_id', 'major'])
+    position = ranked.groupby('student_id').cumcount().to_numpy()
+    keep = position < ranks
+
+    matrix = np.full((len(students), ranks), -1, dtype=np.int64)
+    matrix[row[ranked['student_id']].to_numpy()[keep], position[keep]] = \
+        ranked['major'].map(major_index).to_numpy()[keep]
+    return matrix
+
+
+# 전공별 우선순위 점수 (학생 × 전공)
+# 기본은 학점이며, course_bonus {전공: {교과목: 가산점}} 이 있으면 전공마다 더한다.
+def score_matrix(students, courses, majors, course_bonus=None):
+    gpa = students['gpa'].fillna(0.0).to_numpy(dtype=float)
+    scores = np.repeat(gpa[:, None], len(majors), axis=1)
+
+    if course_bonus:
+        row = pd.Series(np.arange(len(students)), index=students['student_id'])
+        taken = courses.assign(row=row[courses['student_id']].to_numpy())
+        for j, major in enumerate(majors):
+            bonus = taken['course'].map(course_bonus.get(major, {})).fillna(0.0)
+            np.add.at(scores[:, j], taken['row'].to_numpy(), bonus.to_numpy())
+    # 부동소수점 합산 오차로 같은 점수가 달라지지 않도록 반올림
+    return np.round(scores, 6)
+
+
+# 동점 처리 순서 (작을수록 우선)
+def tiebreak_order(students, tiebreak='student_id', seed=0):
+    if tiebreak == 'lottery':
+        return np.random.default_rng(seed).permutation(len(students))
+    order = np.argsort(students['student_id'].to_numpy(dtype=object), kind='stable')
+    position = np.empty(len(order), dtype=np.int64)
+    position[order] = np.arange(len(order))
+    return position
+
+
+# 전공별 우선순위 (학생 × 전공, 0 이 가장 높음)
+def priority_matrix(scores, tiebreak):
+    priority = np.empty(scores.shape, dtype=np.int64)
+    for j in range(scores.shape[1]):
+        order = np.lexsort((tiebreak, -scores[:, j]))
+        priority[order, j] = np.arange(len(order))
+    return priority
+
+
+# 정원 제약 배정 (학생 제안 Deferred Acceptance, 라운드 단위 벡터 연산)
+# 모든 전공의 우선순위가 같으면 (학점 + 동점 처리) 결과는
+# 우선순위 순으로 한 명씩 고르는 Serial Dictatorship 과 정확히 같다.
+# 반환값: 학생별 배정 전공 번호와 배정된 지망 순위 (미배정은 -1)
+def deferred_acceptance(pref, priority, capacity):
+    n, ranks = pref.shape
+    assigned = np.full(n, -1, dtype=np.int64)
+    pointer = np.zeros(n, dtype=np.int64)
+    capacity = np.asarray(capacity, dtype=np.int64)
+    rows = np.arange(n)
+
+    while True:
+        free = (assigned < 0) & (pointer < ranks)
+        free[free] = pref[rows[free], pointer[free]] >= 0
+        proposers = rows[free]
+        if len(proposers) == 0:
+            break
+
+        targets = pref[proposers, pointer[proposers]]
+        pointer[proposers] += 1
+
+        held = rows[assigned >= 0]
+        pool = np.concatenate([held, proposers])
+        pool_major = np.concatenate([assigned[held], targets])
+        pool_priority = priority[pool, pool_major]
+
+        # 전공별로 우선순위 정렬 후 정원 안에 드는 학생만 유지
+        order = np.lexsort((pool_priority, pool_major))
+        pool, pool_major = pool[order], pool_major[order]
+        starts = np.searchsorted(pool_major, pool_major, side='left')
+        within = np.arange(len(pool)) - starts
+        accepted = within < capacity[pool_major]
+
+        assigned[pool] = np.where(accepted, pool_major, -1)
+
+    assigned_rank = np.full(n, -1, dtype=np.int64)
+    hit = assigned >= 0
+    assigned_rank[hit] = np.argmax(pref[hit] == assigned[hit, None], axis=1) + 1
+    return assigned, assigned_rank
+
+
+# 전공 배정 실행
+# capacities: {전공: 정원}, method: 'serial' | 'deferred'
+# 반환값: (학생별 결과 DataFrame, 전공별 요약 DataFrame)
+@metrics.timed('allocation.allocate')
+def allocate(students, preferences, courses, capacities, method='serial',
+             course_bonus=None, tiebreak='student_id', seed=0):
+    majors = list(capacities)
+    pref = preference_matrix(students, preferences, majors)
+    scores = score_matrix(students, courses, majors, course_bonus if method == 'deferred' else None)
+    priority = priority_matrix(scores, tiebreak_order(students, tiebreak, seed))
+    assigned, assigned_rank = deferred_acceptance(pref, priority, [capacities[m] for m in majors])
+
+    names = np.array(majors + [None], dtype=object)
+    result = students[['student_id', 'name', 'gpa']].copy()
+    result['배정전공'] = names[assigned]
+    result['배정지망'] = pd.Series(assigned_rank, index=result.index).where(assigned_rank > 0).astype('Int64')
+    result = result.sort_values(['배정전공', 'gpa'], ascending=[True, False], na_position='last')
+
+    placed = result.dropna(subset=['배정전공'])
+    summary = pd.DataFrame({'정원': pd.Series(capacities, dtype='int64')})
+    summary['배정인원'] = placed.groupby('배정전공').size().reindex(majors, fill_value=0)
+    summary['최저학점'] = placed.groupby('배정전공')['gpa'].min().reindex(majors)
+    summary['1지망배정'] = placed[placed['배정지망'] == 1].groupby('배정전공').size().reindex(majors, fill_value=0)
+    return result.reset_index(drop=True), summary
+
+
+# 관리자 화면: 정원 입력 후 배정 실행 (신청서는 배정 실행 버튼을 누를 때만 읽음)
+def render_allocation(store, majors, courses, frozen=False, key='allocation'):
+    applicants = store.count_applicants(frozen)
+    if not applicants:
+        st.info("제출 완료된 신청서가 없습니다.")
+        return
+
+    default_seats = -(-applicants // len(majors))
+    columns = st.columns(len(majors))
+    capacities = {}
+    for column, major in zip(columns, majors):
+        with column:
+            capacities[major] = st.number_input(
+                f"{major} 정원", min_value=0, value=default_seats, step=1, key=f'{key}_cap_{major}'
+            )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        method = st.radio("배정 방식", list(METHODS), format_func=METHODS.get, key=f'{key}_method')
+    with col2:
+        tiebreak = st.radio("동점자 처리", list(TIEBREAKS), format_func=TIEBREAKS.get, key=f'{key}_tiebreak')
+
+    course_bonus = None
+    if method == 'deferred':
+        st.caption("전공별로 이수한 교과목마다 학점에 가산점을 더해 우선순위를 정합니다.")
+        bonus = st.number_input("교과목 가산점", min_value=0.0, max_value=1.0, value=0.1, step=0.05,
+                                key=f'{key}_bonus')
+        course_bonus = {
+            major: dict.fromkeys(
+                st.multiselect(f"{major} 가산 교과목", courses, key=f'{key}_bonus_{major}'), bonus
+            )
+            for major in majors
+        }
+
+    if st.button("🎯 전공 배정 실행", key=f'{key}_run'):
+        students, preferences, student_courses = load_applicants(store, frozen)
+        result, summary = allocate(students, preferences, student_courses, capacities,
+                                   method, course_bonus, tiebreak)
+        st.session_state[f'{key}_result'] = (result, summary)
+
+    if f'{key}_result' in st.session_state:
+        result, summary = st.session_state[f'{key}_result']
+        st.dataframe(summary, use_container_width=True)
+        unassigned = result['배정전공'].isna().sum()
+        if unassigned:
+            st.warning(f"배정되지 않은 학생 {unassigned}명")
+        st.dataframe(result, use_container_width=True, hide_index=True)
+        st.download_button(
+            label="📥 배정 결과 CSV 다운로드",
+            data=result.to_csv(index=False).encode('utf-8-sig'),
+            file_name="전공배정결과.csv",
+            mime="text/csv",
+            key=f'{key}_download'
+        )
@@ -0,0 +1,157 @@
+import functools
+import io
+from datetime import datetime, timezone
+
+from core import bulk_export, catalog, deadline, fonts, metrics, passwords, pdf_cache, pdf_templates, rate_limit, session_record, storage, table_export, write_behind
+
+# 두 화면(app.py, major_app.py)이 함께 쓰는 학생 / 신청서 처리
+# 저장소는 core.storage 의 Store 이며, 화면은 입력과 표시만 담당한다.
+# 학생의 회원가입 / 저장 / 제출은 같은 트랜잭션에서 마감 여부를 확인한다
+# (마감 후에는 core.deadline.RoundClosedError).
+
+# 기본 전공 / 이수 교과목 목록 (화면은 저장소의 목록 스냅숏 core.catalog.snapshot 을 사용)
+MAJORS = catalog.MAJORS
+COURSES = catalog.COURSES
+
+
+# 학생 등록 (비밀번호 해시는 전용 스레드 풀에서 계산, 바쁘면 PasswordBusyError)
+# 반환값: 등록 여부 (이미 있는 학번이면 False)
+@metrics.timed('applications.register')
+def register(store, student_id, name, password):
+    password_hash = passwords.hash_password_pooled(password)
+    try:
+        with store.transaction() as conn:
+            deadline.check_open(store, conn)
+            store.create_accounts(conn, [{'student_id': student_id, 'name': name, 'password_hash': password_hash}])
+    except storage.DuplicateStudentError:
+        return False
+    return True
+
+
+# 로그인 → 이름 (실패하면 None, 바쁘면 PasswordBusyError, 시도가 너무 잦으면 rate_limit.RateLimitedError)
+# 시도 제한은 저장소를 읽기 전에 확인하며 성공한 시도는 제한에 반영하지 않는다 (client 를 생략하면 현재 접속자)
+# 예전 형식 / 낮은 비용의 해시는 로그인 성공 시 현재 기본 형식으로 다시 저장
+@metrics.timed('applications.login')
+def login(store, student_id, password, client=None):
+    attempt = rate_limit.check_login(student_id, client)
+    account = store.get_account(student_id)
+    if account is None:
+        return None
+
+    name, stored_hash = account
+    ok, needs_rehash = passwords.verify_password_pooled(password, stored_hash)
+    if not ok:
+        return None
+    rate_limit.login_succeeded(attempt)
+    if needs_rehash:
+        store.replace_password_hash(student_id, stored_hash, passwords.hash_password_pooled(password))
+    return name
+
+
+# 신청 레코드 (등록되지 않은 학번이면 빈 레코드)
+@metrics.timed('applications.load')
+def load(store, student_id):
+    return store.load_record(student_id) or storage.empty_record(student_id)
+
+
+# 신청 정보 저장 (동기)
+@metrics.timed('applications.save')
+def save(store, student_id, gpa, courses, preferences, expected_version=None):
+    try:
+        with store.transaction() as conn:
+            deadline.check_open(store, conn)
+            return store.write_record(conn, student_id, gpa, courses, preferences, expected_version)
+    finally:
+        session_record.invalidate()
+
+
+# 제출할 신청서가 없는 경우 (등록되지 않은 학번 / 이미 최종 제출됨)
+class SubmitRejectedError(Exception):
+    pass
+
+
+# 최종 제출 (마지막 입력 내용 저장과 제출 표시를 한 트랜잭션으로)
+# 반환값: 제출 후 레코드 버전 (제출할 신청서가 없으면 SubmitRejectedError)
+@metrics.timed('applications.submit')
+def submit(store, student_id, gpa, courses, preferences, expected_version=None):
+    try:
+        with store.transaction() as conn:
+            deadline.check_open(store, conn)
+            version = store.write_record(conn, student_id, gpa, courses, preferences, expected_version)
+            if version is not None:
+                version = store.submit(conn, student_id, version)
+            if version is None:
+                raise SubmitRejectedError(student_id)
+            return version
+    finally:
+        session_record.invalidate()
+
+
+# 임시저장 (write-behind 큐에서 배치 트랜잭션 안에서 호출)
+def write_draft(store, conn, student_id, args, expected_version):
+    gpa, courses, preferences = args
+    deadline.check_open(store, conn)
+    return store.write_record(conn, student_id, gpa, courses, preferences, expected_version)
+
+
+# 저장소별 임시저장 큐
+def draft_queue(store):
+    return write_behind.get_queue(store.url, store, functools.partial(write_draft, store))
+
+
+# 제출 시간 문자열 (저장된 시각은 UTC 이므로 로컬 시각으로 변환)
+def format_submitted_at(submitted_at=None):
+    if submitted_at:
+        moment = datetime.strptime(submitted_at, '%Y-%m-%d %H:%M:%S')
+        moment = moment.replace(tzinfo=timezone.utc).astimezone()
+    else:
+        moment = datetime.now()
+    return moment.strftime('%Y년 %m월 %d일 %H시 %M분')
+
+
+# 템플릿별 신청서 렌더러 인자
+def pdf_args(template, student_id, name, gpa, courses, preferences, submitted_at=None):
+    if template == pdf_templates.CANVAS_TEMPLATE:
+        return (student_id, name, gpa, courses, preferences, format_submitted_at(submitted_at))
+    return (student_id, name, gpa, courses, [major or '' for major in preferences])
+
+
+# PDF 생성 (내용이 같으면 캐시된 결과를 재사용)
+@metrics.timed('applications.create_pdf')
+def create_pdf(template, args):
+    key = pdf_cache.cache_key(template, *args, fonts.korean_font())
+    data = pdf_cache.get_pdf_cache().get_or_build(key, lambda: pdf_templates.render(template, args))
+    return io.BytesIO(data)
+
+
+EXPORT_COLUMNS = ['학번', '이름', '1학기학점', '이수교과목',
+                  '1지망', '2지망', '3지망', '4지망', '5지망',
+                  '제출여부', '등록일시', '수정일시']
+
+
+# 관리자 데이터 내보내기 (다운로드 버튼을 누를 때만 생성)
+@metrics.timed('applications.export_records')
+def export_records(store, fmt):
+    return table_export.export_rows(
+        (
+            (r.student_id, r.name, r.gpa, ','.join(r.courses), *r.preferences,
+             '제출완료' if r.is_submitted else '미제출', r.created_at, r.updated_at)
+            for r in store.iter_records()
+        ),
+        EXPORT_COLUMNS,
+        fmt,
+        column_types=[str, str, float, str, str, str, str, str, str, str, str, str],
+        sheet_name='전공선택현황',
+    )
+
+
+# 제출된 신청서 PDF 일괄 생성 (ZIP 파일로 기록)
+@metrics.timed('applications.export_submitted_pdfs')
+def export_submitted_pdfs(store, template, path, progress=None):
+    total = store.count_records(submitted=True)
+    jobs = (
+        (f"전공선택신청서_{r.student_id}.pdf",
+         pdf_args(template, r.student_id, r.name, r.gpa, r.courses, r.preferences, r.updated_at))
+        for r in store.iter_records(submitted=True)
+    )
+    return bulk_export.export_pdf_zip(template, jobs, path, total, progress=progress)
@@ -0,0 +1,445 @@
+import argparse
+import csv
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import streamlit as st
+
+from core import metrics, normalized
+
+# 신청서 변경 이력 (추가 전용 이벤트 로그 + 주기적 스냅숏)
+# - 계정 생성 / 저장(임시저장 포함) / 최종 제출마다 그 시점의 신청서 전체 상태를
+#   record_events 에 한 행으로 추가한다 (같은 트랜잭션, 수정 / 삭제는 트리거가 막음).
+# - 한 학생의 특정 시점 상태는 그 시점 이전의 마지막 이벤트 한 행이다.
+# - 스냅숏은 (학생 → 마지막 이벤트 번호) 목록이다. 전체 학생의 특정 시점 상태는
+#   그 시점 이전의 마지막 스냅숏에 이후 이벤트만 덧대어 만든다 (처음부터 재생하지 않음).
+# - 스냅숏은 SNAPSHOT_EVERY_EVENTS 개의 이벤트가 쌓이거나, 새 이벤트가 있고
+#   SNAPSHOT_INTERVAL_SECONDS 가 지나면 백그라운드 스레드가 만든다.
+# 시각은 모두 UTC 문자열(밀리초까지, '%Y-%m-%d %H:%M:%S.fff')로 기록하고 비교한다.
+KINDS = {
+    'baseline': '이력 시작 시점 상태',
+    'register': '계정 생성',
+    'save': '저장',
+    'submit': '최종 제출',
+    'deadline_submit': '마감 자동 제출',
+    'deadline_flag': '마감 미완료 표시',
+}
+SNAPSHOT_EVERY_EVENTS = 2000
+SNAPSHOT_INTERVAL_SECONDS = 600
+CHECK_INTERVAL_SECONDS = 30
+
+PREFERENCE_COLUMNS = [f'major_preference_{rank}' for rank in range(1, normalized.PREFERENCE_RANKS + 1)]
+
+# record_events 의 상태 열 (event_id 제외, 읽기 / 쓰기 순서)
+EVENT_COLUMNS = ['kind', 'recorded_at', 'student_id', 'name', 'gpa', 'completed_courses',
+                 *PREFERENCE_COLUMNS, 'is_submitted', 'version']
+
+
+def columns(prefix=''):
+    return ', '.join(f'{prefix}{column}' for column in EVENT_COLUMNS)
+
+
+# 현재 UTC 시각 (이벤트 / 스냅숏 기록용)
+def now():
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+
+
+# 조회 시각 → UTC 문자열 (시간대가 없는 datetime / 문자열은 로컬 시각으로 본다)
+def to_utc(value):
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.strip())
+    if value.tzinfo is None:
+        value = value.astimezone()
+    return value.astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+
+
+# 기록된 UTC 문자열 → 로컬 시각 표시
+def to_local(recorded_at):
+    if not recorded_at:
+        return ''
+    moment = datetime.fromisoformat(str(recorded_at)).replace(tzinfo=timezone.utc).astimezone()
+    return moment.strftime('%Y-%m-%d %H:%M:%S')
+
+
+# 이벤트 한 행 (event_id, *EVENT_COLUMNS) → dict (record 는 storage.Record 모양의 dict)
+def event_row(row):
+    event_id, kind, recorded_at, student_id, name, gpa, courses, *rest = row
+    preferences, (is_submitted, version) = list(rest[:len(PREFERENCE_COLUMNS)]), rest[len(PREFERENCE_COLUMNS):]
+    return {
+        'event_id': event_id,
+        'kind': kind,
+        'recorded_at': str(recorded_at),
+        'student_id': student_id,
+        'name': name,
+        'gpa': gpa,
+        'courses': courses.split(',') if courses else [],
+        'preferences': [major or None for major in preferences],
+        'is_submitted': bool(is_submitted),
+        'version': version,
+    }
+
+
+# 저장소 Record → record_events 에 넣을 값 (EVENT_COLUMNS 순서)
+def event_values(kind, recorded_at, record):
+    return (kind, recorded_at, record.student_id, record.name, record.gpa,
+            ','.join(record.courses) or None, *record.preferences, bool(record.is_submitted), record.version)
+
+
+# SQLite 저장소용 스키마 마이그레이션 (기존 학생은 현재 상태를 baseline 이벤트로 기록)
+def sqlite_migration(view):
+    return [
+        f'''
+        CREATE TABLE IF NOT EXISTS record_events (
+            event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            recorded_at TEXT NOT NULL,
+            student_id TEXT NOT NULL,
+            name TEXT,
+            gpa REAL,
+            completed_courses TEXT,
+            {', '.join(f'{column} TEXT' for column in PREFERENCE_COLUMNS)},
+            is_submitted BOOLEAN NOT NULL,
+            version INTEGER
+        )
+        ''',
+        *_snapshot_tables('INTEGER PRIMARY KEY AUTOINCREMENT'),
+        'CREATE INDEX IF NOT EXISTS idx_record_events_student ON record_events (student_id, event_id)',
+        'CREATE INDEX IF NOT EXISTS idx_record_events_time ON record_events (recorded_at)',
+        '''
+        CREATE TRIGGER IF NOT EXISTS record_events_no_update BEFORE UPDATE ON record_events
+        BEGIN SELECT RAISE(ABORT, 'record_events 는 추가만 할 수 있습니다'); END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS record_events_no_delete BEFORE DELETE ON record_events
+        BEGIN SELECT RAISE(ABORT, 'record_events 는 추가만 할 수 있습니다'); END
+        ''',
+        f'''
+        INSERT INTO record_events ({columns()})
+        SELECT 'baseline', strftime('%Y-%m-%d %H:%M:%f', 'now'), student_id, name, semester1_gpa,
+               completed_courses, {', '.join(PREFERENCE_COLUMNS)}, is_submitted, version
+        FROM {view} ORDER BY student_id
+        ''',
+    ]
+
+
+# 스냅숏 테이블 (serial: 자동 증가 기본 키 열 정의, 데이터베이스마다 다름)
+def _snapshot_tables(serial):
+    return [
+        f'''
+        CREATE TABLE IF NOT EXISTS record_snapshots (
+            snapshot_id {serial},
+            taken_at TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            last_event_id INTEGER NOT NULL,
+            students INTEGER NOT NULL DEFAULT 0
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS record_snapshot_rows (
+            snapshot_id INTEGER NOT NULL REFERENCES record_snapshots (snapshot_id),
+            student_id TEXT NOT NULL,
+            event_id INTEGER NOT NULL,
+            PRIMARY KEY (snapshot_id, student_id)
+        )
+        ''',
+    ]
+
+
+# 서버 DB 용 이력 테이블 (추가 전용은 저장소 코드가 UPDATE / DELETE 를 쓰지 않는 것으로 보장)
+def server_tables(serial):
+    return [
+        f'''
+        CREATE TABLE IF NOT EXISTS record_events (
+            event_id {serial},
+            kind TEXT NOT NULL,
+            recorded_at TEXT NOT NULL,
+            student_id TEXT NOT NULL,
+            name TEXT,
+            gpa DOUBLE PRECISION,
+            completed_courses TEXT,
+            {', '.join(f'{column} TEXT' for column in PREFERENCE_COLUMNS)},
+            is_submitted BOOLEAN NOT NULL,
+            version INTEGER
+        )
+        ''',
+        *_snapshot_tables(serial),
+        'CREATE INDEX IF NOT EXISTS idx_record_events_student ON record_events (student_id, event_id)',
+        'CREATE INDEX IF NOT EXISTS idx_record_events_time ON record_events (recorded_at)',
+    ]
+
+
+# 스냅숏 / 이벤트 합치기용 SQL (자리표시자는 %s, SQLite 저장소는 qmark 로 바꿔 사용)
+# 전체 현황: 학생마다 (기준 스냅숏의 이벤트, 스냅숏 이후 기준 시각까지의 이벤트) 중 가장 최근 것
+COHORT_SQL = f'''
+    SELECT e.event_id, {columns('e.')} FROM record_events e JOIN (
+        SELECT student_id, MAX(event_id) AS event_id FROM (
+            SELECT student_id, event_id FROM record_snapshot_rows WHERE snapshot_id = %s
+            UNION ALL
+            SELECT student_id, event_id FROM record_events WHERE event_id > %s AND recorded_at <= %s
+        ) candidates GROUP BY student_id
+    ) latest ON latest.event_id = e.event_id
+    ORDER BY e.student_id
+'''
+
+SNAPSHOT_ROWS_SQL = '''
+    INSERT INTO record_snapshot_rows (snapshot_id, student_id, event_id)
+    SELECT %s, student_id, MAX(event_id) FROM (
+        SELECT student_id, event_id FROM record_snapshot_rows WHERE snapshot_id = %s
+        UNION ALL
+        SELECT student_id, event_id FROM record_events WHERE event_id > %s AND event_id <= %s
+    ) candidates GROUP BY student_id
+'''
+
+# 기준 시각 이전의 마지막 스냅숏 (없으면 0, 0 → 처음부터)
+BASE_SNAPSHOT_SQL = '''
+    SELECT snapshot_id, last_event_id FROM record_snapshots
+    WHERE taken_at <= %s ORDER BY snapshot_id DESC LIMIT 1
+'''
+
+
+def qmark(sql):
+    return sql.replace('%s', '?')
+
+
+# 아래 함수들은 SQL 저장소(SQLite / 서버) 공통 구현이다.
+# execute(conn, sql, params) 는 %s 자리표시자 SQL 을 실행하고 커서를 돌려준다.
+
+def record_history(execute, conn, student_id):
+    rows = execute(conn, f'''
+        SELECT event_id, {columns()} FROM record_events WHERE student_id = %s ORDER BY event_id
+    ''', (student_id,)).fetchall()
+    return [event_row(row) for row in rows]
+
+
+def record_at(execute, conn, student_id, at):
+    row = execute(conn, f'''
+        SELECT event_id, {columns()} FROM record_events
+        WHERE student_id = %s AND recorded_at <= %s ORDER BY event_id DESC LIMIT 1
+    ''', (student_id, at)).fetchone()
+    return event_row(row) if row else None
+
+
+def cohort_at(execute, conn, at):
+    base = execute(conn, BASE_SNAPSHOT_SQL, (at,)).fetchone() or (0, 0)
+    return [event_row(row) for row in execute(conn, COHORT_SQL, (base[0], base[1], at)).fetchall()]
+
+
+def audit_status(execute, conn):
+    last_event_id = execute(conn, 'SELECT MAX(event_id) FROM record_events').fetchone()[0] or 0
+    snapshots, snapshot_event_id = execute(
+        conn, 'SELECT COUNT(*), MAX(last_event_id) FROM record_snapshots'
+    ).fetchone()
+    return {
+        'last_event_id': last_event_id,
+        'snapshots': snapshots,
+        'events_since_snapshot': last_event_id - (snapshot_event_id or 0),
+    }
+
+
+# 마지막 스냅숏에 이후 이벤트를 덧대어 새 스냅숏 만들기 (쓰기 트랜잭션 안에서 호출)
+# lag_seconds: 이보다 최근 이벤트는 제외 (동시에 커밋 중인 트랜잭션이 있을 수 있는 서버 DB 용)
+def take_snapshot(execute, conn, lag_seconds=0):
+    previous_id, previous_event_id = execute(
+        conn, 'SELECT snapshot_id, last_event_id FROM record_snapshots ORDER BY snapshot_id DESC LIMIT 1'
+    ).fetchone() or (0, 0)
+    cutoff = to_utc(datetime.now(timezone.utc) - timedelta(seconds=lag_seconds))
+    last_event_id = execute(
+        conn, 'SELECT MAX(event_id) FROM record_events WHERE event_id > %s AND recorded_at <= %s',
+        (previous_event_id, cutoff)
+    ).fetchone()[0]
+    if not last_event_id:
+        return None
+
+    taken_at = execute(
+        conn, 'SELECT MAX(recorded_at) FROM record_events WHERE event_id > %s AND event_id <= %s',
+        (previous_event_id, last_event_id)
+    ).fetchone()[0]
+    snapshot_id = execute(conn, '''
+        INSERT INTO record_snapshots (taken_at, created_at, last_event_id) VALUES (%s, %s, %s)
+        RETURNING snapshot_id
+    ''', (taken_at, now(), last_event_id)).fetchone()[0]
+    execute(conn, SNAPSHOT_ROWS_SQL, (snapshot_id, previous_id, previous_event_id, last_event_id))
+    students = execute(
+        conn, 'SELECT COUNT(*) FROM record_snapshot_rows WHERE snapshot_id = %s', (snapshot_id,)
+    ).fetchone()[0]
+    execute(conn, 'UPDATE record_snapshots SET students = %s WHERE snapshot_id = %s', (students, snapshot_id))
+    return {'snapshot_id': snapshot_id, 'taken_at': taken_at, 'last_event_id': last_event_id, 'students': students}
+
+
+# 스냅숏을 만들 때가 되었는지 (저장소의 audit_status 와 마지막 스냅숏 이후 경과 시간)
+def snapshot_due(status, seconds_since_snapshot):
+    pending = status['events_since_snapshot']
+    return pending >= SNAPSHOT_EVERY_EVENTS or (pending > 0 and seconds_since_snapshot >= SNAPSHOT_INTERVAL_SECONDS)
+
+
+# 저장소별 스냅숏 스레드
+class Snapshotter:
+    def __init__(self, store, check_interval=CHECK_INTERVAL_SECONDS):
+        self.store = store
+        self.check_interval = check_interval
+        self.last_snapshot = None
+        self.last_error = None
+        self._taken_at = time.monotonic()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='audit-snapshot', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.check_interval):
+            try:
+                self.maybe_snapshot()
+            except Exception as e:
+                self.last_error = str(e)
+
+    # 때가 되었으면 스냅숏 생성 (생성했으면 스냅숏 정보, 아니면 None)
+    def maybe_snapshot(self, force=False):
+        status = self.store.audit_status()
+        if not force and not snapshot_due(status, time.monotonic() - self._taken_at):
+            return None
+        with metrics.timer('audit.snapshot'):
+            snapshot = self.store.take_snapshot()
+        self._taken_at = time.monotonic()
+        if snapshot:
+            self.last_snapshot = snapshot
+        return snapshot
+
+    def close(self):
+        self._stop.set()
+
+
+# 저장소 주소별 스냅숏 스레드 (프로세스 전체에서 하나)
+@st.cache_resource(show_spinner=False)
+def get_snapshotter(url, _store):
+    return Snapshotter(_store)
+
+
+HISTORY_COLUMNS = ['번호', '종류', '기록시각', '1학기학점', '이수교과목',
+                   '1지망', '2지망', '3지망', '4지망', '5지망', '제출여부', '버전']
+COHORT_COLUMNS = ['학번', '이름', '1학기학점', '이수교과목',
+                  '1지망', '2지망', '3지망', '4지망', '5지망', '제출여부', '마지막변경', '버전']
+
+
+def history_rows(events):
+    return [
+        [e['event_id'], KINDS.get(e['kind'], e['kind']), to_local(e['recorded_at']), e['gpa'],
+         ','.join(e['courses']), *e['preferences'], '제출완료' if e['is_submitted'] else '미제출', e['version']]
+        for e in events
+    ]
+
+
+def cohort_rows(events):
+    return (
+        (e['student_id'], e['name'], e['gpa'], ','.join(e['courses']), *e['preferences'],
+         '제출완료' if e['is_submitted'] else '미제출', to_local(e['recorded_at']), e['version'])
+        for e in events
+    )
+
+
+def _moment(key, label):
+    col1, col2 = st.columns(2)
+    with col1:
+        day = st.date_input(f"{label} 날짜", key=f'{key}_date')
+    with col2:
+        moment = st.time_input(f"{label} 시각", key=f'{key}_time', step=60)
+    return to_utc(datetime.combine(day, moment) + timedelta(seconds=59, microseconds=999000))
+
+
+# 관리자 변경 이력 화면
+def render_history(store, key='audit'):
+    from core import table_export
+
+    snapshotter = get_snapshotter(store.url, store)
+    status = store.audit_status()
+    st.caption(f"이벤트 {status['last_event_id']}건 · 스냅숏 {status['snapshots']}개 · "
+               f"마지막 스냅숏 이후 {status['events_since_snapshot']}건")
+
+    st.markdown("**학생별 이력 / 특정 시점 상태**")
+    student_id = st.text_input("학번", key=f'{key}_student')
+    at = _moment(f'{key}_student', "조회 시점")
+    if student_id:
+        with metrics.timer('audit.record_at'):
+            state = store.record_at(student_id, at)
+        if state:
+            st.write(f"{to_local(state['recorded_at'])} 기록 기준 ({KINDS.get(state['kind'], state['kind'])})")
+            st.dataframe([dict(zip(HISTORY_COLUMNS, row)) for row in history_rows([state])],
+                         hide_index=True, use_container_width=True)
+        else:
+            st.info("그 시점에는 기록이 없습니다.")
+        events = store.record_history(student_id)
+        if events:
+            st.dataframe([dict(zip(HISTORY_COLUMNS, row)) for row in history_rows(events)],
+                         hide_index=True, use_container_width=True)
+
+    st.markdown("**특정 시점의 전체 신청 현황**")
+    cohort_at = _moment(f'{key}_cohort', "기준")
+    export_format = st.radio("형식", list(table_export.FORMATS), horizontal=True, key=f'{key}_format')
+    extension, mime = table_export.FORMATS[export_format]
+    st.download_button(
+        label=f"📥 시점 현황 {export_format} 다운로드",
+        data=lambda: table_export.export_rows(
+            cohort_rows(store.cohort_at(cohort_at)), COHORT_COLUMNS, export_format,
+            column_types=[str, str, float, str, str, str, str, str, str, str, str, int],
+            sheet_name='시점현황',
+        ),
+        file_name=f"시점현황_{to_local(cohort_at).replace(' ', '_').replace(':', '')}.{extension}",
+        mime=mime,
+        key=f'{key}_download',
+    )
+
+    if st.button("지금 스냅숏 만들기", key=f'{key}_snapshot'):
+        snapshot = snapshotter.maybe_snapshot(force=True)
+        if snapshot:
+            st.success(f"스냅숏 {snapshot['snapshot_id']} 생성 (학생 {snapshot['students']}명)")
+        else:
+            st.info("새 이벤트가 없어 스냅숏을 만들지 않았습니다.")
+
+
+# 명령행 조회
+#   python -m core.audit history 2024001
+#   python -m core.audit at 2024001 "2026-03-02 18:00"
+#   python -m core.audit cohort "2026-03-02 18:00" --output 마감시점.csv
+#   python -m core.audit snapshot
+# 시각은 로컬 시각이다.
+def main(argv=None):
+    from core import storage
+
+    parser = argparse.ArgumentParser(description='신청서 변경 이력 조회')
+    parser.add_argument('--db', default=storage.store_url(), help='저장소 주소 (기본: 환경변수 STUDENT_DB_URL)')
+    commands = parser.add_subparsers(dest='command', required=True)
+    history = commands.add_parser('history', help='학생의 전체 이력')
+    history.add_argument('student_id')
+    at = commands.add_parser('at', help='학생의 특정 시점 상태')
+    at.add_argument('student_id')
+    at.add_argument('moment')
+    cohort = commands.add_parser('cohort', help='특정 시점의 전체 현황 (CSV)')
+    cohort.add_argument('moment')
+    cohort.add_argument('--output', help='CSV 경로 (기본: 표준 출력 요약만)')
+    commands.add_parser('snapshot', help='지금 스냅숏 만들기')
+    args = parser.parse_args(argv)
+
+    store = storage.get_store(args.db)
+    if args.command == 'history':
+        for row in history_rows(store.record_history(args.student_id)):
+            print(*row, sep='\t')
+    elif args.command == 'at':
+        state = store.record_at(args.student_id, to_utc(args.moment))
+        print(*(history_rows([state])[0] if state else ['기록 없음']), sep='\t')
+    elif args.command == 'cohort':
+        started = time.perf_counter()
+        events = store.cohort_at(to_utc(args.moment))
+        elapsed = time.perf_counter() - started
+        print(f"{len(events)}명, 제출 {sum(e['is_submitted'] for e in events)}명 ({elapsed * 1000:.1f} ms)")
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8-sig', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(COHORT_COLUMNS)
+                writer.writerows(cohort_rows(events))
+    else:
+        snapshot = store.take_snapshot()
+        print(f"스냅숏 {snapshot['snapshot_id']}: 학생 {snapshot['students']}명, 이벤트 {snapshot['last_event_id']}번까지"
+              if snapshot else '새 이벤트가 없습니다.')
+
+
+if __name__ == '__main__':
+    main()
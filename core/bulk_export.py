@@ -0,0 +1,81 @@
+import multiprocessing
+import os
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from core import fonts, metrics, pdf_cache, pdf_templates
+
+# 작업 프로세스당 동시에 처리 중인 PDF 수 (메모리 상한)
+IN_FLIGHT_PER_WORKER = 4
+
+# 진행률 콜백 최소 간격 (초)
+PROGRESS_INTERVAL = 0.2
+
+
+# 작업 프로세스 초기화: 폰트를 미리 파싱해 둠
+def _init_worker():
+    fonts.korean_font()
+
+
+def _render_job(template, args):
+    return pdf_templates.render(template, args)
+
+
+# 신청서 PDF 를 프로세스 풀에서 생성해 ZIP 으로 바로 기록
+# jobs 는 (ZIP 안의 파일명, 템플릿 렌더러 인자) 를 차례로 내놓는 반복자이다.
+# 완료된 PDF 는 순서대로 ZIP 에 쓰고 즉시 버리므로, 메모리에는
+# 작업 프로세스 수 × IN_FLIGHT_PER_WORKER 개 이하만 머문다.
+# 이미 PDF 캐시에 있는 신청서는 다시 렌더링하지 않는다.
+@metrics.timed('bulk_export.export_pdf_zip')
+def export_pdf_zip(template, jobs, out, total=None, workers=None, progress=None):
+    cache = pdf_cache.get_pdf_cache()
+    font = fonts.korean_font()
+    workers = workers or os.cpu_count() or 1
+    limit = workers * IN_FLIGHT_PER_WORKER
+
+    pool = None
+    pending = deque()
+    done = 0
+    last_report = 0.0
+
+    def report(force=False):
+        nonlocal last_report
+        now = time.monotonic()
+        if progress and (force or now - last_report >= PROGRESS_INTERVAL):
+            last_report = now
+            progress(done, total)
+
+    try:
+        with zipfile.ZipFile(out, 'w', zipfile.ZIP_STORED) as archive:
+            def drain(max_pending):
+                nonlocal done
+                while len(pending) > max_pending:
+                    filename, item = pending.popleft()
+                    data = item if isinstance(item, bytes) else item.result()
+                    archive.writestr(filename, data)
+                    done += 1
+                    report()
+
+            for filename, args in jobs:
+                data = cache.get(pdf_cache.cache_key(template, *args, font))
+                if data is None:
+                    if pool is None:
+                        # Streamlit 서버는 멀티스레드이므로 fork 대신 spawn 사용
+                        pool = ProcessPoolExecutor(
+                            max_workers=workers,
+                            mp_context=multiprocessing.get_context('spawn'),
+                            initializer=_init_worker,
+                        )
+                    data = pool.submit(_render_job, template, args)
+                pending.append((filename, data))
+                drain(limit)
+
+            drain(0)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    report(force=True)
+    return done
@@ -0,0 +1,202 @@
+import threading
+import time
+from collections import namedtuple
+
+import streamlit as st
+
+from core import metrics
+
+# 전공 / 이수 교과목 / 안내 문구 목록 (데이터베이스의 catalog_items, 관리자가 수정)
+# - 화면은 프로세스 메모리의 스냅숏(Catalog)만 읽는다. 목록 문자열과 안내 마크다운은
+#   스냅숏을 만들 때 한 번 만들어 두므로 다시 실행될 때마다 목록을 새로 만들지 않는다.
+# - 수정할 때마다 catalog_version 이 1 증가하며, 스냅숏은 CHECK_INTERVAL_SECONDS 마다
+#   버전 한 줄만 읽어 바뀐 경우에만 다시 불러온다 (같은 프로세스의 수정은 즉시 반영).
+KINDS = ('major', 'course', 'feature')
+CHECK_INTERVAL_SECONDS = 5.0
+MAX_LABEL_LENGTH = 100
+
+# 처음 스키마를 만들 때 넣는 기본 목록
+MAJORS = ["인공지능", "컴퓨터과학", "데이터사이언스", "신소재물리", "지능형전자시스템"]
+COURSES = ["대학기초수학", "이산수학", "기초물리1", "파이썬프로그래밍", "공학개론"]
+FEATURES = [
+    "🔐 학번과 비밀번호로 안전한 로그인",
+    "📊 1학기 학점과 이수교과목 입력",
+    "🎯 1지망부터 5지망까지 전공 순위 선택",
+    "💾 임시저장으로 언제든 수정 가능",
+    "📋 최종제출 후 신청서 PDF 다운로드",
+]
+DEFAULTS = {'major': MAJORS, 'course': COURSES, 'feature': FEATURES}
+
+# 목록 스냅숏 (여러 세션이 함께 읽으므로 튜플 / 문자열만 담는다)
+# markdown: 종류별 안내 문구 (한 번의 st.markdown 으로 표시)
+Catalog = namedtuple('Catalog', ['version', 'majors', 'courses', 'features', 'markdown'])
+
+
+# 다른 관리자가 먼저 목록을 바꾼 경우
+class StaleCatalogError(Exception):
+    pass
+
+
+def _quote(text):
+    return "'" + text.replace("'", "''") + "'"
+
+
+# 목록 테이블 / 버전 / 기본 목록 (스키마 마이그레이션용 SQL 목록, SQLite 와 서버 DB 공통)
+def catalog_migration():
+    seed = ', '.join(
+        f'({_quote(kind)}, {position}, {_quote(label)})'
+        for kind in KINDS for position, label in enumerate(DEFAULTS[kind], start=1)
+    )
+    return [
+        '''
+        CREATE TABLE IF NOT EXISTS catalog_items (
+            kind TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            label TEXT NOT NULL,
+            PRIMARY KEY (kind, position)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS catalog_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+        ''',
+        'INSERT INTO catalog_version (id, version) VALUES (1, 1)',
+        f'INSERT INTO catalog_items (kind, position, label) VALUES {seed}',
+    ]
+
+
+# catalog_items 행 (kind, label) 을 종류별 목록으로 (position 순으로 읽은 행)
+def group_items(rows):
+    items = {kind: [] for kind in KINDS}
+    for kind, label in rows:
+        items.setdefault(kind, []).append(label)
+    return items
+
+
+# 저장소에서 읽은 (버전, {종류: [항목]}) 으로 스냅숏 만들기
+def build(version, items):
+    majors = tuple(items.get('major', ()))
+    courses = tuple(items.get('course', ()))
+    features = tuple(items.get('feature', ()))
+    return Catalog(
+        version,
+        majors,
+        courses,
+        features,
+        {
+            'major': '  \n'.join(f'• {major}' for major in majors),
+            'course': '  \n'.join(f'• {course}' for course in courses),
+            'feature': '  \n'.join(features),
+        },
+    )
+
+
+# 관리자 입력(한 줄에 하나) 정리 / 검사 → ({종류: [항목]}, 오류 목록)
+def parse_items(texts):
+    items, errors = {}, []
+    names = {'major': '전공', 'course': '이수 교과목', 'feature': '안내 문구'}
+    for kind in KINDS:
+        labels = [line.strip() for line in (texts.get(kind) or '').splitlines() if line.strip()]
+        duplicates = sorted({label for label in labels if labels.count(label) > 1})
+        if kind != 'feature' and not labels:
+            errors.append(f'{names[kind]} 목록이 비어 있습니다.')
+        if duplicates:
+            errors.append(f"{names[kind]} 목록에 중복 항목이 있습니다: {', '.join(duplicates)}")
+        if any(len(label) > MAX_LABEL_LENGTH for label in labels):
+            errors.append(f'{names[kind]} 항목은 {MAX_LABEL_LENGTH}자 이하로 입력해주세요.')
+        items[kind] = labels
+    return items, errors
+
+
+# 저장소별 목록 캐시 (읽기 모델)
+class CatalogCache:
+    def __init__(self, store, check_interval=CHECK_INTERVAL_SECONDS):
+        self.store = store
+        self.check_interval = check_interval
+        self.reloads = 0
+        self._snapshot = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    # 현재 스냅숏 (버전 확인 주기가 지났을 때만 저장소를 읽음)
+    def snapshot(self):
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is not None and time.monotonic() - self._checked_at < self.check_interval:
+                return self._snapshot
+            if self._snapshot is None or self.store.catalog_version() != self._snapshot.version:
+                self._reload()
+            self._checked_at = time.monotonic()
+            return self._snapshot
+
+    @metrics.timed('catalog.reload')
+    def _reload(self):
+        version, items = self.store.load_catalog()
+        self._snapshot = build(version, items)
+        self.reloads += 1
+
+    # 다음 snapshot() 에서 버전을 바로 확인
+    def invalidate(self):
+        self._checked_at = 0.0
+
+    # 목록 저장 (expected_version 이 현재 버전과 다르면 StaleCatalogError)
+    def update(self, items, expected_version=None):
+        with self.store.transaction() as conn:
+            version = self.store.write_catalog(conn, items, expected_version)
+        self.invalidate()
+        return version
+
+    def info(self):
+        snapshot = self._snapshot
+        return {
+            'version': snapshot.version if snapshot else None,
+            'majors': len(snapshot.majors) if snapshot else None,
+            'courses': len(snapshot.courses) if snapshot else None,
+            'reloads': self.reloads,
+            'check_interval': self.check_interval,
+        }
+
+
+# 저장소 주소별 목록 캐시 (프로세스 전체에서 공유)
+@st.cache_resource(show_spinner=False)
+def get_catalog_cache(url, _store):
+    return CatalogCache(_store)
+
+
+# 화면에서 쓰는 현재 목록 스냅숏
+def snapshot(store):
+    return get_catalog_cache(store.url, store).snapshot()
+
+
+# 관리자 목록 편집 (한 줄에 하나씩)
+def render_editor(store, key='catalog_editor'):
+    cache = get_catalog_cache(store.url, store)
+    current = cache.snapshot()
+    st.caption(f"목록 버전 {current.version} · 저장하면 모든 화면에 {int(cache.check_interval)}초 안에 반영됩니다. "
+               "목록에서 뺀 전공 / 교과목도 이미 저장된 신청서에는 그대로 남습니다.")
+    with st.form(key):
+        col1, col2 = st.columns(2)
+        with col1:
+            majors = st.text_area("전공 (한 줄에 하나)", '\n'.join(current.majors), key=f'{key}_major')
+        with col2:
+            courses = st.text_area("이수 교과목 (한 줄에 하나)", '\n'.join(current.courses), key=f'{key}_course')
+        features = st.text_area("시스템 안내 - 주요 기능 (한 줄에 하나)", '\n'.join(current.features),
+                                key=f'{key}_feature')
+        if st.form_submit_button("목록 저장"):
+            items, errors = parse_items({'major': majors, 'course': courses, 'feature': features})
+            if errors:
+                for error in errors:
+                    st.error(error)
+            else:
+                try:
+                    version = cache.update(items, current.version)
+                except StaleCatalogError:
+                    st.error("다른 관리자가 먼저 목록을 변경했습니다. 새로 고친 뒤 다시 수정해주세요.")
+                else:
+                    st.success(f"목록을 저장했습니다. (버전 {version})")
+                    st.rerun()
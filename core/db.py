@@ -0,0 +1,137 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import streamlit as st
+
+from core import metrics
+
+# 연결 풀 설정
+POOL_SIZE = 8
+BUSY_TIMEOUT_MS = 5000
+STATEMENT_CACHE_SIZE = 256
+
+
+# SQLite 연결 풀 (스레드 안전)
+# - WAL 저널링으로 읽기와 쓰기가 서로 막지 않음
+# - busy_timeout 으로 잠금 충돌 시 즉시 실패하지 않고 대기
+# - 연결을 재사용하므로 sqlite3 의 prepared statement 캐시가 유지됨
+class ConnectionPool:
+    def __init__(self, path, size=POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _open(self):
+        conn = sqlite3.connect(
+            self.path,
+            timeout=BUSY_TIMEOUT_MS / 1000,
+            isolation_level=None,  # 트랜잭션은 transaction() 에서 직접 관리
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(f'PRAGMA busy_timeout={BUSY_TIMEOUT_MS}')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def acquire(self, timeout=None):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                try:
+                    return self._open()
+                except Exception:
+                    self._created -= 1
+                    raise
+
+        # 풀이 가득 찬 경우 반납될 때까지 대기
+        with metrics.timer('db.pool_wait'):
+            return self._idle.get(timeout=timeout)
+
+    def release(self, conn, broken=False):
+        if not broken and conn.in_transaction:
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                broken = True
+
+        if broken:
+            conn.close()
+            with self._lock:
+                self._created -= 1
+            return
+
+        self._idle.put_nowait(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        broken = False
+        try:
+            yield conn
+        except (sqlite3.OperationalError, sqlite3.DatabaseError) as e:
+            if 'locked' in str(e):
+                metrics.count('db.locked')
+            broken = not _is_usable(conn)
+            raise
+        finally:
+            self.release(conn, broken)
+
+    @contextmanager
+    def transaction(self):
+        with self.connection() as conn:
+            # 쓰기 잠금을 먼저 잡아 WAL 에서의 잠금 승격 충돌을 피함
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+
+    def close(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+
+def _is_usable(conn):
+    try:
+        conn.execute('SELECT 1')
+        return True
+    except sqlite3.Error:
+        return False
+
+
+# 데이터베이스 파일별 연결 풀 (프로세스 전체에서 공유)
+@st.cache_resource(show_spinner=False)
+def get_pool(path):
+    return ConnectionPool(path)
+
+
+# 읽기용 연결
+@contextmanager
+def connect(path):
+    with metrics.timer('db.connect'), get_pool(path).connection() as conn:
+        yield conn
+
+
+# 쓰기용 트랜잭션 (정상 종료 시 커밋, 예외 시 롤백)
+@contextmanager
+def transaction(path):
+    with metrics.timer('db.transaction'), get_pool(path).transaction() as conn:
+        yield conn
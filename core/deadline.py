@@ -0,0 +1,382 @@
+import argparse
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, time as clock
+
+import streamlit as st
+
+from core import audit, metrics, session_record
+
+# 신청 마감 (마감 시각 이후 쓰기 차단 + 마감 처리 일괄 실행)
+# - submission_round 한 행에 마감 시각(UTC 문자열), 처리 방식, 마감 처리 결과를 기록한다.
+# - 학생의 회원가입 / 저장 / 제출은 쓰기 트랜잭션 안에서 이 행을 읽어 마감 여부를 확인한다
+#   (서버 DB 는 FOR SHARE 로 읽어 진행 중인 마감 처리 트랜잭션이 끝날 때까지 기다린다).
+# - 마감 처리(freeze)는 한 트랜잭션에서 집합 단위 SQL 로
+#     1. 마감 처리 시각 기록 (이미 마감 처리되었으면 아무것도 하지 않음)
+#     2. 미제출 신청서 중 작성 완료(학점 + 지망 1개 이상)된 것은 자동 제출 (policy='finalize')
+#     3. 나머지 미제출 신청서는 미완료로 표시
+#     4. 변경 이력 이벤트 추가, 마감 시점 스냅숏 생성
+#     5. 배정 입력(학생 / 지망 / 이수 교과목)을 frozen_* 테이블로 복사
+#   를 실행한다. 마감 후 관리자 표 / 배정 / 시뮬레이션은 frozen_* 테이블만 읽는다.
+# - 마감 시각이 지나면 저장소마다 백그라운드 스레드(DeadlineJob) 하나가 마감 처리를 실행한다.
+POLICIES = {
+    'finalize': '작성 완료된 신청서는 자동 제출, 나머지는 미완료 표시',
+    'flag': '미제출 신청서를 모두 미완료로 표시',
+}
+STATUSES = {
+    'auto_submitted': '마감 자동 제출',
+    'incomplete': '미완료 (마감)',
+}
+CHECK_INTERVAL_SECONDS = 15
+
+# 마감 후 관리자 표 / 배정 / 시뮬레이션 입력 (학생, 지망, 이수 교과목 고정 테이블)
+FROZEN_TABLES = ('frozen_students', 'frozen_preferences', 'frozen_courses')
+FROZEN_CHILDREN = FROZEN_TABLES[1:]
+# SQLite 저장소의 마감 시점 호환 뷰 (students_view 와 같은 모양)
+FROZEN_VIEW = 'frozen_view'
+
+# 마감 설정 / 결과 (deadline, frozen_at 은 UTC 문자열 또는 None)
+Round = namedtuple('Round', ['deadline', 'policy', 'frozen_at', 'snapshot_id', 'finalized', 'flagged'])
+
+OPEN_ROUND = Round(None, 'finalize', None, None, 0, 0)
+
+
+# 마감 후 쓰기 / 마감 처리 후 설정 변경
+class RoundClosedError(Exception):
+    pass
+
+
+# 마감 설정 / 고정 테이블 (스키마 마이그레이션용 SQL 목록, SQLite 와 서버 DB 공통)
+def round_migration():
+    return [
+        '''
+        CREATE TABLE IF NOT EXISTS submission_round (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            deadline TEXT,
+            policy TEXT NOT NULL DEFAULT 'finalize',
+            frozen_at TEXT,
+            snapshot_id INTEGER,
+            finalized INTEGER NOT NULL DEFAULT 0,
+            flagged INTEGER NOT NULL DEFAULT 0
+        )
+        ''',
+        "INSERT INTO submission_round (id, policy) VALUES (1, 'finalize')",
+        'ALTER TABLE students ADD COLUMN deadline_status TEXT',
+        '''
+        CREATE TABLE IF NOT EXISTS frozen_students (
+            student_id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            semester1_gpa DOUBLE PRECISION,
+            is_submitted BOOLEAN NOT NULL,
+            deadline_status TEXT,
+            created_at TIMESTAMP,
+            updated_at TIMESTAMP,
+            version INTEGER
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS frozen_preferences (
+            student_id TEXT NOT NULL,
+            rank INTEGER NOT NULL,
+            major TEXT NOT NULL,
+            PRIMARY KEY (student_id, rank)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS frozen_courses (
+            student_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            course TEXT NOT NULL,
+            PRIMARY KEY (student_id, course)
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_frozen_preferences_major ON frozen_preferences (major, rank, student_id)',
+        'CREATE INDEX IF NOT EXISTS idx_frozen_courses_course ON frozen_courses (course, student_id)',
+    ]
+
+
+# 마감 처리 SQL (자리표시자는 %s, 작성 완료 기준은 배정에 필요한 학점과 지망)
+FINALIZE_SQL = '''
+    UPDATE students SET
+        is_submitted = TRUE,
+        deadline_status = 'auto_submitted',
+        updated_at = CURRENT_TIMESTAMP,
+        version = version + 1
+    WHERE NOT is_submitted AND semester1_gpa > 0
+      AND EXISTS (SELECT 1 FROM student_preferences p WHERE p.student_id = students.student_id)
+    RETURNING student_id
+'''
+
+FLAG_SQL = '''
+    UPDATE students SET
+        deadline_status = 'incomplete',
+        version = version + 1
+    WHERE NOT is_submitted
+    RETURNING student_id
+'''
+
+FREEZE_COPY_SQL = [
+    'DELETE FROM frozen_courses',
+    'DELETE FROM frozen_preferences',
+    'DELETE FROM frozen_students',
+    '''
+    INSERT INTO frozen_students (student_id, name, semester1_gpa, is_submitted, deadline_status,
+                                 created_at, updated_at, version)
+    SELECT student_id, name, semester1_gpa, is_submitted, deadline_status, created_at, updated_at, version
+    FROM students
+    ''',
+    'INSERT INTO frozen_preferences (student_id, rank, major) SELECT student_id, rank, major FROM student_preferences',
+    'INSERT INTO frozen_courses (student_id, position, course) SELECT student_id, position, course FROM student_courses',
+]
+
+ROUND_SQL = 'SELECT deadline, policy, frozen_at, snapshot_id, finalized, flagged FROM submission_round WHERE id = 1'
+
+
+# 마감 전인지 (at: UTC 문자열, 기본은 현재 시각)
+def is_open(round_, at=None):
+    if round_.frozen_at:
+        return False
+    return round_.deadline is None or (at or audit.now()) < round_.deadline
+
+
+# 마감 시각이 지났지만 아직 마감 처리하지 않았는지
+def due(round_, at=None):
+    return round_.deadline is not None and not round_.frozen_at and (at or audit.now()) >= round_.deadline
+
+
+def ensure_open(round_):
+    if not is_open(round_):
+        raise RoundClosedError('신청이 마감되었습니다.')
+
+
+# 학생 쓰기 전 마감 확인 (호출한 쓰기 트랜잭션 안에서)
+def check_open(store, conn):
+    ensure_open(store.lock_round(conn))
+
+
+# 처리 방식 확인 (None 은 현재 설정 유지)
+def check_policy(policy):
+    if policy is not None and policy not in POLICIES:
+        raise ValueError(f'알 수 없는 마감 처리 방식입니다: {policy}')
+    return policy
+
+
+# 아래 함수들은 SQL 저장소(SQLite / 서버) 공통 구현이다.
+# execute(conn, sql, params) 는 %s 자리표시자 SQL 을 실행하고 커서를 돌려준다.
+
+def read_round(execute, conn, lock=''):
+    return Round(*execute(conn, ROUND_SQL + lock).fetchone())
+
+
+def set_deadline(execute, conn, deadline, policy):
+    row = execute(conn, '''
+        UPDATE submission_round SET deadline = %s, policy = %s
+        WHERE id = 1 AND frozen_at IS NULL
+        RETURNING id
+    ''', (deadline, check_policy(policy))).fetchone()
+    if row is None:
+        raise RoundClosedError('이미 마감 처리되었습니다.')
+
+
+# 마감 처리 (쓰기 트랜잭션 안에서 호출, 이미 마감 처리되었으면 None)
+# append_events(conn, student_ids, kind, recorded_at): 저장소의 변경 이력 추가 함수
+# 마감 처리 이벤트는 마감 처리 시각으로 기록하므로 cohort_at(frozen_at) 이 마감 시점 전체 현황이다.
+def freeze(execute, conn, append_events, policy=None):
+    frozen_at = audit.now()
+    row = execute(conn, '''
+        UPDATE submission_round SET frozen_at = %s, policy = COALESCE(CAST(%s AS TEXT), policy)
+        WHERE id = 1 AND frozen_at IS NULL
+        RETURNING policy
+    ''', (frozen_at, check_policy(policy))).fetchone()
+    if row is None:
+        return None
+
+    policy = row[0]
+    finalized = [r[0] for r in execute(conn, FINALIZE_SQL).fetchall()] if policy == 'finalize' else []
+    flagged = [r[0] for r in execute(conn, FLAG_SQL).fetchall()]
+    append_events(conn, finalized, 'deadline_submit', frozen_at)
+    append_events(conn, flagged, 'deadline_flag', frozen_at)
+
+    # 쓰기는 모두 마감 확인에서 막히므로 지연 없이 지금까지의 이벤트로 스냅숏
+    snapshot = audit.take_snapshot(execute, conn)
+    snapshot_id = snapshot['snapshot_id'] if snapshot else \
+        execute(conn, 'SELECT MAX(snapshot_id) FROM record_snapshots').fetchone()[0]
+    for statement in FREEZE_COPY_SQL:
+        execute(conn, statement)
+    execute(conn, 'UPDATE submission_round SET snapshot_id = %s, finalized = %s, flagged = %s WHERE id = 1',
+            (snapshot_id, len(finalized), len(flagged)))
+    return {'frozen_at': frozen_at, 'policy': policy, 'finalized': len(finalized),
+            'flagged': len(flagged), 'snapshot_id': snapshot_id}
+
+
+# 저장소별 마감 스레드 (마감 시각이 지나면 마감 처리, 화면용 마감 설정 캐시)
+class DeadlineJob:
+    def __init__(self, store, check_interval=CHECK_INTERVAL_SECONDS):
+        self.store = store
+        self.check_interval = check_interval
+        self.last_result = None
+        self.last_error = None
+        self._round = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='deadline', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.check_interval):
+            try:
+                self.tick()
+            except Exception as e:
+                self.last_error = str(e)
+
+    # 마감 시각이 지났으면 마감 처리 (처리했으면 결과, 아니면 None)
+    def tick(self):
+        if due(self.refresh()):
+            return self.freeze()
+        return None
+
+    # 지금 마감 처리 (여러 프로세스가 동시에 실행해도 한 번만 처리됨)
+    def freeze(self, policy=None):
+        with self._lock:
+            with metrics.timer('deadline.freeze'), self.store.transaction() as conn:
+                result = self.store.freeze_round(conn, policy)
+            if result:
+                self.last_result = result
+            self.refresh()
+            return result
+
+    def refresh(self):
+        self._round = self.store.round_state()
+        self._checked_at = time.monotonic()
+        return self._round
+
+    # 화면용 마감 설정 (확인 주기가 지났을 때만 저장소를 읽음)
+    def state(self):
+        if self._round is None or time.monotonic() - self._checked_at >= self.check_interval:
+            return self.refresh()
+        return self._round
+
+    def close(self):
+        self._stop.set()
+
+
+# 저장소 주소별 마감 스레드 (프로세스 전체에서 하나)
+@st.cache_resource(show_spinner=False)
+def get_deadline_job(url, _store):
+    return DeadlineJob(_store)
+
+
+# 마감 처리 후 처음 실행될 때 세션의 신청 레코드 캐시를 비워 자동 제출 / 미완료 상태를 다시 읽음
+def sync_session(round_):
+    if round_.frozen_at and st.session_state.get('_round_frozen_at') != round_.frozen_at:
+        st.session_state['_round_frozen_at'] = round_.frozen_at
+        session_record.invalidate()
+
+
+# 학생 화면 안내 (마감 전: 마감 시각, 마감 후: 수정 / 제출 불가)
+def render_notice(round_, is_submitted):
+    if is_open(round_):
+        if round_.deadline:
+            st.caption(f"⏰ 신청 마감: {audit.to_local(round_.deadline)}")
+    elif not is_submitted:
+        st.warning("신청이 마감되었습니다. 제출되지 않은 신청서는 더 이상 저장 / 제출할 수 없습니다.")
+
+
+# 관리자 마감 설정 / 마감 처리
+def render_admin(store, round_, key='deadline'):
+    job = get_deadline_job(store.url, store)
+    if round_.frozen_at:
+        st.success(f"{audit.to_local(round_.frozen_at)} 마감 처리 완료 · 자동 제출 {round_.finalized}명 · "
+                   f"미완료 표시 {round_.flagged}명 · 변경 이력 스냅숏 {round_.snapshot_id}")
+        st.caption("학생 표 / 전공 배정 / 정원 시뮬레이션은 마감 시점에 고정된 데이터를 사용합니다.")
+        return
+
+    if round_.deadline:
+        state = "지났습니다. 곧 마감 처리됩니다." if due(round_) else "까지 신청을 받습니다."
+        st.caption(f"{audit.to_local(round_.deadline)} {state} ({POLICIES[round_.policy]})")
+    else:
+        st.caption("마감 시각이 설정되지 않았습니다.")
+
+    current = datetime.fromisoformat(audit.to_local(round_.deadline)) if round_.deadline else None
+    with st.form(key):
+        col1, col2 = st.columns(2)
+        with col1:
+            day = st.date_input("마감 날짜", current.date() if current else None, key=f'{key}_date')
+        with col2:
+            moment = st.time_input("마감 시각", current.time() if current else clock(18, 0),
+                                   key=f'{key}_time', step=60)
+        policy = st.radio("마감 처리 방식", list(POLICIES), format_func=POLICIES.get,
+                          index=list(POLICIES).index(round_.policy), key=f'{key}_policy')
+        col1, col2 = st.columns(2)
+        with col1:
+            saved = st.form_submit_button("마감 설정 저장")
+        with col2:
+            cleared = st.form_submit_button("마감 시각 해제")
+    if saved or cleared:
+        if saved and day is None:
+            st.error("마감 날짜를 입력해주세요.")
+        else:
+            try:
+                with store.transaction() as conn:
+                    store.set_deadline(conn, None if cleared else audit.to_utc(datetime.combine(day, moment)), policy)
+            except RoundClosedError:
+                st.error("이미 마감 처리되었습니다.")
+            else:
+                job.refresh()
+                st.success("마감 설정을 저장했습니다.")
+                st.rerun()
+
+    confirmed = st.checkbox("지금 바로 마감 처리합니다 (되돌릴 수 없음)", key=f'{key}_confirm')
+    if st.button("⏰ 지금 마감 처리", disabled=not confirmed, key=f'{key}_freeze'):
+        result = job.freeze(policy)
+        if result:
+            st.success(f"마감 처리 완료: 자동 제출 {result['finalized']}명, 미완료 표시 {result['flagged']}명")
+        st.rerun()
+
+
+# 명령행 마감 설정 / 처리
+#   python -m core.deadline status
+#   python -m core.deadline set "2026-03-02 18:00" --policy flag
+#   python -m core.deadline freeze
+# 시각은 로컬 시각이다.
+def main(argv=None):
+    from core import storage
+
+    parser = argparse.ArgumentParser(description='신청 마감 설정 / 마감 처리')
+    parser.add_argument('--db', default=storage.store_url(), help='저장소 주소 (기본: 환경변수 STUDENT_DB_URL)')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('status', help='현재 마감 설정 / 결과')
+    deadline = commands.add_parser('set', help='마감 시각 설정')
+    deadline.add_argument('moment', help='마감 시각 (로컬), "none" 이면 해제')
+    deadline.add_argument('--policy', choices=list(POLICIES), help='마감 처리 방식 (기본: 현재 설정 유지)')
+    freeze_parser = commands.add_parser('freeze', help='지금 마감 처리')
+    freeze_parser.add_argument('--policy', choices=list(POLICIES), help='마감 처리 방식 (기본: 현재 설정)')
+    args = parser.parse_args(argv)
+
+    store = storage.get_store(args.db)
+    if args.command == 'set':
+        current = store.round_state()
+        with store.transaction() as conn:
+            store.set_deadline(conn, None if args.moment == 'none' else audit.to_utc(args.moment),
+                               args.policy or current.policy)
+    elif args.command == 'freeze':
+        started = time.perf_counter()
+        with store.transaction() as conn:
+            result = store.freeze_round(conn, args.policy)
+        if result is None:
+            print('이미 마감 처리되었습니다.')
+        else:
+            print(f"자동 제출 {result['finalized']}명, 미완료 표시 {result['flagged']}명, "
+                  f"스냅숏 {result['snapshot_id']} ({(time.perf_counter() - started) * 1000:.1f} ms)")
+
+    round_ = store.round_state()
+    print(f"마감 시각: {audit.to_local(round_.deadline) or '없음'} ({POLICIES[round_.policy]})")
+    if round_.frozen_at:
+        print(f"마감 처리: {audit.to_local(round_.frozen_at)}, 자동 제출 {round_.finalized}명, "
+              f"미완료 표시 {round_.flagged}명, 스냅숏 {round_.snapshot_id}")
+
+
+if __name__ == '__main__':
+    main()
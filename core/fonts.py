@@ -0,0 +1,82 @@
+import os
+import threading
+import time
+
+import streamlit as st
+
+# 한글 폰트 설정
+FONT_NAME = 'NotoSans'
+FONT_FILE = 'NotoSansKR-Regular.ttf'
+FALLBACK_FONT = 'Helvetica'
+FONT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# 한글 폰트 레지스트리
+# 큰 CJK TrueType 파일은 프로세스당 한 번만 파싱해서 등록하고,
+# 이후 PDF 생성에서는 파싱된 글꼴 정보를 그대로 재사용한다.
+# (글리프 서브셋은 reportlab 이 문서마다 사용된 글자만 포함시킨다)
+# reportlab 은 첫 PDF 생성 시 _load 에서 불러오므로 학생 화면 시작 비용에 들어가지 않는다.
+class FontRegistry:
+    def __init__(self, font_dir=FONT_DIR):
+        self.path = os.path.join(font_dir, FONT_FILE)
+        self.font_name = None
+        self.status = 'cold'
+        self.load_seconds = None
+        self.error = None
+        self.lookups = 0
+        self._lock = threading.Lock()
+
+    # PDF 에 사용할 폰트 이름 (처음 호출 시에만 로딩)
+    def korean_font(self):
+        self.lookups += 1
+        if self.font_name is None:
+            self._load()
+        return self.font_name
+
+    def _load(self):
+        with self._lock:
+            if self.font_name is not None:
+                return
+
+            started = time.perf_counter()
+            from reportlab.pdfbase import pdfmetrics
+            from reportlab.pdfbase.ttfonts import TTFont
+
+            try:
+                if FONT_NAME not in pdfmetrics.getRegisteredFontNames():
+                    if not os.path.exists(self.path):
+                        raise FileNotFoundError(self.path)
+                    pdfmetrics.registerFont(TTFont(FONT_NAME, self.path))
+                self.status = 'warm'
+                font_name = FONT_NAME
+            except FileNotFoundError:
+                self.status = 'missing'
+                font_name = FALLBACK_FONT
+            except Exception as e:
+                self.status = 'error'
+                self.error = str(e)
+                font_name = FALLBACK_FONT
+
+            self.load_seconds = time.perf_counter() - started
+            self.font_name = font_name
+
+    def info(self):
+        return {
+            'font': self.font_name,
+            'status': self.status,
+            'path': self.path,
+            'load_seconds': self.load_seconds,
+            'lookups': self.lookups,
+            'error': self.error,
+        }
+
+
+# 프로세스 전체에서 공유하는 폰트 레지스트리
+@st.cache_resource(show_spinner=False)
+def get_font_registry():
+    return FontRegistry()
+
+
+# PDF 생성에서 사용할 한글 폰트 이름
+def korean_font():
+    return get_font_registry().korean_font()
@@ -0,0 +1,166 @@
+import argparse
+import csv
+import os
+import sqlite3
+
+from core import storage
+
+# 예전 두 데이터베이스를 하나의 저장소로 합치기 (한 번 실행)
+#   python -m core.merge_databases                              major_selection.db → 기본 저장소
+#   python -m core.merge_databases student_major.db major_selection.db --into standin:///합본.db
+#
+# 원본은 읽기 전용으로 열며 스키마 버전(정규화 전 / 후)에 맞춰 읽는다.
+#   app.py 형식:       students (+ students_view)
+#   major_app.py 형식: users + applications (+ applications_view)
+# 같은 학번이 이미 대상에 있으면 대상을 유지한다. 단, 대상은 미제출이고 원본은
+# 최종 제출된 경우에만 원본의 신청 내용으로 바꾸고 제출 상태로 만든다.
+# 다시 실행해도 이미 옮긴 학번은 건너뛰므로 결과가 같다.
+LEGACY_PATHS = ['major_selection.db']
+BATCH_ROWS = 1000
+
+
+def _tables(conn):
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view')")}
+
+
+def _columns(conn, table):
+    return {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+
+
+def _split(courses):
+    return [course for course in (courses or '').split(',') if course]
+
+
+# 원본 데이터베이스의 학생을 계정 dict 로 읽기 (storage.Store.create_accounts 형식)
+def read_legacy(path):
+    conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    try:
+        tables = _tables(conn)
+        if 'students' in tables:
+            source = 'students_view' if 'students_view' in tables else 'students'
+            has_times = 'created_at' in _columns(conn, 'students')
+            sql = f'''
+                SELECT s.student_id, s.name, s.password, v.semester1_gpa, v.completed_courses,
+                       v.major_preference_1, v.major_preference_2, v.major_preference_3,
+                       v.major_preference_4, v.major_preference_5, v.is_submitted,
+                       {'s.created_at, s.updated_at' if has_times else 'NULL, NULL'}
+                FROM students s JOIN {source} v ON v.student_id = s.student_id
+                ORDER BY s.student_id
+            '''
+        elif 'users' in tables:
+            source = 'applications_view' if 'applications_view' in tables else 'applications'
+            sql = f'''
+                SELECT u.student_id, u.name, u.password_hash, a.gpa, a.completed_courses,
+                       a.major_1, a.major_2, a.major_3, a.major_4, a.major_5, a.is_submitted,
+                       NULL, NULL
+                FROM users u LEFT JOIN {source} a ON a.student_id = u.student_id
+                ORDER BY u.student_id
+            '''
+        else:
+            raise ValueError(f'{path}: 학생 테이블(students 또는 users)이 없습니다.')
+
+        for row in conn.execute(sql):
+            student_id, name, password_hash, gpa, courses, p1, p2, p3, p4, p5, is_submitted, created_at, updated_at = row
+            yield {
+                'student_id': student_id,
+                'name': name,
+                'password_hash': password_hash,
+                'gpa': gpa,
+                'courses': _split(courses),
+                'preferences': [major or None for major in (p1, p2, p3, p4, p5)],
+                'is_submitted': bool(is_submitted),
+                'created_at': created_at,
+                'updated_at': updated_at,
+            }
+    finally:
+        conn.close()
+
+
+def _merge_batch(store, source, batch, result):
+    with store.transaction() as conn:
+        existing = store.existing_ids(conn, [account['student_id'] for account in batch])
+        store.create_accounts(conn, [account for account in batch if account['student_id'] not in existing])
+        result['inserted'] += len(batch) - len(existing)
+
+        for account in batch:
+            if account['student_id'] not in existing:
+                continue
+            # 이미 있던 학번은 이 트랜잭션 전에 커밋된 내용이므로 다른 연결로 읽어도 같다
+            target = store.load_record(account['student_id'])
+            if account['is_submitted'] and not target.is_submitted:
+                version = store.write_record(
+                    conn, account['student_id'], account['gpa'], account['courses'], account['preferences']
+                )
+                store.submit(conn, account['student_id'], version)
+                result['replaced'] += 1
+                result['conflicts'].append((source, account['student_id'], '원본의 최종 제출 내용으로 교체'))
+            else:
+                result['skipped'] += 1
+                if not _same(account, target):
+                    result['conflicts'].append((source, account['student_id'], '이미 있는 학번 (대상 유지)'))
+
+
+def _same(account, record):
+    return (
+        account['name'] == record.name
+        and account['gpa'] == record.gpa
+        and account['courses'] == record.courses
+        and account['preferences'] == record.preferences
+        and account['is_submitted'] == record.is_submitted
+    )
+
+
+# 원본 데이터베이스들을 store 로 합치기
+# 반환값: {'inserted', 'replaced', 'skipped', 'conflicts': [(원본, 학번, 사유)]}
+def merge(store, paths, progress=None):
+    result = {'inserted': 0, 'replaced': 0, 'skipped': 0, 'conflicts': []}
+    target_path = os.path.abspath(store.path) if store.path else None
+    for path in paths:
+        if target_path and os.path.abspath(path) == target_path:
+            continue
+        batch = []
+        for account in read_legacy(path):
+            batch.append(account)
+            if len(batch) >= BATCH_ROWS:
+                _merge_batch(store, path, batch, result)
+                batch = []
+                if progress:
+                    progress(path, result)
+        if batch:
+            _merge_batch(store, path, batch, result)
+        if progress:
+            progress(path, result)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='예전 데이터베이스를 하나의 저장소로 합치기')
+    parser.add_argument('paths', nargs='*', default=LEGACY_PATHS,
+                        help='원본 SQLite 파일 (기본: major_selection.db)')
+    parser.add_argument('--into', default=storage.store_url(), help='대상 저장소 주소 (기본: 환경변수 STUDENT_DB_URL)')
+    parser.add_argument('--report', help='충돌 / 교체 내역을 기록할 CSV 경로')
+    args = parser.parse_args(argv)
+
+    missing = [path for path in args.paths if not os.path.exists(path)]
+    if missing:
+        parser.error(f"원본 파일이 없습니다: {', '.join(missing)}")
+
+    store = storage.get_store(args.into)
+    result = merge(
+        store, args.paths,
+        progress=lambda path, r: print(f"\r{path}: 추가 {r['inserted']}, 교체 {r['replaced']}, 유지 {r['skipped']}",
+                                       end='', flush=True),
+    )
+    print(f"\n{store.url} 로 합침: 추가 {result['inserted']}명, 교체 {result['replaced']}명, "
+          f"기존 유지 {result['skipped']}명, 확인 필요 {len(result['conflicts'])}건")
+    for source, student_id, reason in result['conflicts'][:20]:
+        print(f'  {source} {student_id}: {reason}')
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['원본', '학번', '사유'])
+            writer.writerows(result['conflicts'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+import bisect
+import functools
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+import streamlit as st
+
+# 계측 설정 (환경변수)
+# - APP_METRICS=1 일 때만 계측. 꺼져 있으면 timed() 는 원래 함수를 그대로 돌려주고
+#   timer() 는 공용 nullcontext 를 돌려주므로 추가 비용이 거의 없음
+# - METRICS_FILE 을 지정하면 Prometheus 텍스트 형식으로 주기적으로 기록
+#   (node_exporter textfile collector 등에서 수집)
+ENABLED = os.environ.get('APP_METRICS', '').lower() in ('1', 'true', 'yes', 'on')
+DUMP_FILE_ENV = 'METRICS_FILE'
+DUMP_INTERVAL_ENV = 'METRICS_DUMP_SECONDS'
+DUMP_INTERVAL_SECONDS = 15
+
+# 히스토그램 버킷 상한 (초)
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_NULL = nullcontext()
+
+
+# 함수별 지연시간 히스토그램
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.errors = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    # 버킷 안에서 선형 보간한 분위수 (Prometheus histogram_quantile 과 같은 방식)
+    def quantile(self, q):
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= target and n:
+                lower = BUCKETS[i - 1] if i else 0.0
+                upper = BUCKETS[i] if i < len(BUCKETS) else BUCKETS[-1]
+                return lower + (upper - lower) * (target - seen) / n
+            seen += n
+        return BUCKETS[-1]
+
+
+# 프로세스 전체 계측 저장소 (스레드 안전)
+class Registry:
+    def __init__(self):
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def observe(self, name, seconds, error=False):
+        with self._lock:
+            hist = self._histograms.get(name)
+            if hist is None:
+                hist = self._histograms[name] = Histogram()
+            hist.observe(seconds)
+            if error:
+                hist.errors += 1
+
+    def count(self, name, n=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self.started_at = time.time()
+
+    def summary(self):
+        with self._lock:
+            rows = [
+                {
+                    '함수': name,
+                    '호출': hist.count,
+                    '오류': hist.errors,
+                    '합계(s)': round(hist.total, 3),
+                    '평균(ms)': round(hist.total / hist.count * 1000, 2),
+                    'p50(ms)': round(hist.quantile(0.5) * 1000, 2),
+                    'p95(ms)': round(hist.quantile(0.95) * 1000, 2),
+                    'p99(ms)': round(hist.quantile(0.99) * 1000, 2),
+                }
+                for name, hist in self._histograms.items()
+            ]
+            counters = dict(self._counters)
+        rows.sort(key=lambda row: row['합계(s)'], reverse=True)
+        return rows, counters
+
+    # Prometheus 텍스트 노출 형식
+    def prometheus_text(self):
+        lines = [
+            '# HELP app_function_duration_seconds Time spent in instrumented functions.',
+            '# TYPE app_function_duration_seconds histogram',
+        ]
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+            for name, hist in histograms:
+                label = _label(name)
+                cumulative = 0
+                for bound, n in zip(BUCKETS, hist.counts):
+                    cumulative += n
+                    lines.append(f'app_function_duration_seconds_bucket{{function="{label}",le="{bound}"}} {cumulative}')
+                lines.append(f'app_function_duration_seconds_bucket{{function="{label}",le="+Inf"}} {hist.count}')
+                lines.append(f'app_function_duration_seconds_sum{{function="{label}"}} {hist.total:.6f}')
+                lines.append(f'app_function_duration_seconds_count{{function="{label}"}} {hist.count}')
+
+            lines.append('# HELP app_function_errors_total Exceptions raised by instrumented functions.')
+            lines.append('# TYPE app_function_errors_total counter')
+            for name, hist in histograms:
+                lines.append(f'app_function_errors_total{{function="{_label(name)}"}} {hist.errors}')
+
+            lines.append('# HELP app_events_total Application event counters.')
+            lines.append('# TYPE app_events_total counter')
+            for name, value in counters:
+                lines.append(f'app_events_total{{event="{_label(name)}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def _label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+REGISTRY = Registry()
+
+
+# 함수 지연시간 계측 데코레이터 (비활성 시 원래 함수를 그대로 반환)
+# st.rerun() / st.stop() 은 BaseException 이므로 오류로 세지 않는다.
+def timed(name):
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            error = False
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                error = True
+                raise
+            finally:
+                REGISTRY.observe(name, time.perf_counter() - started, error)
+        return wrapper
+    return decorate
+
+
+# 코드 구간 계측 (with metrics.timer('...'):)
+def timer(name):
+    if not ENABLED:
+        return _NULL
+    return _timer(name)
+
+
+@contextmanager
+def _timer(name):
+    started = time.perf_counter()
+    error = False
+    try:
+        yield
+    except Exception:
+        error = True
+        raise
+    finally:
+        REGISTRY.observe(name, time.perf_counter() - started, error)
+
+
+# 이벤트 카운터
+def count(name, n=1):
+    if ENABLED:
+        REGISTRY.count(name, n)
+
+
+# Prometheus 텍스트 파일로 원자적으로 기록
+def dump(path):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.metrics-', suffix='.prom')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(REGISTRY.prometheus_text())
+    os.replace(tmp, path)
+
+
+# METRICS_FILE 주기 기록 스레드 (프로세스당 하나)
+_dumper = None
+_dumper_lock = threading.Lock()
+
+
+def start_file_dump():
+    global _dumper
+    path = os.environ.get(DUMP_FILE_ENV)
+    if not ENABLED or not path or _dumper is not None:
+        return
+    interval = float(os.environ.get(DUMP_INTERVAL_ENV, DUMP_INTERVAL_SECONDS))
+
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                dump(path)
+            except OSError:
+                pass
+
+    with _dumper_lock:
+        if _dumper is None:
+            _dumper = threading.Thread(target=run, name='metrics-dump', daemon=True)
+            _dumper.start()
+
+
+# 관리자 성능 지표 패널
+def render_metrics(key='metrics'):
+    if not ENABLED:
+        st.caption("계측이 꺼져 있습니다. 환경변수 APP_METRICS=1 로 실행하면 함수별 지연시간을 수집합니다.")
+        return
+
+    rows, counters = REGISTRY.summary()
+    elapsed = time.time() - REGISTRY.started_at
+    st.caption(f"수집 시작 후 {elapsed:.0f}초 · 함수 {len(rows)}개")
+    if rows:
+        st.dataframe(rows, use_container_width=True, hide_index=True)
+    if counters:
+        st.write("이벤트", counters)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            "📥 Prometheus 텍스트",
+            data=REGISTRY.prometheus_text,
+            file_name="metrics.prom",
+            mime="text/plain",
+            key=f'{key}_download',
+        )
+    with col2:
+        if st.button("🔄 초기화", key=f'{key}_reset'):
+            REGISTRY.reset()
+            st.rerun()
@@ -0,0 +1,98 @@
+# 이수 교과목 / 전공 지망의 정규화 테이블
+# student_courses:     (student_id, position, course)  — position 은 선택 순서
+# student_preferences: (student_id, rank, major)       — rank 는 1~5지망
+# 두 데이터베이스 모두 같은 테이블 이름과 컬럼을 사용한다.
+
+PREFERENCE_RANKS = 5
+
+
+# 정규화 테이블 / 인덱스 / 부모 행 삭제 시 정리 트리거
+def child_tables_migration(parent_table):
+    return [
+        f'''
+        CREATE TABLE IF NOT EXISTS student_courses (
+            student_id TEXT NOT NULL REFERENCES {parent_table} (student_id),
+            position INTEGER NOT NULL,
+            course TEXT NOT NULL,
+            PRIMARY KEY (student_id, course)
+        ) WITHOUT ROWID
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_student_courses_course ON student_courses (course, student_id)',
+        f'''
+        CREATE TABLE IF NOT EXISTS student_preferences (
+            student_id TEXT NOT NULL REFERENCES {parent_table} (student_id),
+            rank INTEGER NOT NULL,
+            major TEXT NOT NULL,
+            PRIMARY KEY (student_id, rank)
+        ) WITHOUT ROWID
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_student_preferences_major ON student_preferences (major, rank, student_id)',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS {parent_table}_children_delete AFTER DELETE ON {parent_table}
+        BEGIN
+            DELETE FROM student_courses WHERE student_id = OLD.student_id;
+            DELETE FROM student_preferences WHERE student_id = OLD.student_id;
+        END
+        ''',
+    ]
+
+
+# 기존 쉼표 구분 교과목 컬럼을 student_courses 로 옮기는 SQL
+def copy_courses_sql(table, column):
+    return f'''
+        WITH RECURSIVE split (student_id, position, course, rest) AS (
+            SELECT student_id, 0, '', {column} || ','
+            FROM {table} WHERE {column} IS NOT NULL AND {column} != ''
+            UNION ALL
+            SELECT student_id, position + 1,
+                   substr(rest, 1, instr(rest, ',') - 1),
+                   substr(rest, instr(rest, ',') + 1)
+            FROM split WHERE rest != ''
+        )
+        INSERT OR IGNORE INTO student_courses (student_id, position, course)
+        SELECT student_id, position, course FROM split
+        WHERE position > 0 AND course != ''
+    '''
+
+
+# 기존 1~5지망 컬럼을 student_preferences 로 옮기는 SQL
+def copy_preferences_sql(table, columns):
+    ranked = ' UNION ALL '.join(
+        f"SELECT student_id, {rank}, {column} FROM {table} "
+        f"WHERE {column} IS NOT NULL AND {column} != ''"
+        for rank, column in enumerate(columns, start=1)
+    )
+    return f'INSERT OR IGNORE INTO student_preferences (student_id, rank, major) {ranked}'
+
+
+# 호환 뷰에서 기존 컬럼 모양을 재구성하는 SELECT 식
+# table: 이수 교과목 / 지망 테이블 (마감 시점 고정 테이블도 같은 모양)
+def courses_column(key, alias, table='student_courses'):
+    return f'''(
+        SELECT group_concat(course, ',') FROM (
+            SELECT course FROM {table} c
+            WHERE c.student_id = {key} ORDER BY c.position
+        )
+    ) AS {alias}'''
+
+
+def preference_columns(key, aliases, table='student_preferences'):
+    return ',\n'.join(
+        f'(SELECT major FROM {table} p WHERE p.student_id = {key} AND p.rank = {rank}) AS {alias}'
+        for rank, alias in enumerate(aliases, start=1)
+    )
+
+
+# 한 학생의 이수 교과목과 전공 지망을 통째로 교체 (호출한 트랜잭션 안에서 실행)
+# 비어 있는 지망은 행을 만들지 않는다.
+def replace_children(conn, student_id, courses, preferences):
+    conn.execute('DELETE FROM student_courses WHERE student_id = ?', (student_id,))
+    conn.execute('DELETE FROM student_preferences WHERE student_id = ?', (student_id,))
+    conn.executemany(
+        'INSERT OR IGNORE INTO student_courses (student_id, position, course) VALUES (?, ?, ?)',
+        [(student_id, position, course) for position, course in enumerate(courses or [], start=1)]
+    )
+    conn.executemany(
+        'INSERT INTO student_preferences (student_id, rank, major) VALUES (?, ?, ?)',
+        [(student_id, rank, major) for rank, major in enumerate(preferences or [], start=1) if major]
+    )
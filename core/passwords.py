@@ -0,0 +1,180 @@
+import base64
+import hashlib
+import hmac
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from core import metrics
+
+# 비밀번호 해시 설정
+# - 저장 형식: '<알고리즘>$<파라미터...>$<salt>$<해시>' (salt 는 사용자마다 무작위)
+# - 예전 형식(솔트 없는 SHA-256 16진수 64자)도 검증하며, 로그인에 성공하면
+#   needs_rehash 가 True 가 되어 현재 기본 알고리즘으로 다시 저장된다.
+# - 해시 계산은 제한된 스레드 풀에서 실행하고, 대기열이 가득 차면 PasswordBusyError
+HASHER_ENV = 'PASSWORD_HASHER'
+DEFAULT_HASHER = 'scrypt'
+HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', min(4, os.cpu_count() or 1)))
+MAX_PENDING = HASH_WORKERS * 8
+WAIT_SECONDS = 10
+
+_LEGACY_SHA256 = re.compile(r'^[0-9a-f]{64}$')
+
+
+# 해시 계산 대기열이 가득 찬 경우
+class PasswordBusyError(Exception):
+    pass
+
+
+def _b64(data):
+    return base64.b64encode(data).decode('ascii').rstrip('=')
+
+
+def _unb64(text):
+    return base64.b64decode(text + '=' * (-len(text) % 4))
+
+
+# scrypt (메모리 사용량이 큰 KDF, 약 16MB)
+class ScryptHasher:
+    name = 'scrypt'
+    fields = 6
+
+    def __init__(self, n=2 ** 14, r=8, p=1, dklen=32):
+        self.n, self.r, self.p, self.dklen = n, r, p, dklen
+
+    def _derive(self, password, salt, n, r, p, dklen):
+        return hashlib.scrypt(
+            password.encode('utf-8'), salt=salt, n=n, r=r, p=p,
+            maxmem=256 * n * r + 1024 * 1024, dklen=dklen,
+        )
+
+    def encode(self, password, salt):
+        digest = self._derive(password, salt, self.n, self.r, self.p, self.dklen)
+        return f'{self.name}${self.n}${self.r}${self.p}${_b64(salt)}${_b64(digest)}'
+
+    def verify(self, password, encoded):
+        _, n, r, p, salt, digest = encoded.split('$')
+        expected = _unb64(digest)
+        actual = self._derive(password, _unb64(salt), int(n), int(r), int(p), len(expected))
+        return hmac.compare_digest(actual, expected)
+
+    def needs_rehash(self, encoded):
+        _, n, r, p, _, _ = encoded.split('$')
+        return (int(n), int(r), int(p)) != (self.n, self.r, self.p)
+
+
+# PBKDF2-HMAC-SHA256 (scrypt 를 쓸 수 없는 환경용)
+class Pbkdf2Hasher:
+    name = 'pbkdf2_sha256'
+    fields = 4
+
+    def __init__(self, iterations=600_000, dklen=32):
+        self.iterations, self.dklen = iterations, dklen
+
+    def encode(self, password, salt):
+        digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, self.iterations, self.dklen)
+        return f'{self.name}${self.iterations}${_b64(salt)}${_b64(digest)}'
+
+    def verify(self, password, encoded):
+        _, iterations, salt, digest = encoded.split('$')
+        expected = _unb64(digest)
+        actual = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), _unb64(salt), int(iterations), len(expected))
+        return hmac.compare_digest(actual, expected)
+
+    def needs_rehash(self, encoded):
+        return int(encoded.split('$')[1]) != self.iterations
+
+
+HASHERS = {hasher.name: hasher for hasher in (ScryptHasher(), Pbkdf2Hasher())}
+
+
+def default_hasher():
+    name = os.environ.get(HASHER_ENV, DEFAULT_HASHER)
+    if name == 'scrypt' and not hasattr(hashlib, 'scrypt'):
+        name = Pbkdf2Hasher.name
+    return HASHERS[name]
+
+
+# 일괄 등록용 초기 비밀번호 해시 (비용을 낮춘 같은 알고리즘)
+# 파라미터가 기본값과 다르므로 첫 로그인 때 needs_rehash 로 기본 비용으로 다시 저장된다.
+def import_hasher():
+    if default_hasher().name == ScryptHasher.name:
+        return ScryptHasher(n=2 ** 12)
+    return Pbkdf2Hasher(iterations=60_000)
+
+
+# 새 비밀번호 해시 (사용자별 무작위 salt)
+def hash_password(password, hasher=None):
+    return (hasher or default_hasher()).encode(password, os.urandom(16))
+
+
+# 이미 해시된 값을 그대로 저장할 수 있는지 (지원하는 형식인지)
+def is_supported_hash(encoded):
+    if _LEGACY_SHA256.match(encoded):
+        return True
+    parts = encoded.split('$')
+    hasher = HASHERS.get(parts[0])
+    if hasher is None or len(parts) != hasher.fields:
+        return False
+    try:
+        hasher.needs_rehash(encoded)
+    except ValueError:
+        return False
+    return True
+
+
+# 비밀번호 확인 → (일치 여부, 다시 해시해야 하는지)
+def verify_password(password, encoded):
+    if not encoded:
+        return False, False
+    if _LEGACY_SHA256.match(encoded):
+        legacy = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(legacy, encoded), True
+
+    hasher = HASHERS.get(encoded.split('$', 1)[0])
+    if hasher is None:
+        return False, False
+    try:
+        ok = hasher.verify(password, encoded)
+    except (ValueError, TypeError):
+        return False, False
+    current = default_hasher()
+    return ok, ok and (hasher is not current or hasher.needs_rehash(encoded))
+
+
+# 해시 계산 전용 스레드 풀 (동시 계산 수와 대기열 길이를 제한)
+class HashPool:
+    def __init__(self, workers=HASH_WORKERS, max_pending=MAX_PENDING):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def run(self, fn, *args, timeout=WAIT_SECONDS):
+        if not self._slots.acquire(timeout=timeout):
+            metrics.count('passwords.busy')
+            raise PasswordBusyError()
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
+
+
+@st.cache_resource(show_spinner=False)
+def get_hash_pool():
+    return HashPool()
+
+
+@metrics.timed('passwords.hash')
+def hash_password_pooled(password):
+    return get_hash_pool().run(hash_password, password)
+
+
+@metrics.timed('passwords.verify')
+def verify_password_pooled(password, encoded):
+    return get_hash_pool().run(verify_password, password, encoded)
+
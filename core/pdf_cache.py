@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+
+# 메모리 캐시 한도 (바이트 / 항목 수)
+MAX_MEMORY_BYTES = 64 * 1024 * 1024
+MAX_ENTRIES = 2048
+
+# 디스크 캐시 경로 (환경변수로 지정 시에만 사용)
+DISK_DIR_ENV = 'PDF_CACHE_DIR'
+
+
+# PDF 캐시 키: 신청서 내용 + 템플릿 버전의 해시
+def cache_key(template, student_id, name, gpa, courses, preferences, *extra):
+    payload = json.dumps(
+        [template, student_id, name, gpa, list(courses or []),
+         list(preferences or []), *extra],
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+# 생성된 PDF 바이트 캐시 (LRU, 메모리 상한 + 선택적 디스크 계층)
+class PdfCache:
+    def __init__(self, max_bytes=MAX_MEMORY_BYTES, max_entries=MAX_ENTRIES, disk_dir=None):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def get(self, key):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+
+        data = self._read_disk(key)
+        if data is not None:
+            with self._lock:
+                self.disk_hits += 1
+            self._remember(key, data)
+            return data
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, data):
+        self._remember(key, data)
+        self._write_disk(key, data)
+
+    def get_or_build(self, key, build):
+        data = self.get(key)
+        if data is None:
+            data = build()
+            self.put(key, data)
+        return data
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+            }
+
+    def _remember(self, key, data):
+        # 한 항목이 전체 한도보다 크면 메모리에는 두지 않음
+        if len(data) > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._entries[key] = data
+            self._size += len(data)
+
+            while self._size > self.max_bytes or len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, key[:2], f'{key}.pdf')
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_disk(self, key, data):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # 임시 파일에 쓴 뒤 교체하여 반쯤 쓰인 파일을 읽지 않도록 함
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+
+# 프로세스 전체에서 공유하는 PDF 캐시
+@st.cache_resource(show_spinner=False)
+def get_pdf_cache():
+    return PdfCache(disk_dir=os.environ.get(DISK_DIR_ENV) or None)
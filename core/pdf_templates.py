@@ -0,0 +1,176 @@
+import io
+
+from core import fonts, metrics
+
+# 신청서 PDF 템플릿
+# 두 앱과 일괄 내보내기 작업 프로세스가 같은 렌더러를 사용한다.
+# 레이아웃을 바꾸면 템플릿 이름의 버전을 올려서 PDF 캐시를 무효화한다.
+# reportlab 은 import 가 무거우므로 렌더러 안에서 처음 PDF 를 만들 때 불러온다.
+CANVAS_TEMPLATE = 'app.canvas.v1'
+TABLE_TEMPLATE = 'major_app.platypus.v1'
+
+
+# 단순 캔버스 신청서 (app.py)
+def render_canvas(student_id, name, gpa, courses, preferences, submitted_text):
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    p = canvas.Canvas(buffer, pagesize=A4)
+    width, height = A4
+    
+    # 한글 폰트 (프로세스당 한 번만 등록됨, 없으면 Helvetica)
+    korean_font = fonts.korean_font()
+    
+    # 제목
+    try:
+        p.setFont(korean_font, 20)
+    except:
+        p.setFont("Helvetica-Bold", 20)
+    p.drawString(50, height - 50, "전공 선택 신청서")
+    
+    # 학생 정보
+    try:
+        p.setFont(korean_font, 12)
+    except:
+        p.setFont("Helvetica", 12)
+    
+    y_pos = height - 100
+    
+    p.drawString(50, y_pos, f"학번: {student_id}")
+    y_pos -= 30
+    p.drawString(50, y_pos, f"이름: {name}")
+    y_pos -= 30
+    p.drawString(50, y_pos, f"1학기 학점: {gpa}/4.3")
+    y_pos -= 30
+    
+    # 이수 과목
+    p.drawString(50, y_pos, "1학기 이수 교과목:")
+    y_pos -= 20
+    for course in courses:
+        p.drawString(70, y_pos, f"• {course}")
+        y_pos -= 20
+    
+    y_pos -= 20
+    
+    # 전공 희망 순위
+    p.drawString(50, y_pos, "전공 희망 순위:")
+    y_pos -= 20
+    
+    preference_names = ["1지망", "2지망", "3지망", "4지망", "5지망"]
+    
+    for i, pref in enumerate(preferences):
+        if pref:
+            p.drawString(70, y_pos, f"{preference_names[i]}: {pref}")
+            y_pos -= 20
+    
+    # 제출 시간
+    y_pos -= 30
+    p.drawString(50, y_pos, f"제출 시간: {submitted_text}")
+    
+    p.save()
+    return buffer.getvalue()
+
+
+# 표 형식 신청서 (major_app.py)
+def render_table(student_id, name, gpa, courses, majors):
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+
+    # 한글 폰트 (프로세스당 한 번만 등록됨, 없으면 Helvetica)
+    korean_font = fonts.korean_font()
+    
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    styles = getSampleStyleSheet()
+    
+    # 한글 스타일 정의
+    korean_style = ParagraphStyle(
+        'Korean',
+        parent=styles['Normal'],
+        fontName=korean_font,
+        fontSize=12,
+        spaceAfter=12,
+    )
+    
+    title_style = ParagraphStyle(
+        'KoreanTitle',
+        parent=styles['Title'],
+        fontName=korean_font,
+        fontSize=18,
+        spaceAfter=20,
+        alignment=1,  # 중앙 정렬
+    )
+    
+    story = []
+    
+    # 제목
+    title = Paragraph("전공 선택 신청서", title_style)
+    story.append(title)
+    story.append(Spacer(1, 20))
+    
+    # 기본 정보
+    info_data = [
+        ['학번', student_id],
+        ['이름', name],
+        ['1학기 학점', f'{gpa}/4.3'],
+        ['이수 교과목', ', '.join(courses) if courses else '없음']
+    ]
+    
+    info_table = Table(info_data, colWidths=[2*inch, 4*inch])
+    info_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, -1), korean_font),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ('BACKGROUND', (0, 0), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    
+    story.append(info_table)
+    story.append(Spacer(1, 20))
+    
+    # 전공 지망 순위
+    major_title = Paragraph("전공 지망 순위", korean_style)
+    story.append(major_title)
+    
+    major_names = ['인공지능', '컴퓨터과학', '데이터사이언스', '신소재물리', '지능형전자시스템']
+    major_data = [['순위', '전공명']]
+    
+    for i, major in enumerate(majors):
+        if major:
+            major_data.append([f'{i+1}지망', major])
+    
+    major_table = Table(major_data, colWidths=[1.5*inch, 4*inch])
+    major_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, -1), korean_font),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    
+    story.append(major_table)
+    
+    doc.build(story)
+    return buffer.getvalue()
+
+
+TEMPLATES = {
+    CANVAS_TEMPLATE: render_canvas,
+    TABLE_TEMPLATE: render_table,
+}
+
+
+# 템플릿 이름으로 PDF 렌더링
+@metrics.timed('pdf_templates.render')
+def render(template, args):
+    return TEMPLATES[template](*args)
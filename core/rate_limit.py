@@ -0,0 +1,114 @@
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import streamlit as st
+
+from core import metrics
+
+# 로그인 시도 제한 (프로세스 메모리의 토큰 버킷)
+# - 시도할 때마다 학번별 / 접속자별 버킷에서 토큰을 하나씩 쓰고, 토큰은 refill_seconds 마다 하나씩 다시 찬다.
+#   버킷 하나라도 비어 있으면 아무 토큰도 쓰지 않고 RateLimitedError (DB / 해시 계산 전에 거절)
+# - 관리자 로그인(app.py 의 관리자 비밀번호, major_app.py 의 'admin' 계정)은 접속자별로 더 엄격한 버킷을 따로 쓴다.
+#   (모든 접속자가 함께 쓰는 관리자 버킷을 두면 누구나 틀린 시도만으로 관리자를 막을 수 있으므로 두지 않는다)
+# - 로그인에 성공하면 그 시도에 쓴 토큰을 돌려준다 (실패한 시도만 제한에 반영).
+# - 버킷은 최근에 쓴 MAX_BUCKETS 개만 보관하고 가장 오래된 것부터 버린다 (버려진 버킷은 가득 찬 상태로 다시 시작).
+# - 접속자는 연결 IP 로 구분하며, 로컬 접속(IP 없음)은 브라우저 세션별로 구분한다.
+#   프록시 뒤에서 실행할 때는 환경변수 RATE_LIMIT_TRUST_PROXY=1 로 X-Forwarded-For 의 첫 주소를 쓴다.
+Limit = namedtuple('Limit', ['capacity', 'refill_seconds'])
+
+STUDENT_LIMIT = Limit(5, 12)
+CLIENT_LIMIT = Limit(20, 3)
+ADMIN_CLIENT_LIMIT = Limit(3, 60)
+ADMIN_ID = 'admin'
+MAX_BUCKETS = 50_000
+TRUST_PROXY_ENV = 'RATE_LIMIT_TRUST_PROXY'
+
+
+# 시도 제한에 걸린 경우 (retry_after: 다시 시도할 수 있을 때까지 남은 초)
+class RateLimitedError(Exception):
+    def __init__(self, retry_after):
+        super().__init__(f'{retry_after}초 후 다시 시도해주세요.')
+        self.retry_after = retry_after
+
+
+class RateLimiter:
+    def __init__(self, max_buckets=MAX_BUCKETS):
+        self.max_buckets = max_buckets
+        self.allowed = 0
+        self.rejected = 0
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    # (키, Limit) 목록의 버킷에서 토큰을 하나씩 사용 (하나라도 부족하면 사용하지 않고 RateLimitedError)
+    def acquire(self, limits):
+        now = time.monotonic()
+        with self._lock:
+            levels = []
+            for key, limit in limits:
+                tokens, updated = self._buckets.get(key, (limit.capacity, now))
+                levels.append(min(limit.capacity, tokens + (now - updated) / limit.refill_seconds))
+            waits = [(1 - level) * limit.refill_seconds for level, (_, limit) in zip(levels, limits) if level < 1]
+            for level, (key, _) in zip(levels, limits):
+                self._buckets[key] = (level if waits else level - 1, now)
+                self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+            if waits:
+                self.rejected += 1
+            else:
+                self.allowed += 1
+        if waits:
+            metrics.count('rate_limit.rejected')
+            raise RateLimitedError(int(max(waits)) + 1)
+
+    # acquire 로 쓴 토큰 돌려주기 (가득 찬 버킷은 그대로)
+    def release(self, limits):
+        now = time.monotonic()
+        with self._lock:
+            for key, limit in limits:
+                if key in self._buckets:
+                    tokens, updated = self._buckets[key]
+                    self._buckets[key] = (min(limit.capacity, tokens + (now - updated) / limit.refill_seconds + 1), now)
+
+    def info(self):
+        return {'buckets': len(self._buckets), 'max_buckets': self.max_buckets,
+                'allowed': self.allowed, 'rejected': self.rejected}
+
+
+# 로그인 시도 제한 (프로세스 전체에서 하나)
+@st.cache_resource(show_spinner=False)
+def get_login_limiter():
+    return RateLimiter()
+
+
+# 현재 접속자 구분 값
+def client_id():
+    if os.environ.get(TRUST_PROXY_ENV) == '1':
+        forwarded = st.context.headers.get('X-Forwarded-For')
+        if forwarded:
+            return forwarded.split(',')[0].strip()
+    if st.context.ip_address:
+        return st.context.ip_address
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    return f'session:{ctx.session_id}' if ctx else 'local'
+
+
+# 로그인 시도 한 번 허용 여부 확인 (허용되지 않으면 RateLimitedError)
+# client 를 생략하면 현재 접속자, 반환값은 로그인에 성공했을 때 login_succeeded 에 넘긴다
+def check_login(student_id, client=None):
+    client = client or client_id()
+    if student_id == ADMIN_ID:
+        limits = [(('admin_client', client), ADMIN_CLIENT_LIMIT), (('client', client), CLIENT_LIMIT)]
+    else:
+        limits = [(('id', student_id), STUDENT_LIMIT), (('client', client), CLIENT_LIMIT)]
+    get_login_limiter().acquire(limits)
+    return limits
+
+
+# 성공한 로그인 시도는 제한에 반영하지 않음
+def login_succeeded(attempt):
+    get_login_limiter().release(attempt)
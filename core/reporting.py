@@ -0,0 +1,313 @@
+import argparse
+from datetime import datetime, timedelta, timezone
+
+import streamlit as st
+
+from core import audit, metrics, normalized
+
+# 신청 현황 보고서 (미리 집계해 둔 피벗 테이블)
+# - 학점 분포: 지망 순위별 전공 지원자의 학점 구간별 인원 / 학점 합계
+# - 이수 교과목 × 지망 전공: 교과목을 이수한 학생이 지망 순위별로 고른 전공
+# - 지망 이동: n지망 전공 → n+1지망 전공 학생 수
+# 모든 표는 제출 여부(submitted)로 나뉘어 있어 제출 완료자만 / 전체 학생을 골라 볼 수 있다.
+#
+# 집계는 변경 이력(core.audit 의 record_events)을 따라 증분으로 갱신한다.
+#   report_students 에 학생마다 현재 집계에 들어간 이벤트 번호를 두고, 새 이벤트가 생긴 학생만
+#   (이전 상태 -1, 새 상태 +1) 로 묶어 pandas 로 한 번에 그룹 합계를 낸 뒤 차이만 더한다.
+# 화면은 전공 / 교과목 / 학점 구간 수 만큼의 행만 읽으므로 학생 수와 무관하게 일정한 시간이 걸린다.
+# pandas 는 관리자 화면 / 갱신 때만 쓰므로 함수 안에서 불러온다.
+GPA_BIN_WIDTH = 0.5
+GPA_BINS = [f'{i * GPA_BIN_WIDTH:.1f}–{min((i + 1) * GPA_BIN_WIDTH, 4.3):.1f}' for i in range(9)]
+RANKS = list(range(1, normalized.PREFERENCE_RANKS + 1))
+
+# 보고서 테이블: 이름 → (테이블, 키 열, 값 열)
+TABLES = {
+    'gpa': ('report_gpa', ['submitted', 'major', 'rank', 'bin'], ['students', 'gpa_sum']),
+    'courses': ('report_courses', ['submitted', 'course', 'major', 'rank'], ['students']),
+    'transitions': ('report_transitions', ['submitted', 'rank', 'from_major', 'to_major'], ['students']),
+}
+
+
+# 보고서 테이블 (스키마 마이그레이션용 SQL 목록, SQLite 와 서버 DB 공통)
+# 처음 갱신할 때 지금까지의 변경 이력 전체(학생별 마지막 상태)로 집계를 만든다.
+def report_migration():
+    return [
+        '''
+        CREATE TABLE IF NOT EXISTS report_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            last_event_id INTEGER NOT NULL DEFAULT 0,
+            refreshed_at TEXT
+        )
+        ''',
+        'INSERT INTO report_state (id, last_event_id) VALUES (1, 0)',
+        '''
+        CREATE TABLE IF NOT EXISTS report_students (
+            student_id TEXT PRIMARY KEY,
+            event_id INTEGER NOT NULL
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS report_gpa (
+            submitted BOOLEAN NOT NULL,
+            major TEXT NOT NULL,
+            rank INTEGER NOT NULL,
+            bin INTEGER NOT NULL,
+            students INTEGER NOT NULL DEFAULT 0,
+            gpa_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+            PRIMARY KEY (submitted, major, rank, bin)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS report_courses (
+            submitted BOOLEAN NOT NULL,
+            course TEXT NOT NULL,
+            major TEXT NOT NULL,
+            rank INTEGER NOT NULL,
+            students INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (submitted, course, major, rank)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS report_transitions (
+            submitted BOOLEAN NOT NULL,
+            rank INTEGER NOT NULL,
+            from_major TEXT NOT NULL,
+            to_major TEXT NOT NULL,
+            students INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (submitted, rank, from_major, to_major)
+        )
+        ''',
+    ]
+
+
+def _upsert_sql(table, keys, values):
+    return f'''
+        INSERT INTO {table} ({', '.join(keys + values)}) VALUES ({', '.join(['%s'] * (len(keys) + len(values)))})
+        ON CONFLICT ({', '.join(keys)}) DO UPDATE SET
+            {', '.join(f'{value} = {table}.{value} + excluded.{value}' for value in values)}
+    '''
+
+
+# 이전 상태 / 새 상태 → 보고서별 차이 행 {이름: [(키..., 값...)]}
+# old, new 는 core.audit.event_row 모양의 학생 상태 목록 (학생마다 하나)
+def deltas(old, new):
+    import numpy as np
+    import pandas as pd
+
+    states = pd.DataFrame.from_records(
+        [(sign, bool(e['is_submitted']), e['gpa'], e['courses'], *e['preferences'])
+         for sign, events in ((-1, old), (1, new)) for e in events],
+        columns=['weight', 'submitted', 'gpa', 'courses', *RANKS],
+    )
+    states['gpa'] = pd.to_numeric(states['gpa'], errors='coerce')
+    states['row'] = np.arange(len(states))
+
+    # (학생 상태, 순위, 전공) 긴 표
+    chosen = states.melt(id_vars=['row', 'weight', 'submitted', 'gpa'], value_vars=RANKS,
+                         var_name='rank', value_name='major').dropna(subset=['major'])
+
+    graded = chosen[chosen['gpa'] > 0]
+    gpa = graded.assign(
+        bin=np.minimum(graded['gpa'] // GPA_BIN_WIDTH, len(GPA_BINS) - 1).astype(int),
+        gpa_sum=graded['gpa'] * graded['weight'],
+    ).groupby(['submitted', 'major', 'rank', 'bin']).agg(students=('weight', 'sum'), gpa_sum=('gpa_sum', 'sum'))
+
+    taken = states[['row', 'courses']].explode('courses').dropna().rename(columns={'courses': 'course'})
+    courses = taken.merge(chosen, on='row').groupby(['submitted', 'course', 'major', 'rank'])[['weight']].sum()
+
+    pairs = pd.concat([
+        states[['weight', 'submitted']].assign(rank=rank, from_major=states[rank], to_major=states[rank + 1])
+        for rank in RANKS[:-1]
+    ]).dropna(subset=['from_major', 'to_major'])
+    transitions = pairs.groupby(['submitted', 'rank', 'from_major', 'to_major'])[['weight']].sum()
+
+    # 학생 수 차이가 0 이어도 같은 구간 안에서 학점이 바뀌면 학점 합계는 달라진다
+    gpa = gpa[(gpa['students'] != 0) | (gpa['gpa_sum'].abs() > 1e-9)]
+    courses = courses[courses['weight'] != 0]
+    transitions = transitions[transitions['weight'] != 0]
+    return {
+        'gpa': [(bool(s), m, int(r), int(b), int(n), float(g))
+                for (s, m, r, b), n, g in zip(gpa.index, gpa['students'], gpa['gpa_sum'])],
+        'courses': [(bool(s), c, m, int(r), int(n)) for (s, c, m, r), n in zip(courses.index, courses['weight'])],
+        'transitions': [(bool(s), int(r), a, b, int(n))
+                        for (s, r, a, b), n in zip(transitions.index, transitions['weight'])],
+    }
+
+
+# 새 이벤트 구간에서 학생별 마지막 상태 / 그 학생들의 현재 집계 상태
+NEW_STATES_SQL = f'''
+    SELECT e.event_id, {audit.columns('e.')} FROM record_events e JOIN (
+        SELECT student_id, MAX(event_id) AS event_id FROM record_events
+        WHERE event_id > %s AND event_id <= %s GROUP BY student_id
+    ) latest ON latest.event_id = e.event_id
+'''
+
+OLD_STATES_SQL = f'''
+    SELECT e.event_id, {audit.columns('e.')} FROM report_students r
+    JOIN record_events e ON e.event_id = r.event_id
+    WHERE r.student_id IN (SELECT student_id FROM record_events WHERE event_id > %s AND event_id <= %s)
+'''
+
+
+def _cutoff(lag_seconds):
+    return audit.to_utc(datetime.now(timezone.utc) - timedelta(seconds=lag_seconds))
+
+
+# 아래 함수들은 SQL 저장소(SQLite / 서버) 공통 구현이다.
+# execute(conn, sql, params) 는 %s 자리표시자 SQL 을 실행하고 커서를 돌려주며,
+# executemany(conn, sql, rows) 는 같은 SQL 을 여러 행에 실행한다.
+
+# 집계에 반영할 새 이벤트가 있는지 (읽기 연결에서 확인해 쓰기 트랜잭션을 아낌)
+def pending(execute, conn, lag_seconds=0):
+    return execute(conn, '''
+        SELECT 1 FROM record_events
+        WHERE event_id > (SELECT last_event_id FROM report_state WHERE id = 1) AND recorded_at <= %s
+        LIMIT 1
+    ''', (_cutoff(lag_seconds),)).fetchone() is not None
+
+
+# 새 이벤트를 집계에 반영 (쓰기 트랜잭션 안에서 호출, 반영할 이벤트가 없으면 None)
+# lag_seconds: 이보다 최근 이벤트는 다음 갱신으로 미룸 (core.audit.take_snapshot 과 같은 이유)
+def refresh(execute, executemany, conn, lag_seconds=0):
+    # 갱신 상태 행을 먼저 잠가 동시에 실행된 갱신이 같은 이벤트를 두 번 더하지 않게 한다
+    watermark = execute(
+        conn, 'UPDATE report_state SET last_event_id = last_event_id WHERE id = 1 RETURNING last_event_id'
+    ).fetchone()[0]
+    last_event_id = execute(
+        conn, 'SELECT MAX(event_id) FROM record_events WHERE event_id > %s AND recorded_at <= %s',
+        (watermark, _cutoff(lag_seconds))
+    ).fetchone()[0]
+    if not last_event_id:
+        return None
+
+    new = [audit.event_row(row) for row in execute(conn, NEW_STATES_SQL, (watermark, last_event_id)).fetchall()]
+    old = [audit.event_row(row) for row in execute(conn, OLD_STATES_SQL, (watermark, last_event_id)).fetchall()]
+    for name, rows in deltas(old, new).items():
+        table, keys, values = TABLES[name]
+        executemany(conn, _upsert_sql(table, keys, values), rows)
+        execute(conn, f'DELETE FROM {table} WHERE students = 0')
+    executemany(conn, '''
+        INSERT INTO report_students (student_id, event_id) VALUES (%s, %s)
+        ON CONFLICT (student_id) DO UPDATE SET event_id = excluded.event_id
+    ''', [(e['student_id'], e['event_id']) for e in new])
+    refreshed_at = audit.now()
+    execute(conn, 'UPDATE report_state SET last_event_id = %s, refreshed_at = %s WHERE id = 1',
+            (last_event_id, refreshed_at))
+    return {'last_event_id': last_event_id, 'events': last_event_id - watermark, 'students': len(new),
+            'refreshed_at': refreshed_at}
+
+
+# 보고서 행 읽기 {'gpa', 'courses', 'transitions': [(키..., 값...)], 'last_event_id', 'refreshed_at'}
+def load(execute, conn):
+    reports = {}
+    for name, (table, keys, values) in TABLES.items():
+        rows = execute(conn, f"SELECT {', '.join(keys + values)} FROM {table} WHERE students != 0").fetchall()
+        reports[name] = [(bool(row[0]), *row[1:]) for row in rows]
+    reports['last_event_id'], reports['refreshed_at'] = execute(
+        conn, 'SELECT last_event_id, refreshed_at FROM report_state WHERE id = 1'
+    ).fetchone()
+    return reports
+
+
+# 보고서 행 → 화면 / 명령행용 피벗 (pandas DataFrame)
+# submitted_only 이면 제출 완료자만, majors / courses 는 행 / 열 순서 (목록에 없는 항목은 뒤에)
+def _ordered(labels, preferred):
+    present = set(labels)
+    return [label for label in preferred if label in present] + sorted(present - set(preferred))
+
+
+def _frame(reports, name, submitted_only):
+    import pandas as pd
+
+    table, keys, values = TABLES[name]
+    frame = pd.DataFrame(reports[name], columns=keys + values)
+    if submitted_only:
+        frame = frame[frame['submitted'].astype(bool)]
+    return frame
+
+
+def gpa_pivot(reports, rank, majors, submitted_only=True):
+    frame = _frame(reports, 'gpa', submitted_only)
+    frame = frame[frame['rank'] == rank]
+    pivot = frame.pivot_table(index='major', columns='bin', values='students', aggfunc='sum', fill_value=0)
+    pivot = pivot.reindex(index=_ordered(frame['major'], majors), columns=range(len(GPA_BINS)), fill_value=0)
+    totals = frame.groupby('major')[['students', 'gpa_sum']].sum().reindex(pivot.index)
+    pivot.columns = GPA_BINS
+    pivot['인원'] = totals['students']
+    pivot['평균학점'] = (totals['gpa_sum'] / totals['students']).round(2)
+    return pivot.rename_axis('전공')
+
+
+def course_pivot(reports, rank, majors, courses, submitted_only=True):
+    frame = _frame(reports, 'courses', submitted_only)
+    if rank is not None:
+        frame = frame[frame['rank'] == rank]
+    pivot = frame.pivot_table(index='course', columns='major', values='students', aggfunc='sum', fill_value=0)
+    return pivot.reindex(index=_ordered(frame['course'], courses), columns=_ordered(frame['major'], majors),
+                         fill_value=0).rename_axis(index='이수 교과목', columns='지망 전공')
+
+
+def transition_pivot(reports, rank, majors, submitted_only=True):
+    frame = _frame(reports, 'transitions', submitted_only)
+    frame = frame[frame['rank'] == rank]
+    pivot = frame.pivot_table(index='from_major', columns='to_major', values='students', aggfunc='sum', fill_value=0)
+    return pivot.reindex(index=_ordered(frame['from_major'], majors), columns=_ordered(frame['to_major'], majors),
+                         fill_value=0).rename_axis(index=f'{rank}지망', columns=f'{rank + 1}지망')
+
+
+# 관리자 보고서 화면 (열 때마다 새 이벤트만 반영)
+def render_reports(store, majors, courses, key='reports'):
+    with metrics.timer('reporting.refresh'):
+        refreshed = store.refresh_reports()
+    with metrics.timer('reporting.load'):
+        reports = store.load_reports()
+    note = f" · 이번에 학생 {refreshed['students']}명 반영" if refreshed else ''
+    st.caption(f"변경 이력 {reports['last_event_id']}번 이벤트까지 반영 "
+               f"({audit.to_local(reports['refreshed_at']) or '-'}){note}")
+
+    population = st.radio("대상", ['제출 완료자', '전체 학생'], horizontal=True, key=f'{key}_population')
+    submitted_only = population == '제출 완료자'
+
+    tab1, tab2, tab3 = st.tabs(["학점 분포", "이수 교과목 × 지망 전공", "지망 이동"])
+    with tab1:
+        rank = st.selectbox("지망 순위", RANKS, format_func=lambda r: f"{r}지망", key=f'{key}_gpa_rank')
+        st.dataframe(gpa_pivot(reports, rank, majors, submitted_only), use_container_width=True)
+    with tab2:
+        rank = st.selectbox("지망 순위", [None, *RANKS], format_func=lambda r: '전체 순위' if r is None else f"{r}지망",
+                            key=f'{key}_course_rank')
+        st.dataframe(course_pivot(reports, rank, majors, courses, submitted_only), use_container_width=True)
+    with tab3:
+        rank = st.selectbox("기준 순위", RANKS[:-1], format_func=lambda r: f"{r}지망 → {r + 1}지망",
+                            key=f'{key}_transition_rank')
+        st.dataframe(transition_pivot(reports, rank, majors, submitted_only), use_container_width=True)
+
+
+# 명령행 갱신 / 출력
+#   python -m core.reporting
+#   python -m core.reporting --rank 2 --all
+def main(argv=None):
+    from core import catalog, storage
+
+    parser = argparse.ArgumentParser(description='신청 현황 보고서 갱신 / 출력')
+    parser.add_argument('--db', default=storage.store_url(), help='저장소 주소 (기본: 환경변수 STUDENT_DB_URL)')
+    parser.add_argument('--rank', type=int, default=1, choices=RANKS[:-1], help='지망 순위 (기본: 1지망)')
+    parser.add_argument('--all', action='store_true', help='미제출 학생 포함')
+    args = parser.parse_args(argv)
+
+    store = storage.get_store(args.db)
+    refreshed = store.refresh_reports()
+    if refreshed:
+        print(f"이벤트 {refreshed['events']}건 (학생 {refreshed['students']}명) 반영")
+    reports = store.load_reports()
+    listing = catalog.CatalogCache(store).snapshot()
+    submitted_only = not args.all
+    print(f'\n[학점 분포 - {args.rank}지망]')
+    print(gpa_pivot(reports, args.rank, listing.majors, submitted_only).to_string())
+    print(f'\n[이수 교과목 × {args.rank}지망 전공]')
+    print(course_pivot(reports, args.rank, listing.majors, listing.courses, submitted_only).to_string())
+    print(f'\n[{args.rank}지망 → {args.rank + 1}지망]')
+    print(transition_pivot(reports, args.rank, listing.majors, submitted_only).to_string())
+
+
+if __name__ == '__main__':
+    main()
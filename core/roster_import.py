@@ -0,0 +1,325 @@
+import argparse
+import csv
+import io
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import streamlit as st
+
+from core import metrics, passwords, storage
+
+# 한 번에 읽어 검증 / 기록하는 행 수 (트랜잭션 하나)
+CHUNK_ROWS = 5000
+
+# 해시 작업 하나에 넣는 비밀번호 수
+HASH_BATCH = 256
+
+# 이보다 적으면 프로세스 풀 없이 현재 프로세스에서 해시
+POOL_THRESHOLD = 200
+
+# 명단 헤더 (한글 / 영문 모두 허용, 공백과 대소문자 무시)
+HEADERS = {
+    'student_id': ('학번', 'studentid', 'student_id', 'id'),
+    'name': ('이름', '성명', 'name'),
+    'password': ('비밀번호', '초기비밀번호', 'password'),
+    'password_hash': ('비밀번호해시', 'password_hash', 'passwordhash'),
+    'gpa': ('1학기학점', '학점', 'gpa', 'semester1_gpa'),
+    'courses': ('이수교과목', '이수과목', 'completed_courses', 'courses'),
+}
+
+MAX_GPA = 4.3
+
+# 업로드 / 명령행에서 받는 형식: 확장자 → 형식
+FORMATS = {'csv': 'csv', 'xlsx': 'xlsx'}
+
+
+# 명단 파일을 (행 번호, {필드: 값}) 묶음으로 읽기
+# CSV 는 utf-8 (BOM 허용), XLSX 는 openpyxl 읽기 전용 모드로 행 단위 스트리밍
+def iter_chunks(source, fmt, chunk_rows=CHUNK_ROWS):
+    rows = _iter_xlsx(source) if fmt == 'xlsx' else _iter_csv(source)
+    header = next(rows, None)
+    if header is None:
+        return
+    fields = _map_header(header)
+
+    chunk = []
+    for number, values in enumerate(rows, start=2):
+        if not any(value not in (None, '') for value in values):
+            continue
+        row = {field: values[i] if i < len(values) else None for field, i in fields.items()}
+        chunk.append((number, row))
+        if len(chunk) >= chunk_rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _iter_csv(source):
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding='utf-8-sig', newline='') as f:
+            yield from csv.reader(f)
+    else:
+        text = io.TextIOWrapper(source, encoding='utf-8-sig', newline='')
+        try:
+            yield from csv.reader(text)
+        finally:
+            text.detach()
+
+
+def _iter_xlsx(source):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def _map_header(header):
+    aliases = {alias: field for field, names in HEADERS.items() for alias in names}
+    fields = {}
+    for i, title in enumerate(header):
+        key = str(title or '').strip().replace(' ', '').lower()
+        field = aliases.get(key)
+        if field and field not in fields:
+            fields[field] = i
+    missing = [HEADERS[field][0] for field in ('student_id', 'name') if field not in fields]
+    if 'password' not in fields and 'password_hash' not in fields:
+        missing.append(HEADERS['password'][0])
+    if missing:
+        raise ValueError(f"명단에 필수 열이 없습니다: {', '.join(missing)}")
+    return fields
+
+
+def _text(value):
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+# 행 검증 → (정리된 행, 오류 사유)
+def _clean(row, courses=None):
+    student_id = _text(row.get('student_id'))
+    name = _text(row.get('name'))
+    password = _text(row.get('password'))
+    password_hash = _text(row.get('password_hash'))
+    if not student_id or not name:
+        return None, '학번 / 이름 누락'
+    if not password and not password_hash:
+        return None, '비밀번호 누락'
+    if not password and not passwords.is_supported_hash(password_hash):
+        return None, '지원하지 않는 비밀번호 해시 형식'
+
+    gpa = row.get('gpa')
+    if gpa in (None, ''):
+        gpa = None
+    else:
+        try:
+            gpa = float(gpa)
+        except (TypeError, ValueError):
+            return None, f'학점 형식 오류: {gpa}'
+        if not 0 <= gpa <= MAX_GPA:
+            return None, f'학점 범위 오류: {gpa}'
+
+    completed = []
+    for course in _text(row.get('courses')).replace(';', ',').split(','):
+        course = course.strip()
+        if course and course not in completed:
+            completed.append(course)
+    unknown = [course for course in completed if courses is not None and course not in courses]
+    if unknown:
+        return None, f"알 수 없는 교과목: {', '.join(unknown)}"
+
+    return {
+        'student_id': student_id,
+        'name': name,
+        'password': password,
+        'password_hash': password_hash,
+        'gpa': gpa,
+        'courses': completed,
+    }, None
+
+
+# 프로세스 풀 작업: 비밀번호 묶음 해시
+def _hash_batch(batch, full_cost):
+    hasher = None if full_cost else passwords.import_hasher()
+    return [passwords.hash_password(password, hasher) for password in batch]
+
+
+class _Hasher:
+    def __init__(self, workers, full_cost):
+        self.workers = workers or os.cpu_count() or 1
+        self.full_cost = full_cost
+        self.pool = None
+
+    def hash(self, plain):
+        if len(plain) < POOL_THRESHOLD or self.workers == 1:
+            return _hash_batch(plain, self.full_cost)
+        if self.pool is None:
+            # Streamlit 서버는 멀티스레드이므로 fork 대신 spawn 사용
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        batches = [plain[i:i + HASH_BATCH] for i in range(0, len(plain), HASH_BATCH)]
+        hashed = []
+        for result in self.pool.map(_hash_batch, batches, [self.full_cost] * len(batches)):
+            hashed.extend(result)
+        return hashed
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+
+# 명단 일괄 등록 (store: core.storage 저장소, courses: 허용 교과목, None 이면 검사하지 않음)
+# 반환값: {'rows', 'imported', 'conflicts': [(행 번호, 학번, 사유)], 'seconds'}
+# 이미 등록된 학번 / 파일 안에서 중복된 학번 / 잘못된 행은 건너뛰고 conflicts 에 기록한다.
+@metrics.timed('roster_import.import_roster')
+def import_roster(store, source, fmt, courses=None, chunk_rows=CHUNK_ROWS,
+                  workers=None, full_cost=False, progress=None):
+    started = time.perf_counter()
+    result = {'rows': 0, 'imported': 0, 'conflicts': [], 'seconds': 0.0}
+    seen = set()
+    hasher = _Hasher(workers, full_cost)
+
+    try:
+        for chunk in iter_chunks(source, fmt, chunk_rows):
+            result['rows'] += len(chunk)
+            cleaned = []
+            for number, row in chunk:
+                record, error = _clean(row, courses)
+                if record is not None and record['student_id'] in seen:
+                    error = '파일 안에서 학번 중복'
+                if error:
+                    result['conflicts'].append((number, _text(row.get('student_id')), error))
+                    continue
+                seen.add(record['student_id'])
+                cleaned.append((number, record))
+
+            # 이미 등록된 학번은 해시 전에 걸러냄 (기록 직전에 한 번 더 확인)
+            with store.connect() as conn:
+                existing = store.existing_ids(conn, [record['student_id'] for _, record in cleaned])
+            for number, record in cleaned:
+                if record['student_id'] in existing:
+                    result['conflicts'].append((number, record['student_id'], '이미 등록된 학번'))
+            cleaned = [(number, record) for number, record in cleaned if record['student_id'] not in existing]
+
+            plain = [record for _, record in cleaned if record['password']]
+            for record, hashed in zip(plain, hasher.hash([record['password'] for record in plain])):
+                record['password_hash'] = hashed
+
+            with store.transaction() as conn:
+                existing = store.existing_ids(conn, [record['student_id'] for _, record in cleaned])
+                for number, record in cleaned:
+                    if record['student_id'] in existing:
+                        result['conflicts'].append((number, record['student_id'], '이미 등록된 학번'))
+                records = [record for _, record in cleaned if record['student_id'] not in existing]
+
+                store.create_accounts(conn, records)
+            result['imported'] += len(records)
+            if progress:
+                progress(result['rows'], result['imported'])
+    finally:
+        hasher.close()
+
+    result['conflicts'].sort()
+    result['seconds'] = time.perf_counter() - started
+    return result
+
+
+# 충돌 행 보고서 (CSV 바이트)
+def conflict_report(conflicts):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(['행', '학번', '사유'])
+    writer.writerows(conflicts)
+    return out.getvalue().encode('utf-8-sig')
+
+
+def detect_format(filename):
+    return FORMATS.get(os.path.splitext(filename)[1].lstrip('.').lower())
+
+
+# 관리자 명단 업로드
+def render_upload(store, courses, key='roster_import'):
+    uploaded = st.file_uploader(
+        "학생 명단 파일 (CSV / XLSX) — 학번, 이름, 비밀번호, 1학기학점, 이수교과목",
+        type=list(FORMATS),
+        key=f'{key}_file',
+    )
+    if uploaded is not None and st.button("📥 명단 등록", key=f'{key}_run'):
+        progress_text = st.empty()
+        try:
+            result = import_roster(
+                store, uploaded, detect_format(uploaded.name), courses,
+                progress=lambda rows, imported: progress_text.caption(f"{rows}행 처리, {imported}명 등록"),
+            )
+        except ValueError as e:
+            st.error(str(e))
+            return
+        st.session_state[f'{key}_result'] = result
+
+    result = st.session_state.get(f'{key}_result')
+    if result:
+        st.success(
+            f"{result['rows']}행 중 {result['imported']}명 등록 ({result['seconds']:.1f}초), "
+            f"건너뛴 행 {len(result['conflicts'])}개"
+        )
+        if result['conflicts']:
+            st.dataframe(
+                [{'행': number, '학번': student_id, '사유': reason}
+                 for number, student_id, reason in result['conflicts'][:1000]],
+                use_container_width=True,
+                hide_index=True,
+            )
+            st.download_button(
+                "📄 건너뛴 행 보고서 (CSV)",
+                data=conflict_report(result['conflicts']),
+                file_name="명단등록_충돌.csv",
+                mime="text/csv",
+                key=f'{key}_report',
+            )
+
+
+# 명령행 일괄 등록
+#   python -m core.roster_import 명단.xlsx
+#   python -m core.roster_import 명단.csv --report 충돌.csv --db sqlite:///student_major.db
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='학생 명단 일괄 등록')
+    parser.add_argument('path', help='CSV 또는 XLSX 명단 파일')
+    parser.add_argument('--db', default=storage.store_url(), help='저장소 주소 (기본: 환경변수 STUDENT_DB_URL)')
+    parser.add_argument('--report', help='건너뛴 행을 기록할 CSV 경로')
+    parser.add_argument('--workers', type=int, help='비밀번호 해시 프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--full-cost', action='store_true',
+                        help='초기 비밀번호도 기본 비용으로 해시 (기본: 낮은 비용, 첫 로그인 때 다시 해시)')
+    args = parser.parse_args(argv)
+
+    fmt = detect_format(args.path)
+    if fmt is None:
+        parser.error('CSV 또는 XLSX 파일만 등록할 수 있습니다.')
+
+    store = storage.get_store(args.db)
+    result = import_roster(
+        store, args.path, fmt, store.load_catalog()[1]['course'],
+        chunk_rows=args.chunk_rows, workers=args.workers, full_cost=args.full_cost,
+        progress=lambda rows, imported: print(f'\r{rows}행 처리, {imported}명 등록', end='', flush=True),
+    )
+    print(f"\n{result['rows']}행 중 {result['imported']}명 등록 ({result['seconds']:.1f}초), "
+          f"건너뛴 행 {len(result['conflicts'])}개")
+    for number, student_id, reason in result['conflicts'][:20]:
+        print(f'  {number}행 {student_id}: {reason}')
+    if args.report:
+        with open(args.report, 'wb') as f:
+            f.write(conflict_report(result['conflicts']))
+
+
+if __name__ == '__main__':
+    main()
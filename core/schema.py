@@ -0,0 +1,48 @@
+import os
+import threading
+
+from core import db
+
+# 이 프로세스에서 이미 최신 스키마로 확인된 데이터베이스 파일
+_ready = set()
+_lock = threading.Lock()
+
+
+# 스키마 초기화 및 마이그레이션
+# migrations 는 버전 순서대로 나열한 SQL 문 목록의 리스트이며,
+# i 번째 항목이 스키마 버전 i+1 에 해당한다.
+# 적용된 버전은 데이터베이스의 PRAGMA user_version 에 기록된다.
+def ensure_schema(path, migrations):
+    key = os.path.abspath(path)
+    if key in _ready:
+        return
+
+    with _lock:
+        if key in _ready:
+            return
+
+        migrate(path, migrations)
+        _ready.add(key)
+
+
+# 적용되지 않은 마이그레이션을 한 트랜잭션으로 실행 (프로세스 캐시 없음)
+def migrate(path, migrations):
+    target = len(migrations)
+    with db.connect(path) as conn:
+        current = conn.execute('PRAGMA user_version').fetchone()[0]
+
+    if current < target:
+        with db.transaction(path) as conn:
+            # 다른 프로세스가 먼저 적용했을 수 있으므로 잠금 후 다시 확인
+            current = conn.execute('PRAGMA user_version').fetchone()[0]
+            for version in range(current + 1, target + 1):
+                for statement in migrations[version - 1]:
+                    conn.execute(statement)
+            if current < target:
+                conn.execute(f'PRAGMA user_version = {target}')
+
+
+# 현재 데이터베이스에 기록된 스키마 버전
+def schema_version(path):
+    with db.connect(path) as conn:
+        return conn.execute('PRAGMA user_version').fetchone()[0]
@@ -0,0 +1,492 @@
+import queue
+import threading
+from contextlib import contextmanager
+
+from core import admin_grid, audit, catalog, deadline, metrics, normalized, reporting, session_record, sessions, storage
+
+# 서버 데이터베이스 저장소 (DB-API 2.0 드라이버)
+# - postgresql:// 주소는 psycopg (선택 의존성) 로 연다: pip install "psycopg[binary]"
+# - standin:///경로.db 는 같은 SQL / 트랜잭션 처리를 sqlite3 로 실행하는 로컬 대역으로,
+#   서버 없이 이 어댑터를 앱 / 부하 테스트에 그대로 연결해 볼 수 있다.
+# - SQL 은 두 데이터베이스에서 모두 동작하는 문법만 사용한다
+#   (ON CONFLICT, RETURNING, TRUE / FALSE, SAVEPOINT, NULL 일 수 있는 인자는 CAST).
+#   자리표시자는 %s 로 쓰고 qmark 드라이버(sqlite3)에서는 ? 로 바꾼다.
+# - 연결은 autocommit 으로 열고 BEGIN / COMMIT 을 직접 실행한다.
+SCHEMES = ('postgresql', 'postgres', 'standin')
+POOL_SIZE = 8
+
+# 한 번에 가져오는 학생 수 (이수 교과목 / 지망은 묶음마다 IN (...) 으로 조회)
+FETCH_ROWS = 500
+
+# 스키마 (버전 순서대로 추가, schema_version 테이블에 기록)
+# 항목은 SQL 문 또는 데이터베이스마다 다른 처리가 필요한 함수 step(store, conn)
+SCHEMA_MIGRATIONS = [
+    # v1: 학생 / 이수 교과목 / 전공 지망
+    [
+        '''
+        CREATE TABLE IF NOT EXISTS students (
+            student_id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            password TEXT NOT NULL,
+            semester1_gpa DOUBLE PRECISION,
+            is_submitted BOOLEAN NOT NULL DEFAULT FALSE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS student_courses (
+            student_id TEXT NOT NULL REFERENCES students (student_id) ON DELETE CASCADE,
+            position INTEGER NOT NULL,
+            course TEXT NOT NULL,
+            PRIMARY KEY (student_id, course)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS student_preferences (
+            student_id TEXT NOT NULL REFERENCES students (student_id) ON DELETE CASCADE,
+            rank INTEGER NOT NULL,
+            major TEXT NOT NULL,
+            PRIMARY KEY (student_id, rank)
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_students_submitted ON students (is_submitted)',
+        'CREATE INDEX IF NOT EXISTS idx_student_preferences_major ON student_preferences (major, rank, student_id)',
+    ],
+    # v2: 전공 / 이수 교과목 / 안내 문구 목록
+    catalog.catalog_migration(),
+    # v3: 신청서 변경 이력 (기존 학생은 현재 상태를 baseline 이벤트로 기록)
+    [
+        lambda store, conn: store._execute_all(conn, audit.server_tables(store.serial)),
+        lambda store, conn: store._append_all_events(conn, 'baseline'),
+    ],
+    # v4: 신청 마감 (마감 설정, 마감 처리 상태, 마감 시점 고정 테이블)
+    deadline.round_migration(),
+    # v5: 신청 현황 보고서 (변경 이력으로 증분 갱신하는 피벗 테이블)
+    reporting.report_migration(),
+    # v6: 로그인 세션 (서버 저장 세션, 토큰 서명 키)
+    sessions.session_migration(),
+]
+
+_RECORD_COLUMNS = 'student_id, name, semester1_gpa, is_submitted, created_at, updated_at, version'
+
+
+def _timestamp(value):
+    if hasattr(value, 'strftime'):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return value
+
+
+class ServerStore(storage.Store):
+    admin_queries = True
+
+    # connect: 새 DB-API 연결을 돌려주는 함수 (autocommit 모드)
+    # module: 드라이버 모듈 (IntegrityError 확인용)
+    # begin: 트랜잭션 시작 문 (sqlite3 대역은 쓰기 잠금을 먼저 잡도록 BEGIN IMMEDIATE)
+    # serial: 자동 증가 기본 키 열 정의 (변경 이력 테이블)
+    # snapshot_lag: 동시에 커밋 중인 이벤트를 스냅숏에서 빼기 위한 지연 (초)
+    # share_lock: 학생 쓰기가 마감 설정 행을 읽을 때 붙이는 잠금 (마감 처리가 끝날 때까지 대기)
+    def __init__(self, url, connect, module, paramstyle='format', begin='BEGIN', pool_size=POOL_SIZE,
+                 serial='BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY', snapshot_lag=30,
+                 share_lock=' FOR SHARE'):
+        self.url = url
+        self.module = module
+        self.paramstyle = paramstyle
+        self.begin = begin
+        self.serial = serial
+        self.snapshot_lag = snapshot_lag
+        self.share_lock = share_lock
+        self._connect = connect
+        self._idle = queue.LifoQueue(maxsize=pool_size)
+        self._slots = threading.BoundedSemaphore(pool_size)
+
+    def _sql(self, sql):
+        return sql.replace('%s', '?') if self.paramstyle == 'qmark' else sql
+
+    def _execute(self, conn, sql, params=()):
+        cursor = conn.cursor()
+        cursor.execute(self._sql(sql), params)
+        return cursor
+
+    def _execute_all(self, conn, statements):
+        for statement in statements:
+            self._execute(conn, statement)
+
+    def _executemany(self, conn, sql, rows):
+        if rows:
+            conn.cursor().executemany(self._sql(sql), rows)
+
+    @contextmanager
+    def _connection(self):
+        with metrics.timer('server_store.pool_wait'):
+            self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            broken = False
+            try:
+                yield conn
+            except self.module.Error:
+                broken = True
+                raise
+            finally:
+                if broken:
+                    conn.close()
+                else:
+                    self._idle.put_nowait(conn)
+        finally:
+            self._slots.release()
+
+    def connect(self):
+        return self._connection()
+
+    @contextmanager
+    def transaction(self):
+        with metrics.timer('server_store.transaction'), self._connection() as conn:
+            self._execute(conn, self.begin)
+            try:
+                yield conn
+            except BaseException:
+                self._execute(conn, 'ROLLBACK')
+                raise
+            self._execute(conn, 'COMMIT')
+
+    @contextmanager
+    def savepoint(self, conn):
+        self._execute(conn, 'SAVEPOINT record')
+        try:
+            yield
+        except BaseException:
+            self._execute(conn, 'ROLLBACK TO SAVEPOINT record')
+            raise
+        finally:
+            self._execute(conn, 'RELEASE SAVEPOINT record')
+
+    def init(self):
+        with self.transaction() as conn:
+            self._execute(conn, 'CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)')
+            row = self._execute(conn, 'SELECT MAX(version) FROM schema_version').fetchone()
+            current = row[0] or 0
+            for version in range(current + 1, len(SCHEMA_MIGRATIONS) + 1):
+                for statement in SCHEMA_MIGRATIONS[version - 1]:
+                    if callable(statement):
+                        statement(self, conn)
+                    else:
+                        self._execute(conn, statement)
+                self._execute(conn, 'INSERT INTO schema_version (version) VALUES (%s)', (version,))
+
+    def create_accounts(self, conn, accounts):
+        try:
+            self._executemany(conn, '''
+                INSERT INTO students (student_id, name, password, semester1_gpa, is_submitted, created_at, updated_at)
+                VALUES (%s, %s, %s, %s, %s, COALESCE(%s, CURRENT_TIMESTAMP), COALESCE(%s, CURRENT_TIMESTAMP))
+            ''', [
+                (a['student_id'], a['name'], a['password_hash'], a.get('gpa'), bool(a.get('is_submitted')),
+                 a.get('created_at'), a.get('updated_at'))
+                for a in accounts
+            ])
+        except self.module.IntegrityError as e:
+            raise storage.DuplicateStudentError(str(e)) from e
+        self._replace_children(conn, accounts, delete=False)
+        self._append_events(conn, [a['student_id'] for a in accounts], 'register')
+
+    # 학생들의 현재 상태를 변경 이력에 추가 (같은 트랜잭션, 기록 시각 기본값은 현재)
+    def _append_events(self, conn, student_ids, kind, recorded_at=None):
+        rows = self._in(conn, f'SELECT {_RECORD_COLUMNS} FROM students WHERE student_id IN ({{ids}})', student_ids)
+        recorded_at = recorded_at or audit.now()
+        self._executemany(
+            conn,
+            f"INSERT INTO record_events ({audit.columns()}) VALUES ({', '.join(['%s'] * len(audit.EVENT_COLUMNS))})",
+            [audit.event_values(kind, recorded_at, record) for record in self._records(conn, rows)]
+        )
+
+    def _append_all_events(self, conn, kind):
+        ids = [row[0] for row in self._execute(conn, 'SELECT student_id FROM students ORDER BY student_id').fetchall()]
+        for i in range(0, len(ids), FETCH_ROWS):
+            self._append_events(conn, ids[i:i + FETCH_ROWS], kind)
+
+    def _replace_children(self, conn, accounts, delete=True):
+        if delete:
+            ids = [(a['student_id'],) for a in accounts]
+            self._executemany(conn, 'DELETE FROM student_courses WHERE student_id = %s', ids)
+            self._executemany(conn, 'DELETE FROM student_preferences WHERE student_id = %s', ids)
+        self._executemany(
+            conn,
+            'INSERT INTO student_courses (student_id, position, course) VALUES (%s, %s, %s) ON CONFLICT DO NOTHING',
+            [(a['student_id'], position, course)
+             for a in accounts for position, course in enumerate(a.get('courses') or [], start=1)]
+        )
+        self._executemany(
+            conn,
+            'INSERT INTO student_preferences (student_id, rank, major) VALUES (%s, %s, %s)',
+            [(a['student_id'], rank, major)
+             for a in accounts for rank, major in enumerate(a.get('preferences') or [], start=1) if major]
+        )
+
+    def _in(self, conn, sql, student_ids):
+        rows = []
+        for i in range(0, len(student_ids), storage.LOOKUP_BATCH):
+            batch = list(student_ids[i:i + storage.LOOKUP_BATCH])
+            placeholders = ', '.join(['%s'] * len(batch))
+            rows.extend(self._execute(conn, sql.format(ids=placeholders), batch).fetchall())
+        return rows
+
+    def existing_ids(self, conn, student_ids):
+        return {row[0] for row in self._in(
+            conn, 'SELECT student_id FROM students WHERE student_id IN ({ids})', student_ids
+        )}
+
+    def get_account(self, student_id):
+        with self.connect() as conn:
+            row = self._execute(
+                conn, 'SELECT name, password FROM students WHERE student_id = %s', (student_id,)
+            ).fetchone()
+        return tuple(row) if row else None
+
+    def replace_password_hash(self, student_id, old_hash, new_hash):
+        with self.transaction() as conn:
+            self._execute(
+                conn, 'UPDATE students SET password = %s WHERE student_id = %s AND password = %s',
+                (new_hash, student_id, old_hash)
+            )
+
+    # 학생 행 묶음에 이수 교과목 / 지망을 붙여 Record 로 변환
+    def _records(self, conn, rows):
+        ids = [row[0] for row in rows]
+        courses = {student_id: [] for student_id in ids}
+        preferences = {student_id: [None] * normalized.PREFERENCE_RANKS for student_id in ids}
+        for student_id, course in self._in(
+            conn, 'SELECT student_id, course FROM student_courses WHERE student_id IN ({ids}) '
+                  'ORDER BY student_id, position', ids
+        ):
+            courses[student_id].append(course)
+        for student_id, rank, major in self._in(
+            conn, 'SELECT student_id, rank, major FROM student_preferences WHERE student_id IN ({ids})', ids
+        ):
+            if 1 <= rank <= normalized.PREFERENCE_RANKS:
+                preferences[student_id][rank - 1] = major
+        return [
+            storage.Record(
+                student_id, name, gpa, courses[student_id], preferences[student_id],
+                bool(is_submitted), _timestamp(created_at), _timestamp(updated_at), version,
+            )
+            for student_id, name, gpa, is_submitted, created_at, updated_at, version in rows
+        ]
+
+    def load_record(self, student_id):
+        with self.connect() as conn:
+            row = self._execute(
+                conn, f'SELECT {_RECORD_COLUMNS} FROM students WHERE student_id = %s', (student_id,)
+            ).fetchone()
+            return self._records(conn, [row])[0] if row else None
+
+    def _exists(self, conn, student_id):
+        return self._execute(
+            conn, 'SELECT 1 FROM students WHERE student_id = %s', (student_id,)
+        ).fetchone() is not None
+
+    def write_record(self, conn, student_id, gpa, courses, preferences, expected_version=None):
+        row = self._execute(conn, '''
+            UPDATE students SET
+                semester1_gpa = %s,
+                updated_at = CURRENT_TIMESTAMP,
+                version = version + 1
+            WHERE student_id = %s AND NOT is_submitted AND (CAST(%s AS INTEGER) IS NULL OR version = %s)
+            RETURNING version
+        ''', (gpa, student_id, expected_version, expected_version)).fetchone()
+        if row:
+            self._replace_children(conn, [{'student_id': student_id, 'courses': courses, 'preferences': preferences}])
+            self._append_events(conn, [student_id], 'save')
+            return row[0]
+        if expected_version is not None and self._exists(conn, student_id):
+            raise session_record.StaleRecordError(student_id)
+        return None
+
+    def submit(self, conn, student_id, expected_version=None):
+        row = self._execute(conn, '''
+            UPDATE students SET
+                is_submitted = TRUE,
+                updated_at = CURRENT_TIMESTAMP,
+                version = version + 1
+            WHERE student_id = %s AND (CAST(%s AS INTEGER) IS NULL OR version = %s)
+            RETURNING version
+        ''', (student_id, expected_version, expected_version)).fetchone()
+        if row:
+            self._append_events(conn, [student_id], 'submit')
+            return row[0]
+        if expected_version is not None and self._exists(conn, student_id):
+            raise session_record.StaleRecordError(student_id)
+        return None
+
+    def _where(self, submitted):
+        return ('', ()) if submitted is None else ('WHERE is_submitted = %s', (bool(submitted),))
+
+    def iter_records(self, submitted=None):
+        where, params = self._where(submitted)
+        with self.connect() as conn:
+            rows = self._execute(
+                conn, f'SELECT {_RECORD_COLUMNS} FROM students {where} ORDER BY student_id', params
+            ).fetchall()
+            for i in range(0, len(rows), FETCH_ROWS):
+                yield from self._records(conn, rows[i:i + FETCH_ROWS])
+
+    def count_records(self, submitted=None):
+        where, params = self._where(submitted)
+        with self.connect() as conn:
+            return self._execute(conn, f'SELECT COUNT(*) FROM students {where}', params).fetchone()[0]
+
+    def counters(self):
+        with self.connect() as conn:
+            total, submitted = self._execute(
+                conn, 'SELECT COUNT(*), COUNT(CASE WHEN is_submitted THEN 1 END) FROM students'
+            ).fetchone()
+        return {'total': total, 'submitted': submitted, 'pending': total - submitted}
+
+    def major_counts(self, rank=1):
+        with self.connect() as conn:
+            rows = self._execute(conn, '''
+                SELECT major, COUNT(*) FROM student_preferences WHERE rank = %s
+                GROUP BY major ORDER BY COUNT(*) DESC, major
+            ''', (rank,)).fetchall()
+        return dict(rows)
+
+    def count_grid_rows(self, grid, filters):
+        with self.connect() as conn:
+            return admin_grid.count_rows(self._execute, conn, grid, filters)
+
+    def fetch_grid_page(self, grid, filters, sort_by, descending=False, page=1, page_size=admin_grid.PAGE_SIZE):
+        with self.connect() as conn:
+            return admin_grid.fetch_page(self._execute, conn, grid, filters, sort_by, descending, page, page_size)
+
+    def count_applicants(self, frozen=False):
+        with self.connect() as conn:
+            return admin_grid.count_applicants(self._execute, conn, frozen)
+
+    def load_applicants(self, frozen=False):
+        with self.connect() as conn:
+            return admin_grid.applicant_rows(self._execute, conn, frozen)
+
+    def catalog_version(self):
+        with self.connect() as conn:
+            return self._execute(conn, 'SELECT version FROM catalog_version WHERE id = 1').fetchone()[0]
+
+    def load_catalog(self):
+        with self.connect() as conn:
+            version = self._execute(conn, 'SELECT version FROM catalog_version WHERE id = 1').fetchone()[0]
+            rows = self._execute(conn, 'SELECT kind, label FROM catalog_items ORDER BY kind, position').fetchall()
+        return version, catalog.group_items(rows)
+
+    def write_catalog(self, conn, items, expected_version=None):
+        row = self._execute(conn, '''
+            UPDATE catalog_version SET version = version + 1
+            WHERE id = 1 AND (CAST(%s AS INTEGER) IS NULL OR version = %s)
+            RETURNING version
+        ''', (expected_version, expected_version)).fetchone()
+        if row is None:
+            raise catalog.StaleCatalogError(expected_version)
+        self._executemany(conn, 'DELETE FROM catalog_items WHERE kind = %s', [(kind,) for kind in items])
+        self._executemany(
+            conn,
+            'INSERT INTO catalog_items (kind, position, label) VALUES (%s, %s, %s)',
+            [(kind, position, label) for kind, labels in items.items() for position, label in enumerate(labels, start=1)]
+        )
+        return row[0]
+
+    def record_history(self, student_id):
+        with self.connect() as conn:
+            return audit.record_history(self._execute, conn, student_id)
+
+    def record_at(self, student_id, at):
+        with self.connect() as conn:
+            return audit.record_at(self._execute, conn, student_id, at)
+
+    def cohort_at(self, at):
+        with self.connect() as conn:
+            return audit.cohort_at(self._execute, conn, at)
+
+    def audit_status(self):
+        with self.connect() as conn:
+            return audit.audit_status(self._execute, conn)
+
+    def take_snapshot(self):
+        with self.transaction() as conn:
+            return audit.take_snapshot(self._execute, conn, self.snapshot_lag)
+
+    def round_state(self):
+        with self.connect() as conn:
+            return deadline.read_round(self._execute, conn)
+
+    def lock_round(self, conn):
+        return deadline.read_round(self._execute, conn, self.share_lock)
+
+    def set_deadline(self, conn, deadline_at, policy):
+        deadline.set_deadline(self._execute, conn, deadline_at, policy)
+
+    # 마감 설정 행을 먼저 갱신하므로 공유 잠금으로 읽은 학생 쓰기가 모두 끝난 뒤에 진행된다
+    def freeze_round(self, conn, policy=None):
+        return deadline.freeze(self._execute, conn, self._append_events, policy)
+
+    # snapshot_lag 보다 최근 이벤트는 아직 커밋 중일 수 있어 다음 갱신으로 미룬다
+    def refresh_reports(self):
+        with self.connect() as conn:
+            if not reporting.pending(self._execute, conn, self.snapshot_lag):
+                return None
+        with self.transaction() as conn:
+            return reporting.refresh(self._execute, self._executemany, conn, self.snapshot_lag)
+
+    def load_reports(self):
+        with self.connect() as conn:
+            return reporting.load(self._execute, conn)
+
+    def session_secret(self, candidate):
+        with self.transaction() as conn:
+            return sessions.session_secret(self._execute, conn, candidate)
+
+    def create_session(self, key, student_id, name, role, expires_at):
+        with self.transaction() as conn:
+            sessions.create_session(self._execute, conn, key, student_id, name, role, expires_at)
+
+    def load_session(self, key):
+        with self.connect() as conn:
+            return sessions.load_session(self._execute, conn, key)
+
+    def extend_session(self, key, expires_at):
+        with self.transaction() as conn:
+            sessions.extend_session(self._execute, conn, key, expires_at)
+
+    def delete_session(self, key):
+        with self.transaction() as conn:
+            sessions.delete_session(self._execute, conn, key)
+
+    def sweep_sessions(self, now, limit):
+        with self.transaction() as conn:
+            return sessions.sweep_sessions(self._execute, conn, now, limit)
+
+
+# postgresql:// (psycopg 3) 또는 standin:/// (sqlite3 로컬 대역)
+def open_server_store(url):
+    scheme, _, rest = url.partition('://')
+    if scheme == 'standin':
+        import sqlite3
+
+        path = rest[1:] if rest.startswith('/') else rest
+
+        def connect():
+            conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False, timeout=5)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA foreign_keys=ON')
+            return conn
+
+        return ServerStore(url, connect, sqlite3, paramstyle='qmark', begin='BEGIN IMMEDIATE',
+                           serial='INTEGER PRIMARY KEY AUTOINCREMENT', snapshot_lag=0, share_lock='')
+
+    try:
+        import psycopg
+    except ImportError as e:
+        raise RuntimeError('PostgreSQL 저장소를 쓰려면 psycopg 를 설치해야 합니다: pip install "psycopg[binary]"') from e
+
+    # 저장 시각은 SQLite 와 같이 UTC 로 기록
+    return ServerStore(url, lambda: psycopg.connect(url, autocommit=True, options='-c timezone=UTC'), psycopg)
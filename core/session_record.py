@@ -0,0 +1,39 @@
+import streamlit as st
+
+from core import metrics
+
+# 세션별 학생 신청 레코드 캐시
+# - 학생 화면은 입력값이 바뀔 때마다 다시 실행되므로 레코드를 st.session_state 에 두고
+#   같은 학생이면 DB 대신 메모리에서 읽는다.
+# - 저장 / 제출 함수가 쓰기 후 invalidate() 를 호출하므로 다음 실행에서 한 번만 다시 읽는다.
+# - 레코드에는 version 이 들어 있어, 쓰기 시 expected_version 으로 넘기면
+#   다른 세션이 먼저 바꾼 경우 StaleRecordError 로 감지된다.
+SESSION_KEY = '_student_record'
+
+
+# 다른 세션(다른 탭 / 기기)이 먼저 레코드를 바꾼 경우
+class StaleRecordError(Exception):
+    pass
+
+
+# 캐시된 레코드 반환 (없거나 다른 학생이면 loader 로 읽어 저장)
+def load(student_id, loader):
+    cached = st.session_state.get(SESSION_KEY)
+    if cached is not None and cached[0] == student_id:
+        metrics.count('session_record.hit')
+        return cached[1]
+
+    metrics.count('session_record.miss')
+    record = loader(student_id)
+    st.session_state[SESSION_KEY] = (student_id, record)
+    return record
+
+
+# 아직 DB 에 반영되지 않은 내용(임시저장 대기 중)으로 캐시 갱신
+def store(student_id, record):
+    st.session_state[SESSION_KEY] = (student_id, record)
+
+
+# 쓰기 후 / 로그아웃 시 캐시 무효화
+def invalidate():
+    st.session_state.pop(SESSION_KEY, None)
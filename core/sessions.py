@@ -0,0 +1,256 @@
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import streamlit as st
+
+from core import audit, metrics
+
+# 로그인 세션 (서버 저장)
+# - 로그인하면 무작위 세션 번호를 만들어 login_sessions 테이블에 학번 / 이름 / 역할 / 만료시각과 함께 저장하고,
+#   브라우저에는 '<세션 번호>.<서명>' 토큰을 주소의 ?session= 값과 st.session_state 에 남긴다.
+# - 다시 접속하거나 작업 프로세스가 재시작되어 st.session_state 가 비어도 주소의 토큰으로 이어서 로그인된다.
+#   확인은 세션 테이블만 읽으며 (학생 테이블 / 비밀번호 해시는 쓰지 않음), 프로세스 캐시에 있으면 DB 도 읽지 않는다.
+# - 테이블에는 세션 번호의 SHA-256 만 저장하므로 DB 내용만으로는 토큰을 만들 수 없다.
+# - 만료시각(유닉스 초)은 절반 이상 지났을 때 연장하고, 만료된 세션은 백그라운드 스레드가 나눠서 지운다.
+SESSION_SECRET_ENV = 'SESSION_SECRET'
+SESSION_TTL_SECONDS = 30 * 60
+QUERY_PARAM = 'session'
+MAX_CACHED_SESSIONS = 10_000
+# 캐시된 세션을 다시 확인하는 주기 (다른 프로세스에서 로그아웃한 세션을 이 시간 안에 반영)
+RECHECK_SECONDS = 60
+SWEEP_INTERVAL_SECONDS = 5 * 60
+SWEEP_BATCH = 500
+
+ROLES = ('student', 'admin')
+Session = namedtuple('Session', ['student_id', 'name', 'role', 'expires_at'])
+
+
+# 세션 테이블 (스키마 마이그레이션용 SQL 목록, SQLite 와 서버 DB 공통)
+# session_keys: 토큰 서명 키 (환경변수가 없을 때 처음 실행한 프로세스가 만들어 모든 프로세스가 같이 씀)
+def session_migration():
+    return [
+        '''
+        CREATE TABLE IF NOT EXISTS login_sessions (
+            session_key TEXT PRIMARY KEY,
+            student_id TEXT NOT NULL,
+            name TEXT,
+            role TEXT NOT NULL DEFAULT 'student',
+            created_at TEXT NOT NULL,
+            expires_at BIGINT NOT NULL
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_login_sessions_expires ON login_sessions (expires_at)',
+        '''
+        CREATE TABLE IF NOT EXISTS session_keys (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            secret TEXT NOT NULL
+        )
+        ''',
+    ]
+
+
+# 아래 함수들은 SQL 저장소(SQLite / 서버) 공통 구현이다.
+# execute(conn, sql, params) 는 %s 자리표시자 SQL 을 실행하고 커서를 돌려준다.
+
+# 저장된 서명 키 (없으면 candidate 를 저장)
+def session_secret(execute, conn, candidate):
+    execute(conn, 'INSERT INTO session_keys (id, secret) VALUES (1, %s) ON CONFLICT (id) DO NOTHING', (candidate,))
+    return execute(conn, 'SELECT secret FROM session_keys WHERE id = 1').fetchone()[0]
+
+
+def create_session(execute, conn, key, student_id, name, role, expires_at):
+    execute(conn, '''
+        INSERT INTO login_sessions (session_key, student_id, name, role, created_at, expires_at)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    ''', (key, student_id, name, role, audit.now(), expires_at))
+
+
+def load_session(execute, conn, key):
+    row = execute(conn, 'SELECT student_id, name, role, expires_at FROM login_sessions WHERE session_key = %s',
+                  (key,)).fetchone()
+    return Session(*row) if row else None
+
+
+def extend_session(execute, conn, key, expires_at):
+    execute(conn, 'UPDATE login_sessions SET expires_at = %s WHERE session_key = %s', (expires_at, key))
+
+
+def delete_session(execute, conn, key):
+    execute(conn, 'DELETE FROM login_sessions WHERE session_key = %s', (key,))
+
+
+# 만료된 세션을 최대 limit 개 삭제 (삭제한 개수)
+def sweep_sessions(execute, conn, now, limit):
+    return execute(conn, '''
+        DELETE FROM login_sessions WHERE session_key IN (
+            SELECT session_key FROM login_sessions WHERE expires_at < %s LIMIT %s
+        )
+    ''', (now, limit)).rowcount
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+# 주소에서 온 값은 아무 문자나 들어올 수 있으므로 바이트로 바꿔 다룬다
+def _bytes(text):
+    return text.encode('utf-8', 'surrogatepass')
+
+
+def _key(session_id):
+    return hashlib.sha256(_bytes(session_id)).hexdigest()
+
+
+# 세션 발급 / 확인 / 정리 (저장소마다 하나, 최근 세션은 프로세스 캐시에 보관)
+class SessionManager:
+    def __init__(self, store, ttl=SESSION_TTL_SECONDS, max_cached=MAX_CACHED_SESSIONS,
+                 recheck=RECHECK_SECONDS, sweep_interval=SWEEP_INTERVAL_SECONDS):
+        self.store = store
+        self.ttl = ttl
+        self.max_cached = max_cached
+        self.recheck = recheck
+        self.swept = 0
+        self.last_error = None
+        self._secret = (os.environ.get(SESSION_SECRET_ENV)
+                        or store.session_secret(_b64(secrets.token_bytes(32)))).encode('utf-8')
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(sweep_interval,), name='session-sweep', daemon=True)
+        self._thread.start()
+
+    def _run(self, interval):
+        while not self._stop.wait(interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                self.last_error = str(e)
+
+    def _sign(self, session_id):
+        return _b64(hmac.new(self._secret, _bytes(session_id), hashlib.sha256).digest())
+
+    def _remember(self, key, session):
+        with self._lock:
+            self._cache[key] = (session, time.monotonic())
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+
+    def _forget(self, key):
+        with self._lock:
+            self._cache.pop(key, None)
+
+    # 새 세션 → 토큰 ('<세션 번호>.<서명>')
+    def issue(self, student_id, name, role='student'):
+        if role not in ROLES:
+            raise ValueError(f'알 수 없는 역할입니다: {role}')
+        session_id = secrets.token_urlsafe(24)
+        session = Session(student_id, name, role, int(time.time()) + self.ttl)
+        self.store.create_session(_key(session_id), *session)
+        self._remember(_key(session_id), session)
+        return f'{session_id}.{self._sign(session_id)}'
+
+    # 토큰 → Session (서명이 틀렸거나 없거나 만료되었으면 None)
+    @metrics.timed('sessions.check')
+    def check(self, token):
+        session_id, _, signature = (token or '').partition('.')
+        if not session_id or not hmac.compare_digest(_bytes(signature), _bytes(self._sign(session_id))):
+            return None
+        key = _key(session_id)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached:
+                self._cache.move_to_end(key)
+        if cached and time.monotonic() - cached[1] < self.recheck:
+            session = cached[0]
+        else:
+            metrics.count('sessions.load')
+            session = self.store.load_session(key)
+            if session:
+                self._remember(key, session)
+
+        now = int(time.time())
+        if session is None or session.expires_at < now:
+            self._forget(key)
+            return None
+        if session.expires_at - now < self.ttl / 2:
+            session = session._replace(expires_at=now + self.ttl)
+            self.store.extend_session(key, session.expires_at)
+            self._remember(key, session)
+        return session
+
+    def revoke(self, token):
+        session_id = (token or '').partition('.')[0]
+        if session_id:
+            key = _key(session_id)
+            self._forget(key)
+            self.store.delete_session(key)
+
+    # 만료된 세션을 SWEEP_BATCH 개씩 나눠 삭제 (잠금을 짧게 유지, 삭제한 개수)
+    def sweep(self, batch=SWEEP_BATCH):
+        now = int(time.time())
+        with self._lock:
+            for key in [key for key, (session, _) in self._cache.items() if session.expires_at < now]:
+                del self._cache[key]
+        deleted = 0
+        with metrics.timer('sessions.sweep'):
+            while True:
+                count = self.store.sweep_sessions(now, batch)
+                deleted += count
+                if count < batch:
+                    break
+        self.swept += deleted
+        return deleted
+
+    def info(self):
+        return {'cached': len(self._cache), 'max_cached': self.max_cached, 'ttl': self.ttl,
+                'swept': self.swept, 'last_error': self.last_error}
+
+    def close(self):
+        self._stop.set()
+
+
+# 저장소 주소별 세션 관리 (프로세스 전체에서 하나, 정리 스레드 포함)
+@st.cache_resource(show_spinner=False)
+def get_session_manager(url, _store):
+    return SessionManager(_store)
+
+
+# 로그인 처리: 세션을 만들고 토큰을 세션 상태와 주소에 남김
+def login(manager, student_id, name, role='student'):
+    token = manager.issue(student_id, name, role)
+    st.session_state.auth_token = token
+    st.query_params[QUERY_PARAM] = token
+    return token
+
+
+# 현재 세션 (세션 상태의 토큰, 없으면 주소의 토큰 / 유효하지 않으면 둘 다 지우고 None)
+def current(manager):
+    token = st.session_state.get('auth_token') or st.query_params.get(QUERY_PARAM)
+    if not token:
+        return None
+    session = manager.check(token)
+    if session is None:
+        _clear()
+        return None
+    st.session_state.auth_token = token
+    if st.query_params.get(QUERY_PARAM) != token:
+        st.query_params[QUERY_PARAM] = token
+    return session
+
+
+def logout(manager):
+    manager.revoke(st.session_state.get('auth_token') or st.query_params.get(QUERY_PARAM))
+    _clear()
+
+
+def _clear():
+    st.session_state.pop('auth_token', None)
+    if QUERY_PARAM in st.query_params:
+        del st.query_params[QUERY_PARAM]
@@ -0,0 +1,175 @@
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from core import allocation
+
+# 기억해 두는 정원 시나리오 수
+MEMO_SIZE = 64
+
+
+# 정원 변경 시뮬레이터 (학점순 배정 기준)
+# 모든 전공이 같은 우선순위(학점 + 동점 처리)를 쓰면 한 전공의 정원이 1 바뀔 때
+# 결과가 달라지는 학생은 하나의 연쇄(chain)뿐이다.
+#   +1: 그 전공을 현재 배정보다 선호하는 학생 중 우선순위가 가장 높은 학생이 옮겨 가고,
+#       그 학생이 비운 자리에서 같은 과정이 이어진다.
+#   -1: 그 전공에 마지막으로 배정된 학생이 밀려나, 자기 순서에 자리가 남아 있던
+#       다음 지망으로 옮기고, 그 전공의 마지막 배정자가 다시 밀려난다.
+# 이전에 계산한 시나리오를 기억해 두고, 가장 가까운 시나리오에서 출발해 차이만큼만 옮긴다.
+class CapacitySimulator:
+    def __init__(self, students, preferences, majors, tiebreak='student_id', seed=0):
+        self.majors = list(majors)
+        scores = allocation.score_matrix(students, None, self.majors)[:, 0]
+        self.order = np.lexsort((allocation.tiebreak_order(students, tiebreak, seed), -scores))
+        self.students = students.iloc[self.order].reset_index(drop=True)
+
+        # 우선순위 순서로 정렬한 지망 행렬과, 학생별 전공의 지망 순위 (없으면 큰 값)
+        self.pref = allocation.preference_matrix(students, preferences, self.majors)[self.order]
+        self.ranks = self.pref.shape[1]
+        self.unlisted = self.ranks + 1
+        self.rank_of = np.full((len(self.students), len(self.majors) + 1), self.unlisted, dtype=np.int64)
+        rows, cols = np.nonzero(self.pref >= 0)
+        self.rank_of[rows, self.pref[rows, cols]] = cols
+        self.rank_of[:, -1] = self.ranks  # -1 (미배정) 은 모든 지망보다 나쁨
+
+        self._memo = OrderedDict()
+        self.last_touched = 0
+
+    # 처음부터 전체 배정 (우선순위 순서 기준)
+    def _full(self, capacities):
+        priority = np.repeat(np.arange(len(self.students))[:, None], len(self.majors), axis=1)
+        assigned, _ = allocation.deferred_acceptance(self.pref, priority, capacities)
+        return assigned
+
+    def _add_seat(self, assigned, major):
+        touched = 0
+        vacancy = major
+        while True:
+            current = self.rank_of[np.arange(len(assigned)), assigned]
+            wants = np.flatnonzero(self.rank_of[:, vacancy] < current)
+            if len(wants) == 0:
+                return touched
+            student = wants[0]
+            previous = assigned[student]
+            assigned[student] = vacancy
+            touched += 1
+            if previous < 0:
+                return touched
+            vacancy = previous
+
+    def _remove_seat(self, assigned, major, capacities):
+        members = np.flatnonzero(assigned == major)
+        if len(members) <= capacities[major]:
+            return 0
+
+        touched = 0
+        student = members[-1]
+        while True:
+            touched += 1
+            current_rank = self.rank_of[student, assigned[student]]
+            assigned[student] = -1
+            moved = False
+            for rank in range(current_rank + 1, self.ranks):
+                target = self.pref[student, rank]
+                if target < 0:
+                    break
+                # 이 학생 차례에 자리가 남아 있었는지 (앞 순위 배정자 수로 판단)
+                if np.count_nonzero(assigned[:student] == target) < capacities[target]:
+                    assigned[student] = target
+                    moved = True
+                    break
+            if not moved:
+                return touched
+
+            members = np.flatnonzero(assigned == target)
+            if len(members) <= capacities[target]:
+                return touched
+            student = members[-1]
+
+    # 정원 시나리오의 배정 결과 (우선순위 순서의 전공 번호 배열)
+    def assign(self, capacities):
+        capacities = tuple(int(capacities[m]) for m in self.majors)
+        if capacities in self._memo:
+            self._memo.move_to_end(capacities)
+            self.last_touched = 0
+            return self._memo[capacities]
+
+        if not self._memo:
+            assigned = self._full(capacities)
+            self.last_touched = len(assigned)
+        else:
+            # 정원 차이가 가장 작은 기존 시나리오에서 출발
+            base = min(self._memo, key=lambda c: sum(abs(a - b) for a, b in zip(c, capacities)))
+            assigned = self._memo[base].copy()
+            current = list(base)
+            touched = 0
+            for j, target in enumerate(capacities):
+                while current[j] < target:
+                    current[j] += 1
+                    touched += self._add_seat(assigned, j)
+            for j, target in enumerate(capacities):
+                while current[j] > target:
+                    current[j] -= 1
+                    touched += self._remove_seat(assigned, j, current)
+            self.last_touched = touched
+
+        self._memo[capacities] = assigned
+        if len(self._memo) > MEMO_SIZE:
+            self._memo.popitem(last=False)
+        return assigned
+
+    # 전공별 요약
+    def summary(self, assigned, capacities):
+        gpa = self.students['gpa'].fillna(0.0).to_numpy(dtype=float)
+        placed = assigned >= 0
+        counts = np.bincount(assigned[placed], minlength=len(self.majors))
+        first = np.bincount(assigned[placed & (self.pref[:, 0] == assigned)], minlength=len(self.majors))
+        cutoff = [gpa[assigned == j].min() if counts[j] else np.nan for j in range(len(self.majors))]
+        return pd.DataFrame({
+            '정원': [capacities[m] for m in self.majors],
+            '배정인원': counts,
+            '최저학점': cutoff,
+            '1지망배정': first,
+        }, index=self.majors)
+
+
+# 관리자 화면: 정원 슬라이더로 배정 결과 변화 보기
+# 세션에는 (만들 때의 전공 목록, 시뮬레이터) 를 두고, 목록에서 전공이 바뀌면 다시 만든다.
+def render_simulator(store, majors, frozen=False, key='simulator'):
+    built = st.session_state.get(f'{key}_sim')
+    if st.button("🔄 최신 신청 데이터로 다시 불러오기", key=f'{key}_reload') or \
+            built is None or built[0] != tuple(majors):
+        students, preferences, _ = allocation.load_applicants(store, frozen)
+        st.session_state[f'{key}_sim'] = (
+            tuple(majors), CapacitySimulator(students, preferences, majors) if len(students) else None
+        )
+        st.session_state.pop(f'{key}_baseline', None)
+
+    simulator = st.session_state[f'{key}_sim'][1]
+    if simulator is None:
+        st.info("제출 완료된 신청서가 없습니다.")
+        return
+
+    total = len(simulator.students)
+    default_seats = -(-total // len(majors))
+    capacities = {}
+    columns = st.columns(len(majors))
+    for column, major in zip(columns, majors):
+        with column:
+            capacities[major] = st.slider(major, 0, total, default_seats, key=f'{key}_cap_{major}')
+
+    started = time.perf_counter()
+    assigned = simulator.assign(capacities)
+    elapsed = time.perf_counter() - started
+
+    baseline = st.session_state.setdefault(f'{key}_baseline', assigned)
+    changed = int(np.count_nonzero(baseline != assigned))
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("미배정", int(np.count_nonzero(assigned < 0)))
+    col2.metric("처음 시나리오 대비 변경", changed)
+    col3.metric("재계산", f"{elapsed * 1000:.1f} ms", f"{simulator.last_touched}명 이동", delta_color='off')
+    st.dataframe(simulator.summary(assigned, capacities), use_container_width=True)
@@ -0,0 +1,176 @@
+from core import db, metrics
+
+# 집계 테이블
+# stat_counters: 전체 / 제출 완료 / 미제출 학생 수
+# stat_major_counts: 전공별, 지망 순위별 지원자 수
+COUNTER_TABLES = [
+    '''
+    CREATE TABLE IF NOT EXISTS stat_counters (
+        name TEXT PRIMARY KEY,
+        value INTEGER NOT NULL DEFAULT 0
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS stat_major_counts (
+        major TEXT NOT NULL,
+        rank INTEGER NOT NULL,
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (major, rank)
+    )
+    ''',
+]
+
+
+def _count_student(row, submitted_column, sign):
+    submitted = f'COALESCE({row}.{submitted_column}, 0) != 0'
+    return '\n'.join([
+        f"UPDATE stat_counters SET value = value {sign} 1 WHERE name = 'total';",
+        f"UPDATE stat_counters SET value = value {sign} 1 WHERE name = 'submitted' AND {submitted};",
+        f"UPDATE stat_counters SET value = value {sign} 1 WHERE name = 'pending' AND NOT ({submitted});",
+    ])
+
+
+def _add_row(row, preference_columns, submitted_column, sign):
+    statements = [_count_student(row, submitted_column, sign)]
+    for rank, column in enumerate(preference_columns, start=1):
+        if sign == '+':
+            statements.append(
+                f"INSERT INTO stat_major_counts (major, rank, count) "
+                f"SELECT {row}.{column}, {rank}, 1 WHERE {row}.{column} IS NOT NULL "
+                f"ON CONFLICT (major, rank) DO UPDATE SET count = count + 1;"
+            )
+        else:
+            statements.append(
+                f"UPDATE stat_major_counts SET count = count - 1 "
+                f"WHERE major = {row}.{column} AND rank = {rank};"
+            )
+    return '\n'.join(statements)
+
+
+# 집계 테이블 생성, 기존 데이터 반영, 갱신 트리거 (스키마 마이그레이션용 SQL 목록)
+# 트리거는 학생 정보를 저장/제출하는 같은 트랜잭션 안에서 집계를 갱신하므로
+# 관리자 화면은 학생 수와 무관하게 전공 수 만큼의 행만 읽으면 된다.
+def counter_migration(table, submitted_column, preference_columns):
+    watched = ', '.join([submitted_column, *preference_columns])
+    submitted = f'COALESCE({submitted_column}, 0) != 0'
+    ranked = ' UNION ALL '.join(
+        f'SELECT {column} AS major, {rank} AS rank FROM {table} WHERE {column} IS NOT NULL'
+        for rank, column in enumerate(preference_columns, start=1)
+    )
+
+    return COUNTER_TABLES + [
+        f'''
+        INSERT OR REPLACE INTO stat_counters (name, value)
+        SELECT 'total', COUNT(*) FROM {table}
+        UNION ALL SELECT 'submitted', COUNT(*) FROM {table} WHERE {submitted}
+        UNION ALL SELECT 'pending', COUNT(*) FROM {table} WHERE NOT ({submitted})
+        ''',
+        f'''
+        INSERT OR REPLACE INTO stat_major_counts (major, rank, count)
+        SELECT major, rank, COUNT(*) FROM ({ranked}) GROUP BY major, rank
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_stats_insert AFTER INSERT ON {table}
+        BEGIN
+        {_add_row('NEW', preference_columns, submitted_column, '+')}
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_stats_delete AFTER DELETE ON {table}
+        BEGIN
+        {_add_row('OLD', preference_columns, submitted_column, '-')}
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_stats_update AFTER UPDATE OF {watched} ON {table}
+        BEGIN
+        {_add_row('OLD', preference_columns, submitted_column, '-')}
+        {_add_row('NEW', preference_columns, submitted_column, '+')}
+        END
+        ''',
+    ]
+
+
+def _count_preference(row, sign):
+    if sign == '+':
+        return (
+            f"INSERT INTO stat_major_counts (major, rank, count) VALUES ({row}.major, {row}.rank, 1) "
+            f"ON CONFLICT (major, rank) DO UPDATE SET count = count + 1;"
+        )
+    return f"UPDATE stat_major_counts SET count = count - 1 WHERE major = {row}.major AND rank = {row}.rank;"
+
+
+# 지망이 student_preferences 로 정규화된 뒤의 집계 트리거
+# 기존 counter_migration 트리거를 지우고, 학생 수는 table 에서,
+# 전공별 지원자 수는 student_preferences 에서 갱신한다.
+def normalized_counter_migration(table, submitted_column):
+    return [
+        f'DROP TRIGGER IF EXISTS {table}_stats_insert',
+        f'DROP TRIGGER IF EXISTS {table}_stats_delete',
+        f'DROP TRIGGER IF EXISTS {table}_stats_update',
+        'DELETE FROM stat_major_counts',
+        '''
+        INSERT INTO stat_major_counts (major, rank, count)
+        SELECT major, rank, COUNT(*) FROM student_preferences GROUP BY major, rank
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_counters_insert AFTER INSERT ON {table}
+        BEGIN
+        {_count_student('NEW', submitted_column, '+')}
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_counters_delete AFTER DELETE ON {table}
+        BEGIN
+        {_count_student('OLD', submitted_column, '-')}
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_counters_update AFTER UPDATE OF {submitted_column} ON {table}
+        BEGIN
+        {_count_student('OLD', submitted_column, '-')}
+        {_count_student('NEW', submitted_column, '+')}
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS student_preferences_stats_insert AFTER INSERT ON student_preferences
+        BEGIN
+        {_count_preference('NEW', '+')}
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS student_preferences_stats_delete AFTER DELETE ON student_preferences
+        BEGIN
+        {_count_preference('OLD', '-')}
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS student_preferences_stats_update AFTER UPDATE ON student_preferences
+        BEGIN
+        {_count_preference('OLD', '-')}
+        {_count_preference('NEW', '+')}
+        END
+        ''',
+    ]
+
+
+# 전체 / 제출 완료 / 미제출 학생 수
+@metrics.timed('stats.read_counters')
+def read_counters(db_path):
+    with db.connect(db_path) as conn:
+        rows = conn.execute('SELECT name, value FROM stat_counters').fetchall()
+    counters = {'total': 0, 'submitted': 0, 'pending': 0}
+    counters.update(rows)
+    return counters
+
+
+# 지망 순위별 전공 지원자 수 {전공: 인원}
+@metrics.timed('stats.read_major_counts')
+def read_major_counts(db_path, rank=1):
+    with db.connect(db_path) as conn:
+        rows = conn.execute('''
+            SELECT major, count FROM stat_major_counts
+            WHERE rank = ? AND count > 0
+            ORDER BY count DESC, major
+        ''', (rank,)).fetchall()
+    return dict(rows)
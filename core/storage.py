@@ -0,0 +1,938 @@
+import copy
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+import streamlit as st
+
+from core import admin_grid, audit, catalog, db, deadline, normalized, reporting, schema, session_record, sessions, stats
+
+# 학생 / 신청서 저장소
+# 두 화면(app.py, major_app.py)은 같은 저장소 인터페이스를 통해 읽고 쓴다.
+#   sqlite:///경로.db       SQLiteStore (기본)
+#   memory://               MemoryStore (프로세스 메모리, 테스트 / 부하 측정용, 관리자 표 / 배정 제외)
+#   postgresql://...        server_store.ServerStore (psycopg 설치 시)
+#   standin:///경로.db      server_store.ServerStore 를 sqlite3 로 실행하는 로컬 대역
+# 쓰기 메서드는 transaction() 이 돌려준 연결(conn)을 받아 호출한 트랜잭션 안에서 실행한다.
+URL_ENV = 'STUDENT_DB_URL'
+DEFAULT_URL = 'sqlite:///student_major.db'
+
+# SQLite 변수 개수 제한 안에서 IN (...) 조회
+LOOKUP_BATCH = 900
+
+# 학생 한 명의 신청 레코드
+Record = namedtuple('Record', [
+    'student_id', 'name', 'gpa', 'courses', 'preferences',
+    'is_submitted', 'created_at', 'updated_at', 'version',
+])
+
+
+def empty_record(student_id):
+    return Record(student_id, None, None, [], [None] * normalized.PREFERENCE_RANKS, False, None, None, None)
+
+
+# 이미 등록된 학번
+class DuplicateStudentError(Exception):
+    pass
+
+
+# 스키마 마이그레이션 (버전 순서대로 추가, 기존 student_major.db 와 같은 버전 번호)
+SCHEMA_MIGRATIONS = [
+    # v1: 학생 테이블
+    [
+        '''
+        CREATE TABLE IF NOT EXISTS students (
+            student_id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            password TEXT NOT NULL,
+            semester1_gpa REAL,
+            completed_courses TEXT,
+            major_preference_1 TEXT,
+            major_preference_2 TEXT,
+            major_preference_3 TEXT,
+            major_preference_4 TEXT,
+            major_preference_5 TEXT,
+            is_submitted BOOLEAN DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+    ],
+    # v2: 관리자 통계 집계 테이블 (트리거로 갱신)
+    stats.counter_migration(
+        'students', 'is_submitted',
+        ['major_preference_1', 'major_preference_2', 'major_preference_3',
+         'major_preference_4', 'major_preference_5'],
+    ),
+    # v3: 관리자 표 필터 / 정렬용 인덱스
+    [
+        'CREATE INDEX IF NOT EXISTS idx_students_submitted ON students (is_submitted)',
+        'CREATE INDEX IF NOT EXISTS idx_students_gpa ON students (semester1_gpa)',
+        'CREATE INDEX IF NOT EXISTS idx_students_name ON students (name)',
+        *[f'CREATE INDEX IF NOT EXISTS idx_students_pref_{rank} ON students (major_preference_{rank})'
+          for rank in range(1, 6)],
+    ],
+    # v4: 이수 교과목 / 전공 지망 정규화, 기존 모양의 호환 뷰 (students_view)
+    [
+        *normalized.child_tables_migration('students'),
+        normalized.copy_courses_sql('students', 'completed_courses'),
+        normalized.copy_preferences_sql('students', [f'major_preference_{rank}' for rank in range(1, 6)]),
+        *stats.normalized_counter_migration('students', 'is_submitted'),
+        *[f'DROP INDEX IF EXISTS idx_students_pref_{rank}' for rank in range(1, 6)],
+        'ALTER TABLE students DROP COLUMN completed_courses',
+        *[f'ALTER TABLE students DROP COLUMN major_preference_{rank}' for rank in range(1, 6)],
+        f'''
+        CREATE VIEW IF NOT EXISTS students_view AS
+        SELECT s.student_id, s.name, s.semester1_gpa,
+               {normalized.courses_column('s.student_id', 'completed_courses')},
+               {normalized.preference_columns('s.student_id', [f'major_preference_{rank}' for rank in range(1, 6)])},
+               s.is_submitted, s.created_at, s.updated_at
+        FROM students s
+        ''',
+    ],
+    # v5: 낙관적 동시성 제어용 레코드 버전 (저장 / 제출마다 1 증가)
+    [
+        'ALTER TABLE students ADD COLUMN version INTEGER NOT NULL DEFAULT 0',
+        'DROP VIEW IF EXISTS students_view',
+        f'''
+        CREATE VIEW students_view AS
+        SELECT s.student_id, s.name, s.semester1_gpa,
+               {normalized.courses_column('s.student_id', 'completed_courses')},
+               {normalized.preference_columns('s.student_id', [f'major_preference_{rank}' for rank in range(1, 6)])},
+               s.is_submitted, s.created_at, s.updated_at, s.version
+        FROM students s
+        ''',
+    ],
+    # v6: 전공 / 이수 교과목 / 안내 문구 목록 (관리자 수정, 버전으로 캐시 무효화)
+    catalog.catalog_migration(),
+    # v7: 신청서 변경 이력 (추가 전용 이벤트 로그, 스냅숏)
+    audit.sqlite_migration('students_view'),
+    # v8: 신청 마감 (마감 설정, 마감 처리 상태, 마감 시점 고정 테이블과 그 호환 뷰)
+    [
+        *deadline.round_migration(),
+        'DROP VIEW IF EXISTS students_view',
+        f'''
+        CREATE VIEW students_view AS
+        SELECT s.student_id, s.name, s.semester1_gpa,
+               {normalized.courses_column('s.student_id', 'completed_courses')},
+               {normalized.preference_columns('s.student_id', [f'major_preference_{rank}' for rank in range(1, 6)])},
+               s.is_submitted, s.created_at, s.updated_at, s.version, s.deadline_status
+        FROM students s
+        ''',
+        f'''
+        CREATE VIEW IF NOT EXISTS {deadline.FROZEN_VIEW} AS
+        SELECT s.student_id, s.name, s.semester1_gpa,
+               {normalized.courses_column('s.student_id', 'completed_courses', deadline.FROZEN_CHILDREN[1])},
+               {normalized.preference_columns('s.student_id', [f'major_preference_{rank}' for rank in range(1, 6)],
+                                              deadline.FROZEN_CHILDREN[0])},
+               s.is_submitted, s.created_at, s.updated_at, s.version, s.deadline_status
+        FROM frozen_students s
+        ''',
+    ],
+    # v9: 신청 현황 보고서 (변경 이력으로 증분 갱신하는 피벗 테이블)
+    reporting.report_migration(),
+    # v10: 로그인 세션 (서버 저장 세션, 토큰 서명 키)
+    sessions.session_migration(),
+]
+
+
+# 저장소 인터페이스
+# - admin_queries 가 참인 저장소(SQL 저장소)만 관리자 표 / 배정 / 시뮬레이션 조회 메서드를 구현한다.
+# - 계정 / 신청서 쓰기는 DuplicateStudentError, session_record.StaleRecordError 로 충돌을 알린다.
+class Store:
+    url = None
+    path = None
+    admin_queries = False
+    # 스냅숏에서 제외할 최근 이벤트 구간 (초, core.audit.take_snapshot)
+    snapshot_lag = 0
+
+    # 스키마 준비 (프로세스당 한 번)
+    def init(self):
+        raise NotImplementedError
+
+    # 읽기용 연결
+    def connect(self):
+        raise NotImplementedError
+
+    # 쓰기용 트랜잭션 (정상 종료 시 커밋, 예외 시 롤백)
+    def transaction(self):
+        raise NotImplementedError
+
+    # 트랜잭션 안의 부분 롤백 구간 (예외가 나면 이 구간만 되돌리고 예외를 다시 던짐)
+    def savepoint(self, conn):
+        raise NotImplementedError
+
+    # 계정 일괄 생성: accounts 는 student_id, name, password_hash 와
+    # 선택 항목 gpa, courses, preferences, is_submitted, created_at, updated_at 을 담은 dict
+    def create_accounts(self, conn, accounts):
+        raise NotImplementedError
+
+    # 이미 등록된 학번
+    def existing_ids(self, conn, student_ids):
+        raise NotImplementedError
+
+    # (이름, 비밀번호 해시) 또는 None
+    def get_account(self, student_id):
+        raise NotImplementedError
+
+    # 비밀번호 해시 교체 (그 사이 다른 값으로 바뀌었으면 그대로 둠)
+    def replace_password_hash(self, student_id, old_hash, new_hash):
+        raise NotImplementedError
+
+    # Record 또는 None
+    def load_record(self, student_id):
+        raise NotImplementedError
+
+    # 신청 정보 기록 (최종 제출된 신청서는 바꾸지 않음)
+    # expected_version 을 주면 그 사이 다른 세션이 레코드를 바꾼 경우 StaleRecordError 발생
+    # 반환값: 저장 후 레코드 버전 (학생이 없거나 이미 제출했으면 None)
+    def write_record(self, conn, student_id, gpa, courses, preferences, expected_version=None):
+        raise NotImplementedError
+
+    # 최종 제출 표시 (expected_version 은 write_record 와 같음)
+    def submit(self, conn, student_id, expected_version=None):
+        raise NotImplementedError
+
+    # 학번 순 Record 반복자 (submitted 가 None 이면 전체)
+    def iter_records(self, submitted=None):
+        raise NotImplementedError
+
+    def count_records(self, submitted=None):
+        raise NotImplementedError
+
+    # 전체 / 제출 완료 / 미제출 학생 수
+    def counters(self):
+        raise NotImplementedError
+
+    # 지망 순위별 전공 지원자 수 {전공: 인원}
+    def major_counts(self, rank=1):
+        raise NotImplementedError
+
+    # 관리자 학생 표 (core.admin_grid): grid 는 표 구성, filters 는 조회 조건
+    def count_grid_rows(self, grid, filters):
+        raise NotImplementedError
+
+    # 한 페이지의 행 (grid['columns'] 순서의 값 목록)
+    def fetch_grid_page(self, grid, filters, sort_by, descending=False, page=1, page_size=admin_grid.PAGE_SIZE):
+        raise NotImplementedError
+
+    # 전공 배정 / 정원 시뮬레이션 대상 (제출 완료자) 수, frozen 이면 마감 시점 고정 테이블 기준
+    def count_applicants(self, frozen=False):
+        raise NotImplementedError
+
+    # (학생 (학번, 이름, 학점), 지망 (학번, 순위, 전공), 이수 교과목 (학번, 교과목)) 행 목록
+    def load_applicants(self, frozen=False):
+        raise NotImplementedError
+
+    # 전공 / 교과목 / 안내 문구 목록 버전 (수정할 때마다 1 증가)
+    def catalog_version(self):
+        raise NotImplementedError
+
+    # (버전, {종류: [항목, ...]})
+    def load_catalog(self):
+        raise NotImplementedError
+
+    # 목록 교체 (items 에 있는 종류만, expected_version 이 다르면 catalog.StaleCatalogError)
+    # 반환값: 새 버전
+    def write_catalog(self, conn, items, expected_version=None):
+        raise NotImplementedError
+
+    # 변경 이력 (core.audit): 계정 생성 / 저장 / 제출은 같은 트랜잭션에서 이벤트를 추가한다.
+    # 이벤트는 core.audit.event_row 모양의 dict, 시각은 UTC 문자열
+    def record_history(self, student_id):
+        raise NotImplementedError
+
+    # 학생의 at 시점 상태 (마지막 이벤트) 또는 None
+    def record_at(self, student_id, at):
+        raise NotImplementedError
+
+    # at 시점에 등록되어 있던 모든 학생의 상태 (학번 순)
+    def cohort_at(self, at):
+        raise NotImplementedError
+
+    # {'last_event_id', 'snapshots', 'events_since_snapshot'}
+    def audit_status(self):
+        raise NotImplementedError
+
+    # 새 스냅숏 (새 이벤트가 없으면 None)
+    def take_snapshot(self):
+        raise NotImplementedError
+
+    # 신청 마감 (core.deadline): 현재 마감 설정 / 결과 (deadline.Round)
+    def round_state(self):
+        raise NotImplementedError
+
+    # 쓰기 트랜잭션 안에서 마감 설정 읽기 (서버 DB 는 마감 처리와 겹치지 않도록 공유 잠금)
+    def lock_round(self, conn):
+        raise NotImplementedError
+
+    # 마감 시각(UTC 문자열, None 이면 해제) / 처리 방식 설정 (마감 처리 후에는 deadline.RoundClosedError)
+    def set_deadline(self, conn, deadline_at, policy):
+        raise NotImplementedError
+
+    # 미제출 신청서 일괄 자동 제출 / 미완료 표시, 마감 시점 스냅숏, 배정 입력 고정 (한 트랜잭션)
+    # 반환값: {'frozen_at', 'policy', 'finalized', 'flagged', 'snapshot_id'} (이미 마감 처리되었으면 None)
+    def freeze_round(self, conn, policy=None):
+        raise NotImplementedError
+
+    # 신청 현황 보고서 (core.reporting): 마지막 갱신 이후의 이벤트를 집계에 반영
+    # 반환값: {'last_event_id', 'events', 'students', 'refreshed_at'} (반영할 이벤트가 없으면 None)
+    def refresh_reports(self):
+        raise NotImplementedError
+
+    # {'gpa', 'courses', 'transitions': [(키..., 값...)], 'last_event_id', 'refreshed_at'}
+    def load_reports(self):
+        raise NotImplementedError
+
+    # 로그인 세션 (core.sessions): key 는 세션 번호의 해시, expires_at 은 유닉스 초
+    # 저장된 토큰 서명 키 (처음이면 candidate 를 저장)
+    def session_secret(self, candidate):
+        raise NotImplementedError
+
+    def create_session(self, key, student_id, name, role, expires_at):
+        raise NotImplementedError
+
+    # sessions.Session 또는 None (만료 여부는 호출하는 쪽에서 확인)
+    def load_session(self, key):
+        raise NotImplementedError
+
+    def extend_session(self, key, expires_at):
+        raise NotImplementedError
+
+    def delete_session(self, key):
+        raise NotImplementedError
+
+    # now 이전에 만료된 세션을 최대 limit 개 삭제 (삭제한 개수)
+    def sweep_sessions(self, now, limit):
+        raise NotImplementedError
+
+
+def _record(row):
+    student_id, name, gpa, courses, p1, p2, p3, p4, p5, is_submitted, created_at, updated_at, version = row
+    return Record(
+        student_id, name, gpa, courses.split(',') if courses else [], [p1, p2, p3, p4, p5],
+        bool(is_submitted), created_at, updated_at, version,
+    )
+
+
+_RECORD_COLUMNS = '''
+    student_id, name, semester1_gpa, completed_courses,
+    major_preference_1, major_preference_2, major_preference_3,
+    major_preference_4, major_preference_5,
+    is_submitted, created_at, updated_at, version
+'''
+
+
+# SQLite 파일 저장소 (연결 풀 / 스키마 마이그레이션 / 집계 트리거는 core.db, core.schema, core.stats)
+class SQLiteStore(Store):
+    admin_queries = True
+
+    def __init__(self, path):
+        self.path = path
+        self.url = f'sqlite:///{path}'
+
+    def init(self):
+        schema.ensure_schema(self.path, SCHEMA_MIGRATIONS)
+
+    def connect(self):
+        return db.connect(self.path)
+
+    def transaction(self):
+        return db.transaction(self.path)
+
+    @contextmanager
+    def savepoint(self, conn):
+        conn.execute('SAVEPOINT record')
+        try:
+            yield
+        except BaseException:
+            conn.execute('ROLLBACK TO record')
+            raise
+        finally:
+            conn.execute('RELEASE record')
+
+    def create_accounts(self, conn, accounts):
+        try:
+            conn.executemany('''
+                INSERT INTO students (student_id, name, password, semester1_gpa, is_submitted, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP), COALESCE(?, CURRENT_TIMESTAMP))
+            ''', [
+                (a['student_id'], a['name'], a['password_hash'], a.get('gpa'), bool(a.get('is_submitted')),
+                 a.get('created_at'), a.get('updated_at'))
+                for a in accounts
+            ])
+        except sqlite3.IntegrityError as e:
+            raise DuplicateStudentError(str(e)) from e
+        conn.executemany(
+            'INSERT OR IGNORE INTO student_courses (student_id, position, course) VALUES (?, ?, ?)',
+            [(a['student_id'], position, course)
+             for a in accounts for position, course in enumerate(a.get('courses') or [], start=1)]
+        )
+        conn.executemany(
+            'INSERT INTO student_preferences (student_id, rank, major) VALUES (?, ?, ?)',
+            [(a['student_id'], rank, major)
+             for a in accounts for rank, major in enumerate(a.get('preferences') or [], start=1) if major]
+        )
+        self._append_events(conn, [a['student_id'] for a in accounts], 'register')
+
+    # 학생들의 현재 상태를 변경 이력에 추가 (같은 트랜잭션, 기록 시각 기본값은 현재)
+    def _append_events(self, conn, student_ids, kind, recorded_at=None):
+        recorded_at = recorded_at or audit.now()
+        conn.executemany(f'''
+            INSERT INTO record_events ({audit.columns()})
+            SELECT ?, ?, student_id, name, semester1_gpa, completed_courses,
+                   {', '.join(audit.PREFERENCE_COLUMNS)}, is_submitted, version
+            FROM students_view WHERE student_id = ?
+        ''', [(kind, recorded_at, student_id) for student_id in student_ids])
+
+    def existing_ids(self, conn, student_ids):
+        found = set()
+        for i in range(0, len(student_ids), LOOKUP_BATCH):
+            batch = student_ids[i:i + LOOKUP_BATCH]
+            placeholders = ', '.join('?' * len(batch))
+            found.update(row[0] for row in conn.execute(
+                f'SELECT student_id FROM students WHERE student_id IN ({placeholders})', batch
+            ))
+        return found
+
+    def get_account(self, student_id):
+        with self.connect() as conn:
+            return conn.execute(
+                'SELECT name, password FROM students WHERE student_id = ?', (student_id,)
+            ).fetchone()
+
+    def replace_password_hash(self, student_id, old_hash, new_hash):
+        with self.transaction() as conn:
+            conn.execute(
+                'UPDATE students SET password = ? WHERE student_id = ? AND password = ?',
+                (new_hash, student_id, old_hash)
+            )
+
+    def load_record(self, student_id):
+        with self.connect() as conn:
+            row = conn.execute(
+                f'SELECT {_RECORD_COLUMNS} FROM students_view WHERE student_id = ?', (student_id,)
+            ).fetchone()
+        return _record(row) if row else None
+
+    def _exists(self, conn, student_id):
+        return conn.execute('SELECT 1 FROM students WHERE student_id = ?', (student_id,)).fetchone() is not None
+
+    def write_record(self, conn, student_id, gpa, courses, preferences, expected_version=None):
+        row = conn.execute('''
+            UPDATE students SET
+                semester1_gpa = ?,
+                updated_at = CURRENT_TIMESTAMP,
+                version = version + 1
+            WHERE student_id = ? AND is_submitted = 0 AND (? IS NULL OR version = ?)
+            RETURNING version
+        ''', (gpa, student_id, expected_version, expected_version)).fetchone()
+        if row:
+            normalized.replace_children(conn, student_id, courses, preferences)
+            self._append_events(conn, [student_id], 'save')
+            return row[0]
+        if expected_version is not None and self._exists(conn, student_id):
+            raise session_record.StaleRecordError(student_id)
+        return None
+
+    def submit(self, conn, student_id, expected_version=None):
+        row = conn.execute('''
+            UPDATE students SET
+                is_submitted = 1,
+                updated_at = CURRENT_TIMESTAMP,
+                version = version + 1
+            WHERE student_id = ? AND (? IS NULL OR version = ?)
+            RETURNING version
+        ''', (student_id, expected_version, expected_version)).fetchone()
+        if row:
+            self._append_events(conn, [student_id], 'submit')
+            return row[0]
+        if expected_version is not None and self._exists(conn, student_id):
+            raise session_record.StaleRecordError(student_id)
+        return None
+
+    def iter_records(self, submitted=None):
+        where, params = ('', ()) if submitted is None else ('WHERE is_submitted = ?', (int(submitted),))
+        with self.connect() as conn:
+            cursor = conn.execute(f'SELECT {_RECORD_COLUMNS} FROM students_view {where} ORDER BY student_id', params)
+            for row in cursor:
+                yield _record(row)
+
+    def count_records(self, submitted=None):
+        where, params = ('', ()) if submitted is None else ('WHERE is_submitted = ?', (int(submitted),))
+        with self.connect() as conn:
+            return conn.execute(f'SELECT COUNT(*) FROM students {where}', params).fetchone()[0]
+
+    def counters(self):
+        return stats.read_counters(self.path)
+
+    def major_counts(self, rank=1):
+        return stats.read_major_counts(self.path, rank)
+
+    def count_grid_rows(self, grid, filters):
+        with self.connect() as conn:
+            return admin_grid.count_rows(self._execute, conn, grid, filters)
+
+    def fetch_grid_page(self, grid, filters, sort_by, descending=False, page=1, page_size=admin_grid.PAGE_SIZE):
+        with self.connect() as conn:
+            return admin_grid.fetch_page(self._execute, conn, grid, filters, sort_by, descending, page, page_size)
+
+    def count_applicants(self, frozen=False):
+        with self.connect() as conn:
+            return admin_grid.count_applicants(self._execute, conn, frozen)
+
+    def load_applicants(self, frozen=False):
+        with self.connect() as conn:
+            return admin_grid.applicant_rows(self._execute, conn, frozen)
+
+    def catalog_version(self):
+        with self.connect() as conn:
+            return conn.execute('SELECT version FROM catalog_version WHERE id = 1').fetchone()[0]
+
+    def load_catalog(self):
+        with self.connect() as conn:
+            version = conn.execute('SELECT version FROM catalog_version WHERE id = 1').fetchone()[0]
+            rows = conn.execute('SELECT kind, label FROM catalog_items ORDER BY kind, position').fetchall()
+        return version, catalog.group_items(rows)
+
+    def write_catalog(self, conn, items, expected_version=None):
+        row = conn.execute('''
+            UPDATE catalog_version SET version = version + 1
+            WHERE id = 1 AND (? IS NULL OR version = ?)
+            RETURNING version
+        ''', (expected_version, expected_version)).fetchone()
+        if row is None:
+            raise catalog.StaleCatalogError(expected_version)
+        conn.executemany('DELETE FROM catalog_items WHERE kind = ?', [(kind,) for kind in items])
+        conn.executemany(
+            'INSERT INTO catalog_items (kind, position, label) VALUES (?, ?, ?)',
+            [(kind, position, label) for kind, labels in items.items() for position, label in enumerate(labels, start=1)]
+        )
+        return row[0]
+
+    def _execute(self, conn, sql, params=()):
+        return conn.execute(audit.qmark(sql), params)
+
+    def _executemany(self, conn, sql, rows):
+        conn.executemany(audit.qmark(sql), rows)
+
+    def record_history(self, student_id):
+        with self.connect() as conn:
+            return audit.record_history(self._execute, conn, student_id)
+
+    def record_at(self, student_id, at):
+        with self.connect() as conn:
+            return audit.record_at(self._execute, conn, student_id, at)
+
+    def cohort_at(self, at):
+        with self.connect() as conn:
+            return audit.cohort_at(self._execute, conn, at)
+
+    def audit_status(self):
+        with self.connect() as conn:
+            return audit.audit_status(self._execute, conn)
+
+    def take_snapshot(self):
+        with self.transaction() as conn:
+            return audit.take_snapshot(self._execute, conn, self.snapshot_lag)
+
+    def round_state(self):
+        with self.connect() as conn:
+            return deadline.read_round(self._execute, conn)
+
+    def lock_round(self, conn):
+        return deadline.read_round(self._execute, conn)
+
+    def set_deadline(self, conn, deadline_at, policy):
+        deadline.set_deadline(self._execute, conn, deadline_at, policy)
+
+    def freeze_round(self, conn, policy=None):
+        return deadline.freeze(self._execute, conn, self._append_events, policy)
+
+    def refresh_reports(self):
+        with self.connect() as conn:
+            if not reporting.pending(self._execute, conn, self.snapshot_lag):
+                return None
+        with self.transaction() as conn:
+            return reporting.refresh(self._execute, self._executemany, conn, self.snapshot_lag)
+
+    def load_reports(self):
+        with self.connect() as conn:
+            return reporting.load(self._execute, conn)
+
+    def session_secret(self, candidate):
+        with self.transaction() as conn:
+            return sessions.session_secret(self._execute, conn, candidate)
+
+    def create_session(self, key, student_id, name, role, expires_at):
+        with self.transaction() as conn:
+            sessions.create_session(self._execute, conn, key, student_id, name, role, expires_at)
+
+    def load_session(self, key):
+        with self.connect() as conn:
+            return sessions.load_session(self._execute, conn, key)
+
+    def extend_session(self, key, expires_at):
+        with self.transaction() as conn:
+            sessions.extend_session(self._execute, conn, key, expires_at)
+
+    def delete_session(self, key):
+        with self.transaction() as conn:
+            sessions.delete_session(self._execute, conn, key)
+
+    def sweep_sessions(self, now, limit):
+        with self.transaction() as conn:
+            return sessions.sweep_sessions(self._execute, conn, now, limit)
+
+
+def _now():
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())
+
+
+# 프로세스 메모리 저장소 (테스트 / 부하 측정용, 프로세스가 끝나면 사라짐)
+# 트랜잭션은 저장소 전체 잠금이며, 예외가 나면 시작 시점의 사본으로 되돌린다.
+class MemoryStore(Store):
+    def __init__(self):
+        self.url = f'memory://{id(self):x}'
+        self._rows = {}
+        self._catalog = {'version': 1, 'items': copy.deepcopy(catalog.DEFAULTS)}
+        self._events = []
+        self._snapshots = []
+        self._round = deadline.OPEN_ROUND
+        self._reports = {'last_event_id': 0, 'refreshed_at': None, 'students': {},
+                         **{name: {} for name in reporting.TABLES}}
+        self._sessions = {}
+        self._session_secret = None
+        self._lock = threading.RLock()
+
+    def init(self):
+        pass
+
+    @contextmanager
+    def connect(self):
+        with self._lock:
+            yield self
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            saved = copy.deepcopy((self._rows, self._catalog))
+            events, snapshots, round_ = len(self._events), len(self._snapshots), self._round
+            try:
+                yield self
+            except BaseException:
+                self._rows, self._catalog = saved
+                del self._events[events:]
+                del self._snapshots[snapshots:]
+                self._round = round_
+                raise
+
+    def savepoint(self, conn):
+        return self.transaction()
+
+    def create_accounts(self, conn, accounts):
+        duplicates = [a['student_id'] for a in accounts if a['student_id'] in self._rows]
+        if duplicates or len({a['student_id'] for a in accounts}) != len(accounts):
+            raise DuplicateStudentError(', '.join(duplicates))
+        now = _now()
+        for a in accounts:
+            preferences = list(a.get('preferences') or [])
+            self._rows[a['student_id']] = {
+                'name': a['name'],
+                'password': a['password_hash'],
+                'gpa': a.get('gpa'),
+                'courses': list(dict.fromkeys(a.get('courses') or [])),
+                'preferences': preferences + [None] * (normalized.PREFERENCE_RANKS - len(preferences)),
+                'is_submitted': bool(a.get('is_submitted')),
+                'created_at': a.get('created_at') or now,
+                'updated_at': a.get('updated_at') or now,
+                'version': 0,
+            }
+            self._append_event(a['student_id'], 'register')
+
+    # 이벤트 번호는 1 부터 (목록 위치 + 1)
+    def _append_event(self, student_id, kind, recorded_at=None):
+        record = self._record(student_id, self._rows[student_id])
+        self._events.append(audit.event_row(
+            (len(self._events) + 1, *audit.event_values(kind, recorded_at or audit.now(), record))
+        ))
+
+    def existing_ids(self, conn, student_ids):
+        return {student_id for student_id in student_ids if student_id in self._rows}
+
+    def get_account(self, student_id):
+        with self._lock:
+            row = self._rows.get(student_id)
+            return (row['name'], row['password']) if row else None
+
+    def replace_password_hash(self, student_id, old_hash, new_hash):
+        with self._lock:
+            row = self._rows.get(student_id)
+            if row and row['password'] == old_hash:
+                row['password'] = new_hash
+
+    def _record(self, student_id, row):
+        return Record(
+            student_id, row['name'], row['gpa'], list(row['courses']),
+            [major or None for major in row['preferences']],
+            row['is_submitted'], row['created_at'], row['updated_at'], row['version'],
+        )
+
+    def load_record(self, student_id):
+        with self._lock:
+            row = self._rows.get(student_id)
+            return self._record(student_id, row) if row else None
+
+    def _check(self, student_id, expected_version, allow_submitted):
+        row = self._rows.get(student_id)
+        if row is None:
+            return None
+        if (row['is_submitted'] and not allow_submitted) or \
+                (expected_version is not None and row['version'] != expected_version):
+            if expected_version is not None:
+                raise session_record.StaleRecordError(student_id)
+            return None
+        return row
+
+    def write_record(self, conn, student_id, gpa, courses, preferences, expected_version=None):
+        row = self._check(student_id, expected_version, allow_submitted=False)
+        if row is None:
+            return None
+        preferences = list(preferences or [])
+        row.update(
+            gpa=gpa,
+            courses=list(dict.fromkeys(courses or [])),
+            preferences=preferences + [None] * (normalized.PREFERENCE_RANKS - len(preferences)),
+            updated_at=_now(),
+            version=row['version'] + 1,
+        )
+        self._append_event(student_id, 'save')
+        return row['version']
+
+    def submit(self, conn, student_id, expected_version=None):
+        row = self._check(student_id, expected_version, allow_submitted=True)
+        if row is None:
+            return None
+        row.update(is_submitted=True, updated_at=_now(), version=row['version'] + 1)
+        self._append_event(student_id, 'submit')
+        return row['version']
+
+    def iter_records(self, submitted=None):
+        with self._lock:
+            records = [
+                self._record(student_id, row) for student_id, row in sorted(self._rows.items())
+                if submitted is None or row['is_submitted'] == bool(submitted)
+            ]
+        return iter(records)
+
+    def count_records(self, submitted=None):
+        with self._lock:
+            return sum(1 for row in self._rows.values() if submitted is None or row['is_submitted'] == bool(submitted))
+
+    def counters(self):
+        total = self.count_records()
+        submitted = self.count_records(submitted=True)
+        return {'total': total, 'submitted': submitted, 'pending': total - submitted}
+
+    def major_counts(self, rank=1):
+        counts = {}
+        with self._lock:
+            for row in self._rows.values():
+                major = row['preferences'][rank - 1]
+                if major:
+                    counts[major] = counts.get(major, 0) + 1
+        return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+    def catalog_version(self):
+        with self._lock:
+            return self._catalog['version']
+
+    def load_catalog(self):
+        with self._lock:
+            return self._catalog['version'], copy.deepcopy(self._catalog['items'])
+
+    def write_catalog(self, conn, items, expected_version=None):
+        if expected_version is not None and self._catalog['version'] != expected_version:
+            raise catalog.StaleCatalogError(expected_version)
+        self._catalog['items'].update({kind: list(labels) for kind, labels in items.items()})
+        self._catalog['version'] += 1
+        return self._catalog['version']
+
+    def record_history(self, student_id):
+        with self._lock:
+            return [dict(event) for event in self._events if event['student_id'] == student_id]
+
+    def record_at(self, student_id, at):
+        with self._lock:
+            for event in reversed(self._events):
+                if event['student_id'] == student_id and event['recorded_at'] <= at:
+                    return dict(event)
+        return None
+
+    def cohort_at(self, at):
+        with self._lock:
+            base = next((snapshot for snapshot in reversed(self._snapshots) if snapshot['taken_at'] <= at), None)
+            latest = dict(base['rows']) if base else {}
+            for event in self._events[base['last_event_id'] if base else 0:]:
+                if event['recorded_at'] <= at:
+                    latest[event['student_id']] = event['event_id']
+            return [dict(self._events[latest[student_id] - 1]) for student_id in sorted(latest)]
+
+    def audit_status(self):
+        with self._lock:
+            last_event_id = len(self._events)
+            snapshot_event_id = self._snapshots[-1]['last_event_id'] if self._snapshots else 0
+            return {'last_event_id': last_event_id, 'snapshots': len(self._snapshots),
+                    'events_since_snapshot': last_event_id - snapshot_event_id}
+
+    def take_snapshot(self):
+        with self._lock:
+            previous = self._snapshots[-1] if self._snapshots else {'rows': {}, 'last_event_id': 0}
+            new_events = self._events[previous['last_event_id']:]
+            if not new_events:
+                return None
+            rows = dict(previous['rows'])
+            rows.update((event['student_id'], event['event_id']) for event in new_events)
+            snapshot = {
+                'snapshot_id': len(self._snapshots) + 1,
+                'taken_at': new_events[-1]['recorded_at'],
+                'last_event_id': new_events[-1]['event_id'],
+                'students': len(rows),
+                'rows': rows,
+            }
+            self._snapshots.append(snapshot)
+            return {key: value for key, value in snapshot.items() if key != 'rows'}
+
+    def round_state(self):
+        with self._lock:
+            return self._round
+
+    def lock_round(self, conn):
+        return self._round
+
+    def set_deadline(self, conn, deadline_at, policy):
+        if self._round.frozen_at:
+            raise deadline.RoundClosedError('이미 마감 처리되었습니다.')
+        self._round = self._round._replace(deadline=deadline_at, policy=deadline.check_policy(policy))
+
+    # SQL 로 읽는 관리자 기능이 없으므로 배정 입력은 따로 고정하지 않는다
+    def freeze_round(self, conn, policy=None):
+        if self._round.frozen_at:
+            return None
+        frozen_at = audit.now()
+        policy = deadline.check_policy(policy) or self._round.policy
+        finalized, flagged = [], []
+        for student_id, row in sorted(self._rows.items()):
+            if row['is_submitted']:
+                continue
+            if policy == 'finalize' and (row['gpa'] or 0) > 0 and any(row['preferences']):
+                row.update(is_submitted=True, deadline_status='auto_submitted', updated_at=_now(),
+                           version=row['version'] + 1)
+                finalized.append(student_id)
+            else:
+                row.update(deadline_status='incomplete', version=row['version'] + 1)
+                flagged.append(student_id)
+        for student_id in finalized:
+            self._append_event(student_id, 'deadline_submit', frozen_at)
+        for student_id in flagged:
+            self._append_event(student_id, 'deadline_flag', frozen_at)
+
+        snapshot = self.take_snapshot()
+        snapshot_id = snapshot['snapshot_id'] if snapshot else (len(self._snapshots) or None)
+        self._round = self._round._replace(frozen_at=frozen_at, policy=policy, snapshot_id=snapshot_id,
+                                           finalized=len(finalized), flagged=len(flagged))
+        return {'frozen_at': frozen_at, 'policy': policy, 'finalized': len(finalized),
+                'flagged': len(flagged), 'snapshot_id': snapshot_id}
+
+    # 집계 행은 {키: [값...]}, 학생 수가 0 이 된 행은 지운다
+    def refresh_reports(self):
+        with self._lock:
+            reports = self._reports
+            watermark = reports['last_event_id']
+            latest = {event['student_id']: event for event in self._events[watermark:]}
+            if not latest:
+                return None
+            old = [self._events[reports['students'][student_id] - 1]
+                   for student_id in latest if student_id in reports['students']]
+            for name, rows in reporting.deltas(old, list(latest.values())).items():
+                table = reports[name]
+                for row in rows:
+                    key, values = row[:4], row[4:]
+                    current = [a + b for a, b in zip(table.get(key, [0] * len(values)), values)]
+                    if current[0]:
+                        table[key] = current
+                    else:
+                        table.pop(key, None)
+            reports['students'].update((student_id, event['event_id']) for student_id, event in latest.items())
+            reports['last_event_id'] = len(self._events)
+            reports['refreshed_at'] = audit.now()
+            return {'last_event_id': reports['last_event_id'], 'events': reports['last_event_id'] - watermark,
+                    'students': len(latest), 'refreshed_at': reports['refreshed_at']}
+
+    def load_reports(self):
+        with self._lock:
+            return {
+                **{name: [(*key, *values) for key, values in self._reports[name].items()] for name in reporting.TABLES},
+                'last_event_id': self._reports['last_event_id'],
+                'refreshed_at': self._reports['refreshed_at'],
+            }
+
+    def session_secret(self, candidate):
+        with self._lock:
+            self._session_secret = self._session_secret or candidate
+            return self._session_secret
+
+    def create_session(self, key, student_id, name, role, expires_at):
+        with self._lock:
+            self._sessions[key] = sessions.Session(student_id, name, role, expires_at)
+
+    def load_session(self, key):
+        with self._lock:
+            return self._sessions.get(key)
+
+    def extend_session(self, key, expires_at):
+        with self._lock:
+            if key in self._sessions:
+                self._sessions[key] = self._sessions[key]._replace(expires_at=expires_at)
+
+    def delete_session(self, key):
+        with self._lock:
+            self._sessions.pop(key, None)
+
+    def sweep_sessions(self, now, limit):
+        with self._lock:
+            expired = [key for key, session in self._sessions.items() if session.expires_at < now][:limit]
+            for key in expired:
+                del self._sessions[key]
+            return len(expired)
+
+
+# 주소로 저장소 만들기 (스키마 준비는 get_store / init 에서)
+def open_store(url):
+    scheme, _, rest = url.partition('://')
+    if scheme == 'sqlite':
+        return SQLiteStore(rest[1:] if rest.startswith('/') else rest)
+    if scheme == 'memory':
+        return MemoryStore()
+
+    from core import server_store
+
+    if scheme in server_store.SCHEMES:
+        return server_store.open_server_store(url)
+    raise ValueError(f'지원하지 않는 저장소 주소입니다: {url}')
+
+
+# 환경변수 STUDENT_DB_URL (기본: sqlite:///student_major.db)
+def store_url():
+    return os.environ.get(URL_ENV, DEFAULT_URL)
+
+
+# 주소별 저장소 (프로세스 전체에서 공유)
+@st.cache_resource(show_spinner=False)
+def get_store(url):
+    store = open_store(url)
+    store.init()
+    return store
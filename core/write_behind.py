@@ -0,0 +1,240 @@
+import atexit
+import threading
+import time
+
+import streamlit as st
+
+from core import metrics, session_record
+
+# 임시저장 write-behind 큐
+# - 임시저장은 바로 커밋하지 않고 큐에 넣은 뒤 즉시 돌아간다.
+# - 같은 학생의 대기 중인 임시저장은 마지막 내용 하나로 합쳐진다.
+# - 쓰기 스레드가 FLUSH_INTERVAL_SECONDS 동안 모은 임시저장을 한 트랜잭션으로 기록한다.
+#   (학생마다 SAVEPOINT 를 두어 한 학생의 충돌이 배치 전체를 되돌리지 않음)
+# - 요청마다 Ticket 을 돌려주며, 커밋되면 완료(버전), 실패하면 오류가 기록된다.
+# - 최종 제출은 settle() 로 해당 학생의 대기 / 진행 중인 임시저장을 정리한 뒤 동기로 기록한다.
+FLUSH_INTERVAL_SECONDS = 0.25
+MAX_BATCH = 500
+MAX_ATTEMPTS = 3
+
+# 세션별 마지막 임시저장 Ticket
+TICKET_KEY = '_draft_ticket'
+
+
+# 임시저장 처리 결과 (커밋 확인용)
+class Ticket:
+    def __init__(self, student_id):
+        self.student_id = student_id
+        self.version = None
+        self.error = None
+        self.superseded = False
+        self._done = threading.Event()
+
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def failed(self):
+        return self.done() and self.error is not None
+
+    def _resolve(self, version=None, error=None, superseded=False):
+        self.version = version
+        self.error = error
+        self.superseded = superseded
+        self._done.set()
+
+
+# 큐에 들어 있는 임시저장 한 건
+class _Draft:
+    def __init__(self, student_id, args, expected_version, after):
+        self.student_id = student_id
+        self.args = args
+        self.expected_version = expected_version
+        self.after = after
+        self.attempts = 0
+        self.ticket = Ticket(student_id)
+
+    # 같은 세션의 이전 임시저장이 먼저 커밋됐다면 그 버전을 기준으로 검사
+    def resolve_expected(self):
+        if self.expected_version is None:
+            return None
+        if self.after is not None and self.after.version is not None:
+            return max(self.expected_version, self.after.version)
+        return self.expected_version
+
+
+class WriteBehindQueue:
+    # store: core.storage 저장소, apply(conn, student_id, args, expected_version) -> 새 버전
+    def __init__(self, store, apply, interval=FLUSH_INTERVAL_SECONDS, max_batch=MAX_BATCH):
+        self.store = store
+        self.apply = apply
+        self.interval = interval
+        self.max_batch = max_batch
+        self._pending = {}
+        self._inflight = {}
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # 임시저장 요청 (after: 같은 세션의 직전 Ticket)
+    def submit(self, student_id, args, expected_version=None, after=None):
+        with self._cond:
+            if self._closed:
+                raise RuntimeError('write-behind queue is closed')
+
+            draft = self._pending.get(student_id)
+            if draft is not None:
+                if after is not draft.ticket:
+                    # 다른 세션의 임시저장이 아직 반영되지 않음 → 충돌
+                    ticket = Ticket(student_id)
+                    ticket._resolve(error=session_record.StaleRecordError(student_id))
+                    return ticket
+                draft.args = args
+                metrics.count('write_behind.coalesced')
+                return draft.ticket
+
+            if after is not None and (after.student_id != student_id or after.failed()):
+                after = None
+            draft = _Draft(student_id, args, expected_version, after)
+            self._pending[student_id] = draft
+            metrics.count('write_behind.queued')
+            self._cond.notify()
+            return draft.ticket
+
+    # 동기 쓰기 전 정리: 대기 중인 임시저장은 취소하고 진행 중인 배치는 끝날 때까지 대기
+    def settle(self, student_id, timeout=None):
+        with self._cond:
+            draft = self._pending.pop(student_id, None)
+            if draft is not None:
+                draft.ticket._resolve(superseded=True)
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while student_id in self._inflight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    # 대기 중인 임시저장 수
+    def pending(self):
+        with self._cond:
+            return len(self._pending) + len(self._inflight)
+
+    # 남은 임시저장을 모두 기록하고 쓰기 스레드 종료
+    def close(self, timeout=10):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                closed = self._closed
+
+            # 짧게 기다리며 임시저장을 모음 (종료 중이면 바로 기록)
+            if not closed:
+                time.sleep(self.interval)
+
+            with self._cond:
+                batch = []
+                for student_id in list(self._pending)[:self.max_batch]:
+                    batch.append(self._pending.pop(student_id))
+                self._inflight = {draft.student_id: draft for draft in batch}
+
+            try:
+                self._flush(batch)
+            finally:
+                with self._cond:
+                    self._inflight = {}
+                    self._cond.notify_all()
+
+    def _flush(self, batch):
+        results = []
+        try:
+            with metrics.timer('write_behind.flush'), self.store.transaction() as conn:
+                for draft in batch:
+                    try:
+                        with self.store.savepoint(conn):
+                            version = self.apply(conn, draft.student_id, draft.args, draft.resolve_expected())
+                    except Exception as e:
+                        results.append((draft, None, e))
+                    else:
+                        results.append((draft, version, None))
+        except Exception as e:
+            # 배치 전체 실패 (잠금 시간 초과 등): 새 요청이 없으면 다시 시도
+            metrics.count('write_behind.batch_failed')
+            with self._cond:
+                for draft in batch:
+                    draft.attempts += 1
+                    if draft.student_id in self._pending:
+                        draft.ticket._resolve(superseded=True)
+                    elif draft.attempts < MAX_ATTEMPTS and not self._closed:
+                        self._pending[draft.student_id] = draft
+                    else:
+                        draft.ticket._resolve(error=e)
+            return
+
+        metrics.count('write_behind.committed', len(results))
+        for draft, version, error in results:
+            draft.ticket._resolve(version, error)
+
+
+# 저장소 주소별 임시저장 큐 (프로세스 전체에서 공유)
+@st.cache_resource(show_spinner=False)
+def get_queue(url, _store, _apply):
+    return WriteBehindQueue(_store, _apply)
+
+
+# 임시저장 요청 (세션 레코드 캐시는 저장한 내용으로 바로 갱신)
+# record 는 session_record 에 보관하는 레코드와 같은 모양 (버전은 기존 값 유지)
+def save_draft(queue, student_id, args, expected_version, record):
+    ticket = queue.submit(student_id, args, expected_version, after=st.session_state.get(TICKET_KEY))
+    st.session_state[TICKET_KEY] = ticket
+    session_record.store(student_id, record)
+    return ticket
+
+
+# 최종 제출 등 동기 쓰기 전에 호출: 이 세션의 임시저장을 정리하고 기준 버전을 돌려줌
+def settle(queue, student_id, expected_version):
+    queue.settle(student_id)
+    ticket = st.session_state.pop(TICKET_KEY, None)
+    if ticket is not None and ticket.student_id == student_id and ticket.version is not None:
+        return max(expected_version or 0, ticket.version)
+    return expected_version
+
+
+# 진행 중인 임시저장은 완료될 때까지 주기적으로 확인
+@st.fragment(run_every=0.5)
+def _poll(ticket):
+    if ticket.done():
+        st.rerun()
+    st.caption("⏳ 임시저장 중...")
+
+
+# 임시저장 상태 표시 (session_record.load 전에 호출)
+# 완료된 경우 캐시를 비워 DB 에서 다시 읽게 한다.
+def render_status(student_id):
+    ticket = st.session_state.get(TICKET_KEY)
+    if ticket is None or ticket.student_id != student_id:
+        return
+    if not ticket.done():
+        _poll(ticket)
+        return
+
+    st.session_state.pop(TICKET_KEY, None)
+    session_record.invalidate()
+    if isinstance(ticket.error, session_record.StaleRecordError):
+        st.error("다른 창에서 신청서가 먼저 변경되어 임시저장이 반영되지 않았습니다. 최신 내용을 확인해주세요.")
+    elif ticket.error is not None:
+        st.error(f"임시저장에 실패했습니다: {ticket.error}")
+    elif ticket.version is not None:
+        st.caption("✅ 임시저장 완료")
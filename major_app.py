@@ -1,228 +1,32 @@
 import streamlit as st
-import sqlite3
-import hashlib
-import pandas as pd
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib import colors
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-import io
-import os
-import openpyxl
 
-# 한글 폰트 설정 (시스템에 설치된 한글 폰트 사용)
-try:
-    font_path = os.path.join(os.path.dirname(__file__), "NotoSansKR-Regular.ttf")
-    if os.path.exists(font_path):
-        pdfmetrics.registerFont(TTFont("NotoSans", font_path))
-        korean_font = "NotoSans"
-    else:
-        korean_font = "Helvetica"  # fallback    
-except:
-    korean_font = 'Helvetica'
+from core import applications, audit, catalog, deadline, metrics, passwords, pdf_templates, rate_limit, session_record, sessions, storage, write_behind
 
-# 데이터베이스 초기화
+# 저장소 준비 (프로세스당 한 번만 실제로 실행됨, 주소는 환경변수 STUDENT_DB_URL)
+# 예전 major_selection.db 의 내용은 python -m core.merge_databases 로 한 번 옮긴다.
+# 변경 이력 스냅숏, 마감 처리, 만료 세션 정리는 저장소마다 백그라운드 스레드 하나가 맡는다.
 def init_database():
-    conn = sqlite3.connect('major_selection.db')
-    cursor = conn.cursor()
-    
-    # 사용자 테이블
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            student_id TEXT PRIMARY KEY,
-            name TEXT NOT NULL,
-            password_hash TEXT NOT NULL
-        )
-    ''')
-    
-    # 신청 정보 테이블
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS applications (
-            student_id TEXT PRIMARY KEY,
-            gpa REAL,
-            completed_courses TEXT,
-            major_1 TEXT,
-            major_2 TEXT,
-            major_3 TEXT,
-            major_4 TEXT,
-            major_5 TEXT,
-            is_submitted BOOLEAN DEFAULT FALSE,
-            FOREIGN KEY (student_id) REFERENCES users (student_id)
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
-
-# 비밀번호 해시화
-def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
-
-# 사용자 등록
-def register_user(student_id, name, password):
-    conn = sqlite3.connect('major_selection.db')
-    cursor = conn.cursor()
-    
-    try:
-        cursor.execute('''
-            INSERT INTO users (student_id, name, password_hash)
-            VALUES (?, ?, ?)
-        ''', (student_id, name, hash_password(password)))
-        conn.commit()
-        return True
-    except sqlite3.IntegrityError:
-        return False
-    finally:
-        conn.close()
-
-# 관리자 계정 식별 포함된 로그인 함수 (변경됨)
-def login_user(student_id, password):
-    conn = sqlite3.connect('major_selection.db')
-    cursor = conn.cursor()
-
-    cursor.execute('''
-        SELECT name FROM users 
-        WHERE student_id = ? AND password_hash = ?
-    ''', (student_id, hash_password(password)))
-
-    result = cursor.fetchone()
-    conn.close()
-
-    if result:
-        if student_id == 'admin':
-            return '관리자'
-        return result[0]
-    return None
-
-# 신청 정보 저장
-def save_application(student_id, gpa, courses, majors, is_submitted=False):
-    conn = sqlite3.connect('major_selection.db')
-    cursor = conn.cursor()
-    
-    courses_str = ','.join(courses) if courses else ''
-    
-    cursor.execute('''
-        INSERT OR REPLACE INTO applications 
-        (student_id, gpa, completed_courses, major_1, major_2, major_3, major_4, major_5, is_submitted)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (student_id, gpa, courses_str, majors[0], majors[1], majors[2], majors[3], majors[4], is_submitted))
-    
-    conn.commit()
-    conn.close()
-
-# 신청 정보 조회
-def get_application(student_id):
-    conn = sqlite3.connect('major_selection.db')
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT gpa, completed_courses, major_1, major_2, major_3, major_4, major_5, is_submitted
-        FROM applications WHERE student_id = ?
-    ''', (student_id,))
-    
-    result = cursor.fetchone()
-    conn.close()
-    
-    if result:
-        gpa, courses_str, m1, m2, m3, m4, m5, is_submitted = result
-        courses = courses_str.split(',') if courses_str else []
-        majors = [m1, m2, m3, m4, m5]
-        return gpa, courses, majors, is_submitted
-    
-    return None, [], ['', '', '', '', ''], False
-
-# PDF 생성
-def create_pdf(student_id, name, gpa, courses, majors):
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
-    styles = getSampleStyleSheet()
-    
-    # 한글 스타일 정의
-    korean_style = ParagraphStyle(
-        'Korean',
-        parent=styles['Normal'],
-        fontName=korean_font,
-        fontSize=12,
-        spaceAfter=12,
-    )
-    
-    title_style = ParagraphStyle(
-        'KoreanTitle',
-        parent=styles['Title'],
-        fontName=korean_font,
-        fontSize=18,
-        spaceAfter=20,
-        alignment=1,  # 중앙 정렬
-    )
-    
-    story = []
-    
-    # 제목
-    title = Paragraph("전공 선택 신청서", title_style)
-    story.append(title)
-    story.append(Spacer(1, 20))
-    
-    # 기본 정보
-    info_data = [
-        ['학번', student_id],
-        ['이름', name],
-        ['1학기 학점', f'{gpa}/4.3'],
-        ['이수 교과목', ', '.join(courses) if courses else '없음']
-    ]
-    
-    info_table = Table(info_data, colWidths=[2*inch, 4*inch])
-    info_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), korean_font),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ('BACKGROUND', (0, 0), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    
-    story.append(info_table)
-    story.append(Spacer(1, 20))
-    
-    # 전공 지망 순위
-    major_title = Paragraph("전공 지망 순위", korean_style)
-    story.append(major_title)
-    
-    major_names = ['인공지능', '컴퓨터과학', '데이터사이언스', '신소재물리', '지능형전자시스템']
-    major_data = [['순위', '전공명']]
-    
-    for i, major in enumerate(majors):
-        if major:
-            major_data.append([f'{i+1}지망', major])
-    
-    major_table = Table(major_data, colWidths=[1.5*inch, 4*inch])
-    major_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, -1), korean_font),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    
-    story.append(major_table)
-    
-    doc.build(story)
-    buffer.seek(0)
-    return buffer
+    store = storage.get_store(storage.store_url())
+    audit.get_snapshotter(store.url, store)
+    deadline.get_deadline_job(store.url, store)
+    sessions.get_session_manager(store.url, store)
+    return store
 
 # Streamlit 앱
+@metrics.timed('major_app.main')
 def main():
     st.set_page_config(page_title="전공선택 신청시스템", page_icon="🎓", layout="wide")
     
     # 데이터베이스 초기화
-    init_database()
+    store = init_database()
+    metrics.start_file_dump()
+    
+    # 전공 / 교과목 / 안내 문구 (관리자가 수정하는 목록의 캐시된 스냅숏)
+    listing = catalog.snapshot(store)
+    
+    # 신청 마감 설정 (마감 스레드가 주기적으로 읽어 둔 값)
+    round_ = deadline.get_deadline_job(store.url, store).state()
+    closed = not deadline.is_open(round_)
     
     st.title("🎓 전공선택 신청시스템")
     
@@ -236,6 +40,23 @@ def main():
     if 'is_admin' not in st.session_state:
         st.session_state.is_admin = False
     
+    # 로그인 세션 확인 (세션 상태 또는 주소의 토큰, 다시 접속하면 이어서 로그인 / 만료 시 로그아웃)
+    auth = sessions.get_session_manager(store.url, store)
+    session = sessions.current(auth)
+    if session is None and st.session_state.logged_in:
+        st.session_state.logged_in = False
+        st.session_state.student_id = ''
+        st.session_state.name = ''
+        st.session_state.is_admin = False
+        session_record.invalidate()
+        st.warning("로그인 시간이 만료되었습니다. 다시 로그인해주세요.")
+    elif session and not st.session_state.logged_in:
+        st.session_state.logged_in = True
+        st.session_state.student_id = session.student_id
+        st.session_state.name = session.name
+        st.session_state.is_admin = session.role == 'admin'
+        session_record.invalidate()
+    
     # 사이드바 - 로그인/등록
     with st.sidebar:
         if not st.session_state.logged_in:
@@ -250,16 +71,25 @@ def main():
                 
                 if st.button("로그인"):
                     if login_student_id and login_password:
-                        name = login_user(login_student_id, login_password)
-                        if name:
-                            st.session_state.logged_in = True
-                            st.session_state.student_id = login_student_id
-                            st.session_state.name = name
-                            st.session_state.is_admin = (login_student_id == 'admin')
-                            st.success(f"{name}님, 환영합니다!")
-                            st.rerun()
+                        try:
+                            name = applications.login(store, login_student_id, login_password)
+                        except passwords.PasswordBusyError:
+                            st.error("로그인 요청이 많습니다. 잠시 후 다시 시도해주세요.")
+                        except rate_limit.RateLimitedError as e:
+                            st.error(f"로그인 시도가 너무 많습니다. {e.retry_after}초 후 다시 시도해주세요.")
                         else:
-                            st.error("학번 또는 비밀번호가 잘못되었습니다.")
+                            if name:
+                                st.session_state.logged_in = True
+                                st.session_state.student_id = login_student_id
+                                st.session_state.name = name
+                                st.session_state.is_admin = (login_student_id == 'admin')
+                                sessions.login(auth, login_student_id, name,
+                                               'admin' if st.session_state.is_admin else 'student')
+                                session_record.invalidate()
+                                st.success(f"{name}님, 환영합니다!")
+                                st.rerun()
+                            else:
+                                st.error("학번 또는 비밀번호가 잘못되었습니다.")
                     else:
                         st.error("학번과 비밀번호를 입력해주세요.")
             
@@ -273,10 +103,17 @@ def main():
                 if st.button("회원가입"):
                     if all([reg_student_id, reg_name, reg_password, reg_confirm_password]):
                         if reg_password == reg_confirm_password:
-                            if register_user(reg_student_id, reg_name, reg_password):
-                                st.success("회원가입이 완료되었습니다!")
+                            try:
+                                registered = applications.register(store, reg_student_id, reg_name, reg_password)
+                            except passwords.PasswordBusyError:
+                                st.error("요청이 많습니다. 잠시 후 다시 시도해주세요.")
+                            except deadline.RoundClosedError:
+                                st.error("신청이 마감되어 회원가입할 수 없습니다.")
                             else:
-                                st.error("이미 등록된 학번입니다.")
+                                if registered:
+                                    st.success("회원가입이 완료되었습니다!")
+                                else:
+                                    st.error("이미 등록된 학번입니다.")
                         else:
                             st.error("비밀번호가 일치하지 않습니다.")
                     else:
@@ -286,45 +123,37 @@ def main():
             st.header(f"👤 {st.session_state.name}님")
             st.write(f"학번: {st.session_state.student_id}")
             if st.button("로그아웃"):
+                sessions.logout(auth)
                 st.session_state.logged_in = False
                 st.session_state.student_id = ''
                 st.session_state.name = ''
+                session_record.invalidate()
                 st.rerun()
     
     # 메인 컨텐츠
     if st.session_state.logged_in:
         if st.session_state.is_admin:
-            st.header("📊 관리자 대시보드")
-            conn = sqlite3.connect('major_selection.db')
-            df = pd.read_sql_query('''
-                SELECT u.student_id, u.name, a.gpa, a.completed_courses,
-                   a.major_1, a.major_2, a.major_3, a.major_4, a.major_5,
-                   a.is_submitted
-                FROM users u
-                LEFT JOIN applications a ON u.student_id = a.student_id
-            ''', conn)
-            conn.close()
-
-            st.dataframe(df)
-            excel_buffer = io.BytesIO()
-            df.to_excel(excel_buffer, index=False, engine='openpyxl')
-            excel_buffer.seek(0)
-
-            st.download_button(
-                label="📥 전체 신청 데이터 Excel 다운로드",
-                data=excel_buffer,
-                file_name="전공선택_신청자_데이터.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
+            # 관리자 화면은 pandas / numpy 를 쓰므로 처음 열 때 불러온다 (학생 화면 시작 비용 절감)
+            from core import admin_dashboard
+            admin_dashboard.render(store, pdf_templates.TABLE_TEMPLATE)
         else:
             st.header("전공선택 신청")
         
-        # 기존 신청 정보 불러오기
-            saved_gpa, saved_courses, saved_majors, is_submitted = get_application(st.session_state.student_id)
+        # 임시저장 상태 (완료되면 아래에서 DB 내용을 다시 읽음)
+            write_behind.render_status(st.session_state.student_id)
+        
+        # 기존 신청 정보 불러오기 (마감 처리 직후에는 다시 읽음)
+            deadline.sync_session(round_)
+            record = session_record.load(st.session_state.student_id, lambda student_id: applications.load(store, student_id))
+            saved_gpa, saved_courses, saved_majors = record.gpa, record.courses, record.preferences
+            is_submitted, version = record.is_submitted, record.version
+            # 마감 후에는 제출하지 않은 신청서도 수정할 수 없음
+            locked = is_submitted or closed
         
             if is_submitted:
                 st.success("✅ 최종 제출되었습니다.")
                 st.info("제출된 내용을 확인하고 PDF를 다운로드할 수 있습니다.")
+            deadline.render_notice(round_, is_submitted)
         
         # 폼 생성
             with st.form("application_form"):
@@ -341,25 +170,22 @@ def main():
                         value=saved_gpa if saved_gpa else 0.0,
                         step=0.1,
                         format="%.2f",
-                        disabled=is_submitted
+                        disabled=locked
                     )
                 
-                # 이수 교과목 입력
-                    available_courses = [
-                        "대학기초수학", "이산수학", "기초물리1", "파이썬프로그래밍", "공학개론"
-                    ]
-                
+                # 이수 교과목 입력 (목록에서 빠진 교과목도 이미 저장된 값은 그대로 보여줌)
                     selected_courses = st.multiselect(
                         "이수한 교과목을 선택하세요",
-                        available_courses,
+                        listing.courses + tuple(course for course in saved_courses if course not in listing.courses),
                         default=saved_courses,
-                        disabled=is_submitted
+                        disabled=locked
                     )
             
                 with col2:
                     st.subheader("🎯 전공 지망 순위")
                 
-                    major_options = ["", "인공지능", "컴퓨터과학", "데이터사이언스", "신소재물리", "지능형전자시스템"]
+                    major_options = ["", *listing.majors,
+                                     *(major for major in saved_majors if major and major not in listing.majors)]
                 
                     majors = []
                     for i in range(5):
@@ -367,7 +193,7 @@ def main():
                             f"{i+1}지망",
                             major_options,
                             index=major_options.index(saved_majors[i]) if saved_majors[i] in major_options else 0,
-                            disabled=is_submitted
+                            disabled=locked
                         )
                         majors.append(major)
             
@@ -375,10 +201,10 @@ def main():
                 col1, col2, col3 = st.columns(3)
             
                 with col1:
-                    save_button = st.form_submit_button("💾 임시저장", disabled=is_submitted)
+                    save_button = st.form_submit_button("💾 임시저장", disabled=locked)
             
                 with col2:
-                    submit_button = st.form_submit_button("📋 최종제출", disabled=is_submitted)
+                    submit_button = st.form_submit_button("📋 최종제출", disabled=locked)
             
                 with col3:
                     # PDF 다운로드는 폼 외부에서 처리
@@ -386,8 +212,15 @@ def main():
         
             # 폼 처리
             if save_button:
-                save_application(st.session_state.student_id, gpa, selected_courses, majors, False)
-                st.success("임시저장이 완료되었습니다!")
+                # 임시저장은 큐에 넣고 바로 돌아감 (커밋 여부는 상단 상태 표시로 확인)
+                write_behind.save_draft(
+                    applications.draft_queue(store),
+                    st.session_state.student_id,
+                    (gpa, selected_courses, majors),
+                    version,
+                    record._replace(gpa=gpa, courses=selected_courses, preferences=majors),
+                )
+                st.rerun()
         
             if submit_button:
                 # 유효성 검사
@@ -396,21 +229,31 @@ def main():
                 elif not any(majors):
                     st.error("최소 1개의 전공을 선택해주세요.")
                 else:
-                    save_application(st.session_state.student_id, gpa, selected_courses, majors, True)
-                    st.success("최종 제출이 완료되었습니다!")
-                    st.balloons()
-                    st.rerun()
+                    try:
+                        # 최종 제출은 동기로 기록 (대기 중인 임시저장은 먼저 정리)
+                        version = write_behind.settle(applications.draft_queue(store), st.session_state.student_id, version)
+                        applications.submit(store, st.session_state.student_id, gpa, selected_courses, majors, version)
+                        st.success("최종 제출이 완료되었습니다!")
+                        st.balloons()
+                        st.rerun()
+                    except session_record.StaleRecordError:
+                        st.error("다른 창에서 신청서가 먼저 변경되었습니다. 최신 내용을 확인한 뒤 다시 제출해주세요.")
+                    except deadline.RoundClosedError:
+                        st.error("신청이 마감되어 제출할 수 없습니다.")
+                    except applications.SubmitRejectedError:
+                        st.error("제출할 수 있는 신청서가 없습니다. 이미 최종 제출했는지 확인해주세요.")
         
         # PDF 다운로드 버튼 (현재 정보 기준)
             if gpa > 0 or any(majors):
                 st.subheader("전공선택 신청서를 다운로드하세요.")
-                pdf_buffer = create_pdf(
+                pdf_buffer = applications.create_pdf(pdf_templates.TABLE_TEMPLATE, applications.pdf_args(
+                    pdf_templates.TABLE_TEMPLATE,
                     st.session_state.student_id,
                     st.session_state.name,
                     gpa,
                     selected_courses,
                     majors
-                )
+                ))
                 st.download_button(
                     label="📥 PDF 파일 다운로드",
                     data=pdf_buffer.getvalue(),
@@ -428,38 +271,15 @@ def main():
         
         with col1:
             st.subheader("🎯 선택 가능한 전공")
-            majors_info = [
-                "• 인공지능",
-                "• 컴퓨터과학", 
-                "• 데이터사이언스",
-                "• 신소재물리",
-                "• 지능형전자시스템"
-            ]
-            for major in majors_info:
-                st.write(major)
+            st.markdown(listing.markdown['major'])
         
         with col2:
             st.subheader("📚1학기 이수 교과목")
-            courses_info = [
-                "• 대학기초수학",
-                "• 이산수학",
-                "• 기초물리1",
-                "• 파이썬프로그래밍",
-                "• 공학개론"
-            ]
-            for course in courses_info:
-                st.write(course)
+            st.markdown(listing.markdown['course'])
         
-        st.subheader("✨ 주요 기능")
-        features = [
-            "🔐 학번과 비밀번호로 안전한 로그인",
-            "📊 1학기 학점과 이수교과목 입력",
-            "🎯 1지망부터 5지망까지 전공 순위 선택",
-            "💾 임시저장으로 언제든 수정 가능",
-            "📋 최종제출 후 신청서 PDF 다운로드"
-        ]
-        for feature in features:
-            st.write(feature)
+        if listing.features:
+            st.subheader("✨ 주요 기능")
+            st.markdown(listing.markdown['feature'])
 
 if __name__ == "__main__":
     main()
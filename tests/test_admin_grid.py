@@ -0,0 +1,51 @@
+import pytest
+
+from core import admin_dashboard, storage
+
+GRID = admin_dashboard.ADMIN_GRID
+ALL = {'status': '전체', 'major': '전체', 'rank': None, 'gpa': (None, None), 'course': '전체'}
+
+
+@pytest.fixture(params=['sqlite', 'standin'])
+def store(request, tmp_path):
+    store = storage.open_store(f'{request.param}:///{tmp_path / "students.db"}')
+    store.init()
+    with store.transaction() as conn:
+        store.create_accounts(conn, [
+            {'student_id': 'S1', 'name': '가', 'password_hash': 'x', 'gpa': 3.5, 'courses': ['선형대수', '이산수학'],
+             'preferences': ['인공지능', None, '컴퓨터과학'], 'is_submitted': True},
+            {'student_id': 'S2', 'name': '나', 'password_hash': 'x', 'gpa': None, 'preferences': ['컴퓨터과학']},
+            {'student_id': 'S3', 'name': '다', 'password_hash': 'x', 'gpa': 2.0, 'courses': ['이산수학'],
+             'is_submitted': True},
+        ])
+    return store
+
+
+def test_grid_page_fills_courses_and_preferences(store):
+    rows = store.fetch_grid_page(GRID, ALL, '학번')
+    assert [row[:10] for row in rows] == [
+        ['S1', '가', 3.5, '선형대수,이산수학', '인공지능', None, '컴퓨터과학', None, None, '제출완료'],
+        ['S2', '나', None, None, '컴퓨터과학', None, None, None, None, '미제출'],
+        ['S3', '다', 2.0, '이산수학', None, None, None, None, None, '제출완료'],
+    ]
+
+
+@pytest.mark.parametrize('filters, expected', [
+    ({'status': '미제출'}, ['S2']),
+    ({'major': '컴퓨터과학'}, ['S1', 'S2']),
+    ({'major': '컴퓨터과학', 'rank': 1}, ['S2']),
+    ({'gpa': (3.0, 4.3)}, ['S1']),
+    ({'course': '이산수학', 'status': '제출완료'}, ['S1', 'S3']),
+])
+def test_grid_filters(store, filters, expected):
+    filters = dict(ALL, **filters)
+    assert store.count_grid_rows(GRID, filters) == len(expected)
+    assert [row[0] for row in store.fetch_grid_page(GRID, filters, '학번')] == expected
+
+
+def test_applicants_are_submitted_students_only(store):
+    students, preferences, courses = store.load_applicants()
+    assert store.count_applicants() == 2
+    assert [tuple(row) for row in students] == [('S1', '가', 3.5), ('S3', '다', 2.0)]
+    assert sorted(tuple(row) for row in preferences) == [('S1', 1, '인공지능'), ('S1', 3, '컴퓨터과학')]
+    assert sorted(tuple(row) for row in courses) == [('S1', '선형대수'), ('S1', '이산수학'), ('S3', '이산수학')]
@@ -0,0 +1,31 @@
+import pytest
+
+from core import applications, storage
+
+APPLICATION = (3.5, ['이산수학'], ['인공지능', None, None, None, None])
+
+
+@pytest.fixture
+def store():
+    store = storage.MemoryStore()
+    with store.transaction() as conn:
+        store.create_accounts(conn, [{'student_id': 'S1', 'name': '가', 'password_hash': 'x'}])
+    return store
+
+
+def test_submit_returns_new_version(store):
+    version = applications.submit(store, 'S1', *APPLICATION, 0)
+    record = store.load_record('S1')
+    assert (record.is_submitted, record.version) == (True, version)
+
+
+def test_submit_unknown_student_is_rejected(store):
+    with pytest.raises(applications.SubmitRejectedError):
+        applications.submit(store, 'S9', *APPLICATION)
+
+
+def test_submit_twice_is_rejected(store):
+    applications.submit(store, 'S1', *APPLICATION)
+    with pytest.raises(applications.SubmitRejectedError):
+        applications.submit(store, 'S1', 2.0, [], [None] * 5)
+    assert store.load_record('S1').gpa == 3.5
@@ -0,0 +1,38 @@
+import pytest
+
+from core import rate_limit
+
+
+@pytest.fixture(autouse=True)
+def limiter(monkeypatch):
+    limiter = rate_limit.RateLimiter()
+    monkeypatch.setattr(rate_limit, 'get_login_limiter', lambda: limiter)
+    return limiter
+
+
+def attempts(student_id, client, count):
+    results = []
+    for _ in range(count):
+        try:
+            rate_limit.check_login(student_id, client)
+            results.append(True)
+        except rate_limit.RateLimitedError:
+            results.append(False)
+    return results
+
+
+def test_student_id_bucket_limits_repeated_failures():
+    assert attempts('2024001', 'a', rate_limit.STUDENT_LIMIT.capacity + 1)[-1] is False
+    assert attempts('2024002', 'a', 1) == [True]
+
+
+def test_admin_failures_from_one_client_do_not_lock_out_others():
+    assert attempts(rate_limit.ADMIN_ID, 'attacker', 10).count(True) == rate_limit.ADMIN_CLIENT_LIMIT.capacity
+    assert attempts(rate_limit.ADMIN_ID, 'admin-desk', 1) == [True]
+
+
+def test_successful_login_is_not_charged():
+    for _ in range(10):
+        rate_limit.login_succeeded(rate_limit.check_login(rate_limit.ADMIN_ID, 'admin-desk'))
+    assert attempts(rate_limit.ADMIN_ID, 'admin-desk', rate_limit.ADMIN_CLIENT_LIMIT.capacity) == \
+        [True] * rate_limit.ADMIN_CLIENT_LIMIT.capacity
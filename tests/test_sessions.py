@@ -0,0 +1,35 @@
+import pytest
+
+from core import sessions, storage
+
+
+@pytest.fixture
+def manager():
+    manager = sessions.SessionManager(storage.MemoryStore(), sweep_interval=3600)
+    yield manager
+    manager.close()
+
+
+def test_issued_token_resolves_to_session(manager):
+    token = manager.issue('2024001', '홍길동')
+    session = manager.check(token)
+    assert (session.student_id, session.name, session.role) == ('2024001', '홍길동', 'student')
+
+
+@pytest.mark.parametrize('token', [
+    None, '', 'junk', '.', 'abc.', '.abc', 'abc.def',
+    '세션.서명', 'abc.서명', '세션.abc', 'abc.\udcff', '\x00.\x00',
+])
+def test_malformed_token_is_rejected(manager, token):
+    assert manager.check(token) is None
+
+
+def test_non_ascii_signature_on_real_session_is_rejected(manager):
+    session_id = manager.issue('2024001', '홍길동').partition('.')[0]
+    assert manager.check(f'{session_id}.서명') is None
+
+
+def test_revoked_token_is_rejected(manager):
+    token = manager.issue('2024001', '홍길동')
+    manager.revoke(token)
+    assert manager.check(token) is None
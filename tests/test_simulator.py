@@ -0,0 +1,99 @@
+import random
+
+import pandas as pd
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from core import allocation, simulator, storage
+
+MAJORS = ['인공지능', '컴퓨터과학', '데이터사이언스', '신소재물리', '전자공학']
+
+
+def random_cohort(rng, majors):
+    n = rng.randint(1, 40)
+    students = pd.DataFrame({
+        'student_id': [f'S{i:03d}' for i in rng.sample(range(100), n)],
+        'name': 'x',
+        # 동점자와 학점 미입력 학생 포함
+        'gpa': [rng.choice([None, 2.0, 3.0, 3.5, 4.0, round(rng.uniform(0, 4.3), 2)]) for _ in range(n)],
+    })
+    # 빈 순위, 중복 지망, 목록에 없는 전공 포함
+    preferences = pd.DataFrame([
+        (student_id, rank, rng.choice(majors + ['폐지된전공']))
+        for student_id in students['student_id'] for rank in rng.sample(range(1, 6), rng.randint(0, 5))
+    ], columns=['student_id', 'rank', 'major'])
+    return students, preferences
+
+
+# allocate 의 학번별 배정 전공과 같은 모양으로 변환
+def placements(sim, assigned):
+    return {student_id: sim.majors[major] if major >= 0 else None
+            for student_id, major in zip(sim.students['student_id'], assigned)}
+
+
+def expected(students, preferences, capacities):
+    result, _ = allocation.allocate(students, preferences, pd.DataFrame(columns=['student_id', 'course']),
+                                    capacities)
+    return {row.student_id: row.배정전공 if isinstance(row.배정전공, str) else None for row in result.itertuples()}
+
+
+# 정원을 하나씩 / 여러 개씩 바꾸며 증분 재배정 결과를 전체 재계산과 비교
+# (매번 처음부터 다시 배정한 결과, 다섯 번마다 allocation.allocate 결과)
+def check_walk(rng, students, preferences, majors, steps=15):
+    sim = simulator.CapacitySimulator(students, preferences, majors)
+    capacities = {major: rng.randint(0, len(students)) for major in majors}
+    for step in range(steps):
+        for major in rng.sample(majors, rng.randint(1, len(majors))):
+            capacities[major] = max(0, capacities[major] + rng.choice([-3, -1, -1, 1, 1, 2]))
+        assigned = sim.assign(capacities)
+        assert (assigned == sim._full([capacities[major] for major in majors])).all()
+        if step % 5 == 0 or step == steps - 1:
+            assert placements(sim, assigned) == expected(students, preferences, capacities)
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_incremental_assignment_matches_full_allocation(seed):
+    rng = random.Random(seed)
+    check_walk(rng, *random_cohort(rng, MAJORS), MAJORS)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_catalog_change_matches_full_allocation(seed):
+    rng = random.Random(seed)
+    students, preferences = random_cohort(rng, MAJORS)
+    check_walk(rng, students, preferences, MAJORS, steps=5)
+    # 전공 이름 변경 / 삭제 / 추가 후 새 목록으로 다시 만든 시뮬레이터
+    renamed = ['AI융합' if major == '인공지능' else major for major in MAJORS if major != '전자공학'] + ['반도체공학']
+    check_walk(rng, students, preferences, renamed)
+
+
+def simulator_page(store):
+    import streamlit as st
+
+    from core import simulator
+
+    simulator.render_simulator(store, st.session_state.majors)
+
+
+def test_renamed_major_rebuilds_cached_simulator(tmp_path):
+    store = storage.open_store(f'sqlite:///{tmp_path / "students.db"}')
+    store.init()
+    with store.transaction() as conn:
+        store.create_accounts(conn, [
+            {'student_id': f'S{i}', 'name': f'학생{i}', 'password_hash': 'x', 'gpa': 4.0 - i / 10,
+             'preferences': ['인공지능', '컴퓨터과학'], 'is_submitted': True}
+            for i in range(4)
+        ])
+
+    app = AppTest.from_function(simulator_page, args=(store,))
+    app.session_state.majors = ['인공지능', '컴퓨터과학']
+    app.run()
+    assert not app.exception
+    assert [slider.label for slider in app.slider] == ['인공지능', '컴퓨터과학']
+
+    # 목록 관리에서 전공 이름을 바꾼 뒤 다시 그리기
+    app.session_state.majors = ['AI융합', '컴퓨터과학']
+    app.run()
+    assert not app.exception
+    assert [slider.label for slider in app.slider] == ['AI융합', '컴퓨터과학']
+    assert app.metric[0].value == '2'